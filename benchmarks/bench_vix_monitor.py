@@ -0,0 +1,117 @@
+"""
+VIXMonitor 效能基準測試
+Benchmark of VIXMonitor ingestion against the original sort-and-filter path,
+plus a full replay that evaluates generate_signal after every point.
+
+Usage:
+    python benchmarks/bench_vix_monitor.py
+    python benchmarks/bench_vix_monitor.py --sizes 10000 1000000 --legacy-max 10000
+
+Reference run (full-history lookback, best of 3, CPython 3.11 on a shared Linux VM):
+    10k points: legacy ~7.2 s, incremental ~0.07 s → roughly 90-110x
+                (the ratio is noisy at this size; ~250x is not reproducible here)
+    1M points:  incremental ~7.7 s, replay with generate_signal ~17 s
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models import VIXData
+from src.monitors import VIXMonitor
+
+
+class LegacyVIXMonitor(VIXMonitor):
+    """原始實作：每筆數據都重新排序並以 list comprehension 過濾"""
+
+    def __init__(self, lookback_days: int = 30):
+        super().__init__(lookback_days)
+        self.vix_history = []
+
+    def add_data(self, date: datetime, vix_value: float):
+        if date.tzinfo is not None:
+            date = date.replace(tzinfo=None)
+
+        self.vix_history.append(VIXData(date, vix_value))
+        self.vix_history.sort(key=lambda x: x.date)
+
+        if self.vix_history:
+            latest_date = self.vix_history[-1].date
+            cutoff_date = latest_date - timedelta(days=self.lookback_days)
+            self.vix_history = [d for d in self.vix_history if d.date >= cutoff_date]
+
+
+def make_series(size: int, seed: int = 42):
+    """產生依序排列的模擬 VIX 序列（每分鐘一筆，避免超出 datetime 範圍）"""
+    rng = random.Random(seed)
+    start = datetime(1990, 1, 2)
+    value = 20.0
+    series = []
+    for i in range(size):
+        value = max(9.0, value * (1 + rng.gauss(0, 0.05)))
+        series.append((start + timedelta(minutes=i), value))
+    return series
+
+
+def time_ingest(monitor_cls, series, lookback_days: int, repeat: int = 1) -> float:
+    """回傳逐筆 add_data 的總耗時（秒，取 repeat 次中最快的一次）"""
+    best = float("inf")
+    for _ in range(repeat):
+        monitor = monitor_cls(lookback_days=lookback_days)
+        started = time.perf_counter()
+        for date, value in series:
+            monitor.add_data(date, value)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def time_replay(series, lookback_days: int, repeat: int = 1) -> float:
+    """回傳逐筆 add_data 並在每一步 generate_signal 的總耗時（秒，取 repeat 次中最快的一次）"""
+    best = float("inf")
+    for _ in range(repeat):
+        monitor = VIXMonitor(lookback_days=lookback_days)
+        started = time.perf_counter()
+        for date, value in series:
+            monitor.add_data(date, value)
+            monitor.generate_signal()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument(
+        "--lookback-days", type=int, default=36500,
+        help="回溯天數；預設涵蓋整段序列，模擬長期回放"
+    )
+    parser.add_argument(
+        "--legacy-max", type=int, default=10_000,
+        help="超過此筆數時略過原始實作（其成本為平方級）"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="增量實作與回放各跑幾次取最快值（原始實作只跑一次）"
+    )
+    args = parser.parse_args()
+
+    print(f"{'points':>10} {'legacy (s)':>12} {'incremental (s)':>16} {'speedup':>9} {'replay (s)':>12}")
+    for size in args.sizes:
+        series = make_series(size)
+        new_time = time_ingest(VIXMonitor, series, args.lookback_days, args.repeat)
+        replay_time = time_replay(series, args.lookback_days, args.repeat)
+
+        if size <= args.legacy_max:
+            legacy_time = time_ingest(LegacyVIXMonitor, series, args.lookback_days)
+            print(f"{size:>10} {legacy_time:>12.3f} {new_time:>16.3f} "
+                  f"{legacy_time / new_time:>8.1f}x {replay_time:>12.3f}")
+        else:
+            print(f"{size:>10} {'skipped':>12} {new_time:>16.3f} {'-':>9} {replay_time:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
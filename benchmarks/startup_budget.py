@@ -0,0 +1,87 @@
+"""
+CLI 啟動時間預算
+Measures the import time of src.main with `python -X importtime` and fails
+if it exceeds the checked-in budget or pulls in heavy optional modules.
+
+Usage:
+    python benchmarks/startup_budget.py
+    python benchmarks/startup_budget.py --budget-ms 400 --runs 5
+    STARTUP_BUDGET_MS=1000 python benchmarks/startup_budget.py
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# 匯入 src.main 的時間上限（毫秒，取多次量測中最快的一次）
+# 單是 import aiohttp 在較慢的機器上就約 550 ms，預算需保留餘裕；可用環境變數調整
+STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", 800))
+
+# 只有特定路徑才需要的重量級依賴，不得在啟動時載入
+FORBIDDEN_MODULES = ("yfinance", "pandas", "numpy")
+
+
+def measure_import(module: str = "src.main") -> Tuple[float, Dict[str, float]]:
+    """
+    在新的直譯器中匯入模組並解析 -X importtime 輸出
+
+    Returns:
+        (模組累計匯入毫秒數, {已匯入模組: 累計毫秒數})
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    imported: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not cumulative_us.strip().isdigit():
+            continue  # 標題列
+        imported[name.strip()] = int(cumulative_us) / 1000
+
+    return imported.get(module, 0.0), imported
+
+
+def check_budget(runs: int = 3) -> Tuple[float, list]:
+    """
+    量測多次並回傳（最快的匯入時間, 被載入的禁用模組）
+    """
+    best = float("inf")
+    forbidden = []
+    for _ in range(runs):
+        elapsed, imported = measure_import()
+        best = min(best, elapsed)
+        forbidden = sorted(set(forbidden) | {m for m in FORBIDDEN_MODULES if m in imported})
+    return best, forbidden
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    best, forbidden = check_budget(args.runs)
+    print(f"import src.main: {best:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    if forbidden:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(forbidden)}")
+        return 1
+    if best > args.budget_ms:
+        print("FAIL: startup time over budget")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""
+Offline backtesting over full VIX histories
+"""
+from .dataset import load_history, iter_history
+from .runner import BacktestReport, SignalTransition, run_backtest
+
+__all__ = [
+    "load_history", "iter_history",
+    "BacktestReport", "SignalTransition", "run_backtest",
+    "SweepResult", "grid_search", "random_search", "run_sweep",
+]
+
+
+_SWEEP_NAMES = {"SweepResult", "grid_search", "random_search", "run_sweep"}
+
+
+def __getattr__(name):
+    # sweep pulls in NumPy and multiprocessing; import it only on demand
+    if name in _SWEEP_NAMES:
+        from . import sweep
+        return getattr(sweep, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
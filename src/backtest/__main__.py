@@ -0,0 +1,13 @@
+"""
+python -m src.backtest <VIX_History.csv>
+python -m src.backtest sweep <VIX_History.csv> --param NAME=...
+"""
+import sys
+
+if len(sys.argv) > 1 and sys.argv[1] == "sweep":
+    from .sweep import main
+    sys.exit(main(sys.argv[2:]))
+
+from .runner import run
+
+run()
@@ -0,0 +1,111 @@
+"""
+Local VIX history datasets (CSV / Parquet)
+讀取本機 VIX 歷史數據檔，供離線回測使用
+"""
+import csv
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+DATE_COLUMNS = ("date", "datetime", "timestamp")
+CLOSE_COLUMNS = ("close", "adj close", "vix", "value")
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%Y/%m/%d")
+
+
+def _parse_date(text: str) -> datetime:
+    """解析 ISO（Yahoo）或 MM/DD/YYYY（CBOE）格式的日期"""
+    text = text.strip()
+    try:
+        date = datetime.fromisoformat(text)
+    except ValueError:
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+        raise ValueError(f"Unrecognized date format: {text!r}")
+    return date.replace(tzinfo=None)
+
+
+def _find_column(fieldnames: List[str], candidates: Tuple[str, ...]) -> Optional[str]:
+    """依候選名稱（不分大小寫）找到欄位"""
+    lookup = {name.strip().lower(): name for name in fieldnames}
+    for candidate in candidates:
+        if candidate in lookup:
+            return lookup[candidate]
+    return None
+
+
+def _iter_csv(path: Path) -> Iterator[Tuple[datetime, float]]:
+    """逐行讀取 CSV，略過收盤價缺漏的列"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames or []
+        date_column = _find_column(fieldnames, DATE_COLUMNS)
+        close_column = _find_column(fieldnames, CLOSE_COLUMNS)
+        if date_column is None or close_column is None:
+            raise ValueError(f"{path}: expected a date column and a close column, got {fieldnames}")
+
+        for row in reader:
+            raw_close = (row.get(close_column) or "").strip()
+            if not raw_close or raw_close.lower() in ("null", "nan"):
+                continue
+            value = float(raw_close)
+            if math.isnan(value):
+                continue
+            yield _parse_date(row[date_column]), value
+
+
+def _iter_parquet(path: Path) -> Iterator[Tuple[datetime, float]]:
+    """逐 row group 讀取 Parquet（需要 pandas + pyarrow）"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Reading Parquet files requires pyarrow: pip install pyarrow") from e
+
+    parquet = pq.ParquetFile(path)
+    names = parquet.schema_arrow.names
+    date_column = _find_column(names, DATE_COLUMNS)
+    close_column = _find_column(names, CLOSE_COLUMNS)
+    if close_column is None:
+        raise ValueError(f"{path}: expected a close column, got {names}")
+
+    for index in range(parquet.num_row_groups):
+        frame = parquet.read_row_group(index).to_pandas()
+        if date_column is not None:
+            frame = frame.set_index(date_column)
+        dates = frame.index
+        if getattr(dates, "tz", None) is not None:
+            dates = dates.tz_localize(None)
+        for date, value in zip(dates.to_pydatetime(), frame[close_column].tolist()):
+            if value is None or math.isnan(value):
+                continue
+            yield date, float(value)
+
+
+def iter_history(path: Union[str, Path]) -> Iterator[Tuple[datetime, float]]:
+    """
+    逐筆讀取本機 VIX 歷史數據
+
+    支援 CBOE VIX_History.csv（DATE,OPEN,HIGH,LOW,CLOSE）、Yahoo 匯出的 CSV，
+    以及含日期與收盤價欄位的 Parquet 檔。
+
+    Args:
+        path: CSV 或 Parquet 檔案路徑
+
+    Returns:
+        (date, vix_value) 迭代器，依檔案順序
+
+    Raises:
+        ValueError: 檔案缺少必要欄位或日期格式無法辨識
+    """
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        return _iter_parquet(path)
+    return _iter_csv(path)
+
+
+def load_history(path: Union[str, Path]) -> List[Tuple[datetime, float]]:
+    """讀取整份 VIX 歷史數據並依日期排序"""
+    return sorted(iter_history(path), key=lambda point: point[0])
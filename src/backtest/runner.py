@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Full-history VIX backtest runner
+將完整的每日 VIX 歷史逐筆送入 VIXMonitor，統計訊號轉換與各市場階段時間
+
+Usage:
+    python -m src.backtest VIX_History.csv
+    python -m src.backtest vix.parquet --lookback-days 30 --limit 50
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models import MarketPhase, Signal
+from ..monitors import VIXMonitor
+from .dataset import iter_history
+
+
+@dataclass
+class SignalTransition:
+    """Signal Transition / 訊號轉換"""
+    date: datetime
+    vix: float
+    phase: MarketPhase
+    signal: Signal
+    previous_signal: Optional[Signal]
+
+
+@dataclass
+class BacktestReport:
+    """Backtest Report / 回測報告"""
+    points: int = 0
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    elapsed: float = 0.0
+    transitions: List[SignalTransition] = field(default_factory=list)
+    phase_days: Dict[MarketPhase, int] = field(default_factory=Counter)
+    signal_days: Dict[Signal, int] = field(default_factory=Counter)
+
+    @property
+    def points_per_second(self) -> float:
+        """每秒處理筆數"""
+        return self.points / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def run_backtest(
+    history: Iterable[Tuple[datetime, float]],
+    monitor: Optional[VIXMonitor] = None
+) -> BacktestReport:
+    """
+    逐筆回放 VIX 歷史並在每一步產生訊號
+
+    Args:
+        history: 依日期排序的 (date, vix_value) 序列，可為串流
+        monitor: 使用的監控器（預設為 VIXMonitor(lookback_days=30)）
+
+    Returns:
+        BacktestReport: 訊號轉換、各階段天數與吞吐量
+    """
+    if monitor is None:
+        monitor = VIXMonitor(lookback_days=30)
+
+    report = BacktestReport()
+    previous_signal: Optional[Signal] = None
+
+    started = time.perf_counter()
+    for date, value in history:
+        monitor.add_data(date, value)
+        market_signal = monitor.generate_signal()
+
+        report.points += 1
+        if report.start is None:
+            report.start = date
+        report.end = date
+        report.phase_days[market_signal.phase] += 1
+        report.signal_days[market_signal.signal] += 1
+
+        if market_signal.signal != previous_signal:
+            report.transitions.append(SignalTransition(
+                date=date,
+                vix=value,
+                phase=market_signal.phase,
+                signal=market_signal.signal,
+                previous_signal=previous_signal,
+            ))
+            previous_signal = market_signal.signal
+    report.elapsed = time.perf_counter() - started
+
+    return report
+
+
+def format_report(report: BacktestReport, limit: int = 0) -> str:
+    """
+    將回測報告格式化為文字
+
+    Args:
+        report: 回測報告
+        limit: 最多列出幾筆訊號轉換（0 表示全部）
+    """
+    lines = []
+    if report.points == 0:
+        return "無數據 / No data"
+
+    lines.append("=" * 70)
+    lines.append(f"回測期間 / Period: {report.start:%Y-%m-%d} → {report.end:%Y-%m-%d} ({report.points} days)")
+    lines.append(f"吞吐量 / Throughput: {report.points_per_second:,.0f} points/s ({report.elapsed:.3f}s)")
+    lines.append("=" * 70)
+
+    lines.append("\n市場階段時間 / Time in Phase")
+    lines.append("-" * 70)
+    for phase in MarketPhase:
+        days = report.phase_days.get(phase, 0)
+        lines.append(f"{phase.value:<28} {days:>7} days {days / report.points * 100:>6.1f}%")
+
+    lines.append("\n進場訊號時間 / Time in Signal")
+    lines.append("-" * 70)
+    for signal in Signal:
+        days = report.signal_days.get(signal, 0)
+        lines.append(f"{signal.value:<28} {days:>7} days {days / report.points * 100:>6.1f}%")
+
+    transitions = report.transitions if limit <= 0 else report.transitions[-limit:]
+    lines.append(f"\n訊號轉換 / Signal Transitions ({len(report.transitions)} total)")
+    lines.append("-" * 70)
+    for t in transitions:
+        previous = t.previous_signal.value if t.previous_signal else "-"
+        lines.append(f"{t.date:%Y-%m-%d}  VIX {t.vix:6.2f}  {previous} → {t.signal.value}  [{t.phase.value}]")
+
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Backtest command entry point
+
+    Returns:
+        int: Exit code (0 for success, 1 for failure)
+    """
+    parser = argparse.ArgumentParser(description="Replay a local daily VIX history through VIXMonitor")
+    parser.add_argument("path", help="CSV (CBOE / Yahoo export) or Parquet file with daily VIX closes")
+    parser.add_argument("--lookback-days", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=0, help="Only list the last N transitions (0 = all)")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run_backtest(iter_history(args.path), VIXMonitor(lookback_days=args.lookback_days))
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    print(format_report(report, limit=args.limit))
+    return 0
+
+
+def run():
+    """CLI entry point"""
+    sys.exit(main())
+
+
+if __name__ == "__main__":
+    run()
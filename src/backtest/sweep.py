@@ -0,0 +1,309 @@
+"""
+Parallel threshold parameter sweep
+在完整 VIX 歷史上平行評估多組 VIXMonitor 閾值，並依進場品質排序
+
+Usage:
+    python -m src.backtest sweep VIX_History.csv \\
+        --param PANIC_THRESHOLD=30,35,40 --param MIN_DECLINING_DAYS=3,5,7
+    python -m src.backtest sweep VIX_History.csv --samples 500 \\
+        --param PEAK_DECLINE_30=0.2:0.4 --param PEAK_DECLINE_50=0.4:0.6
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..models import Signal
+from ..monitors import VIXMonitor, score_series
+from .dataset import load_history
+
+# 可調整的 VIXMonitor 閾值
+TUNABLE_PARAMETERS = (
+    "CALM_THRESHOLD",
+    "TENSION_THRESHOLD",
+    "PANIC_THRESHOLD",
+    "EXTREME_PANIC_THRESHOLD",
+    "PEAK_DECLINE_30",
+    "PEAK_DECLINE_40",
+    "PEAK_DECLINE_50",
+    "MIN_DECLINING_DAYS",
+)
+
+# 各進場訊號的部位大小
+ENTRY_WEIGHTS = {
+    Signal.ENTRY_30: 0.3,
+    Signal.ENTRY_60: 0.6,
+    Signal.ENTRY_100: 1.0,
+}
+
+ParameterSet = Dict[str, Union[int, float]]
+SearchSpace = Dict[str, Union[List[Union[int, float]], Tuple[Union[int, float], Union[int, float]]]]
+
+
+@dataclass
+class SweepResult:
+    """Sweep Result / 單組參數的評估結果"""
+    params: ParameterSet
+    score: float              # 進場後 horizon 天的加權 VIX 變化（越低越好）
+    adverse_excursion: float  # 進場後 horizon 天內 VIX 最大漲幅（越低越好）
+    entries: int              # 進場訊號次數
+
+
+# Worker 端的共享歷史（由 _attach_history 在每個 process 啟動時設定一次）
+_worker_state: Dict[str, object] = {}
+
+
+def _share_array(array: np.ndarray) -> shared_memory.SharedMemory:
+    """將陣列複製到新的共享記憶體區塊"""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block
+
+
+def _attach_history(dates_name: str, values_name: str, length: int, lookback_days: int, horizon: int):
+    """Worker 初始化：掛載共享記憶體中的日期與 VIX 陣列（不複製）"""
+    dates_block = shared_memory.SharedMemory(name=dates_name)
+    values_block = shared_memory.SharedMemory(name=values_name)
+    _worker_state.update(
+        blocks=(dates_block, values_block),
+        dates=np.ndarray((length,), dtype="datetime64[us]", buffer=dates_block.buf),
+        values=np.ndarray((length,), dtype=np.float64, buffer=values_block.buf),
+        lookback_days=lookback_days,
+        horizon=horizon,
+    )
+
+
+def evaluate(
+    params: ParameterSet,
+    dates: np.ndarray,
+    values: np.ndarray,
+    lookback_days: int = 30,
+    horizon: int = 20
+) -> SweepResult:
+    """
+    以一組閾值對整段歷史評分
+
+    每次訊號變為進場訊號（ENTRY_30/60/100）視為一次進場，以部位大小加權，
+    衡量進場後 horizon 個交易日的 VIX 變化與最大逆向漲幅。
+
+    Args:
+        params: 閾值名稱 → 值
+        dates: datetime64 日期陣列（遞增）
+        values: VIX 收盤值陣列
+        lookback_days: 回溯天數
+        horizon: 進場後觀察的交易日數
+
+    Returns:
+        SweepResult: 評估結果
+    """
+    monitor = VIXMonitor(lookback_days=lookback_days)
+    for name, value in params.items():
+        if name not in TUNABLE_PARAMETERS:
+            raise ValueError(f"Unknown parameter: {name}")
+        setattr(monitor, name, value)
+
+    series = score_series(dates, values, monitor)
+
+    weights = np.zeros(len(Signal), dtype=np.float64)
+    signals = list(Signal)
+    for signal, weight in ENTRY_WEIGHTS.items():
+        weights[signals.index(signal)] = weight
+
+    codes = series.signal_codes
+    changed = np.ones(len(codes), dtype=bool)
+    changed[1:] = codes[1:] != codes[:-1]
+    entry_days = np.flatnonzero(changed & (weights[codes] > 0))
+    entry_days = entry_days[entry_days + horizon < len(values)]
+
+    if len(entry_days) == 0:
+        return SweepResult(params=params, score=float("inf"), adverse_excursion=float("inf"), entries=0)
+
+    entry_vix = values[entry_days]
+    forward = values[entry_days + horizon] / entry_vix - 1
+    windows = np.lib.stride_tricks.sliding_window_view(values[1:], horizon)
+    adverse = windows[entry_days].max(axis=1) / entry_vix - 1
+    entry_weights = weights[codes[entry_days]]
+
+    return SweepResult(
+        params=params,
+        score=float(np.average(forward, weights=entry_weights)),
+        adverse_excursion=float(np.average(adverse, weights=entry_weights)),
+        entries=int(len(entry_days)),
+    )
+
+
+def _evaluate_shared(params: ParameterSet) -> SweepResult:
+    """Worker 任務：只接收參數，歷史來自共享記憶體"""
+    return evaluate(
+        params,
+        _worker_state["dates"],
+        _worker_state["values"],
+        lookback_days=_worker_state["lookback_days"],
+        horizon=_worker_state["horizon"],
+    )
+
+
+def grid_search(space: SearchSpace) -> List[ParameterSet]:
+    """展開網格搜尋空間（每個參數為候選值清單）"""
+    for name, candidates in space.items():
+        if isinstance(candidates, tuple):
+            raise ValueError(f"{name}: ranges need random search (--samples)")
+    names = list(space)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(space[n] for n in names))]
+
+
+def random_search(space: SearchSpace, samples: int, seed: int = 0) -> List[ParameterSet]:
+    """
+    隨機搜尋：清單為候選值，(low, high) 為均勻分布區間（整數區間取整數）
+    """
+    rng = random.Random(seed)
+    parameter_sets = []
+    for _ in range(samples):
+        params: ParameterSet = {}
+        for name, candidates in space.items():
+            if isinstance(candidates, tuple):
+                low, high = candidates
+                if isinstance(low, int) and isinstance(high, int):
+                    params[name] = rng.randint(low, high)
+                else:
+                    params[name] = round(rng.uniform(low, high), 4)
+            else:
+                params[name] = rng.choice(candidates)
+        parameter_sets.append(params)
+    return parameter_sets
+
+
+def run_sweep(
+    history: Sequence[Tuple[datetime, float]],
+    parameter_sets: List[ParameterSet],
+    lookback_days: int = 30,
+    horizon: int = 20,
+    workers: Optional[int] = None
+) -> List[SweepResult]:
+    """
+    以 process pool 平行評估所有參數組合，回傳依分數排序的結果
+
+    歷史數據只放進共享記憶體一次，每個 worker 啟動時掛載，任務本身只傳遞參數。
+
+    Args:
+        history: 依日期排序的 (date, vix_value) 序列
+        parameter_sets: 要評估的參數組合
+        lookback_days: 回溯天數
+        horizon: 進場後觀察的交易日數
+        workers: process 數量（預設為 CPU 核心數）
+
+    Returns:
+        依 score、adverse_excursion 由佳到差排序的結果
+    """
+    dates = np.array([d for d, _ in history], dtype="datetime64[us]")
+    values = np.array([v for _, v in history], dtype=np.float64)
+
+    dates_block = _share_array(dates)
+    values_block = _share_array(values)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_attach_history,
+            initargs=(dates_block.name, values_block.name, len(values), lookback_days, horizon),
+        ) as pool:
+            chunksize = max(1, len(parameter_sets) // ((workers or os.cpu_count() or 1) * 4))
+            results = list(pool.map(_evaluate_shared, parameter_sets, chunksize=chunksize))
+    finally:
+        dates_block.close()
+        dates_block.unlink()
+        values_block.close()
+        values_block.unlink()
+
+    return sorted(results, key=lambda r: (r.score, r.adverse_excursion))
+
+
+def _parse_param(text: str) -> Tuple[str, Union[list, tuple]]:
+    """解析 NAME=v1,v2,... 或 NAME=low:high"""
+    name, _, spec = text.partition("=")
+    name = name.strip().upper()
+    if name not in TUNABLE_PARAMETERS:
+        raise argparse.ArgumentTypeError(f"Unknown parameter {name}; choose from {', '.join(TUNABLE_PARAMETERS)}")
+
+    def number(token: str) -> Union[int, float]:
+        token = token.strip()
+        return float(token) if any(c in token for c in ".eE") else int(token)
+
+    try:
+        if ":" in spec:
+            low, high = spec.split(":", 1)
+            return name, (number(low), number(high))
+        return name, [number(token) for token in spec.split(",") if token.strip()]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"Invalid values for {name}: {spec}") from e
+
+
+def format_results(results: List[SweepResult], top: int = 20) -> str:
+    """將排序後的結果格式化為表格"""
+    if not results:
+        return "無結果 / No results"
+
+    names = list(results[0].params)
+    header = f"{'rank':>4} {'score':>9} {'adverse':>9} {'entries':>7}  " + "  ".join(names)
+    lines = [header, "-" * len(header)]
+    for rank, result in enumerate(results[:top], start=1):
+        values = "  ".join(f"{result.params[n]:>{len(n)}}" for n in names)
+        lines.append(f"{rank:>4} {result.score:>+9.3f} {result.adverse_excursion:>+9.3f} {result.entries:>7}  {values}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Sweep command entry point
+
+    Returns:
+        int: Exit code (0 for success, 1 for failure)
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.backtest sweep",
+        description="Rank VIXMonitor threshold sets over a local daily VIX history",
+    )
+    parser.add_argument("path", help="CSV (CBOE / Yahoo export) or Parquet file with daily VIX closes")
+    parser.add_argument("--param", type=_parse_param, action="append", required=True,
+                        help="NAME=v1,v2,... (grid / random choice) or NAME=low:high (random range)")
+    parser.add_argument("--samples", type=int, default=0, help="Random search with N samples (0 = grid search)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--lookback-days", type=int, default=30)
+    parser.add_argument("--horizon", type=int, default=20, help="Trading days observed after each entry")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    space: SearchSpace = dict(args.param)
+    try:
+        if args.samples > 0:
+            parameter_sets = random_search(space, args.samples, seed=args.seed)
+        else:
+            parameter_sets = grid_search(space)
+        history = load_history(args.path)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    print(f"Evaluating {len(parameter_sets)} parameter sets over {len(history)} days...")
+    results = run_sweep(
+        history,
+        parameter_sets,
+        lookback_days=args.lookback_days,
+        horizon=args.horizon,
+        workers=args.workers,
+    )
+    print(format_results(results, top=args.top))
+    return 0
+
+
+def run():
+    """CLI entry point"""
+    sys.exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Long-running daemon mode
+常駐執行：整個生命週期共用一個 aiohttp session 與一個 VIXMonitor，依 cron 排程抓取並通知
+
+Usage:
+    python -m src.daemon
+    python -m src.daemon --cron "27 2 * * *" --cron "27 14 * * *" --intraday "*/15 * * * 1-5"
+
+During the regular session each run also polls Yahoo's 1-minute VIX bars
+through an IntradayVIXMonitor, so today's point is the latest minute close.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import sys
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Sequence, Union
+from zoneinfo import ZoneInfo
+
+import aiohttp
+
+from .fetchers import HTTPCache
+from .main import (
+    FEAR_GREED_TTL, NOTIFY_HEARTBEAT_HOURS, registry_from_env, run_cycle, term_structure_from_env, webhook_urls_from_env
+)
+from .monitors import IntradayVIXMonitor, VIXMonitor
+from .notifiers import DiscordNotifier, NotificationGate, NotificationOutbox, describe_error
+from .scheduler import CronSchedule, ScheduledJob, next_run
+from .storage import FearGreedHistoryStore
+
+# 與 GitHub Actions 排程相同（UTC 2:27 / 14:27 = 台灣時間 10:27 / 22:27）
+DEFAULT_CRONS = ("27 2 * * *", "27 14 * * *")
+
+# 閒置連線保留時間（秒），讓盤中輪詢能沿用既有的 TLS 連線
+KEEPALIVE_TIMEOUT = 20 * 60
+
+
+class Daemon:
+    """Runs notification cycles on a schedule until stopped"""
+
+    def __init__(
+        self,
+        webhook_url: Union[str, Sequence[str]],
+        jobs: List[ScheduledJob],
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)
+    ):
+        """
+        Args:
+            webhook_url: Discord webhook URL, or a list of them
+            jobs: Scheduled jobs
+            clock: Returns the current timezone-aware time
+        """
+        self.webhook_url = webhook_url
+        self.jobs = jobs
+        self.clock = clock
+        self.monitor: Optional[VIXMonitor] = None
+        self.cycles = 0
+        self._stop = asyncio.Event()
+
+    def stop(self) -> None:
+        """Ask the daemon to exit after the current cycle"""
+        self._stop.set()
+
+    async def _sleep_until(self, when: datetime) -> bool:
+        """Sleep until `when`; False if stopped first"""
+        delay = (when - self.clock()).total_seconds()
+        if delay > 0:
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+        return not self._stop.is_set()
+
+    async def run(self, session: Optional[aiohttp.ClientSession] = None) -> int:
+        """
+        Run until SIGTERM / SIGINT or stop()
+
+        Args:
+            session: Session to use (default: a new pooled session for the daemon's lifetime)
+
+        Returns:
+            int: Exit code
+        """
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, self.stop)
+
+        try:
+            if session is not None:
+                await self._loop(session)
+            else:
+                connector = aiohttp.TCPConnector(keepalive_timeout=KEEPALIVE_TIMEOUT)
+                async with aiohttp.ClientSession(connector=connector) as session:
+                    await self._loop(session)
+        finally:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                loop.remove_signal_handler(signum)
+
+        print(f"Daemon stopped after {self.cycles} cycles")
+        return 0
+
+    async def _loop(self, session: aiohttp.ClientSession) -> None:
+        outbox = NotificationOutbox(os.environ.get("NOTIFY_OUTBOX_PATH"))
+        notifier = DiscordNotifier(self.webhook_url, outbox=outbox)
+        http_cache = HTTPCache(os.environ.get("HTTP_CACHE_DIR"), ttl=FEAR_GREED_TTL)
+        fng_store = FearGreedHistoryStore(os.environ.get("FEAR_GREED_STORE_DIR"))
+        gate = NotificationGate(os.environ.get("NOTIFY_STATE_PATH"), heartbeat=NOTIFY_HEARTBEAT_HOURS * 3600)
+        # 多指數與期限結構監控器與單一 VIXMonitor 一樣跨排程保持暖機
+        registry = registry_from_env()
+        term_structure = term_structure_from_env()
+        # 盤中以分鐘 K 棒更新當日數據；包裝本輪實際使用的 ^VIX 監控器
+        if registry:
+            self.monitor = registry.primary
+        elif self.monitor is None:
+            self.monitor = VIXMonitor(lookback_days=30)
+        intraday = IntradayVIXMonitor(self.monitor)
+
+        with outbox:
+            while not self._stop.is_set():
+                when, due = next_run(self.jobs, self.clock())
+                print(f"Next run at {when:%Y-%m-%d %H:%M %Z} ({', '.join(job.schedule.expression for job in due)})")
+                if not await self._sleep_until(when):
+                    break
+
+                try:
+                    self.monitor = await run_cycle(
+                        session, notifier, http_cache, fng_store, self.monitor, gate, registry, term_structure,
+                        intraday
+                    )
+                except Exception as e:
+                    # 單次失敗不中斷常駐程序，等待下一次排程
+                    print(f"Error: Cycle failed - {describe_error(e)}")
+                self.cycles += 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Daemon entry point
+
+    Returns:
+        int: Exit code (0 for success, 1 for failure)
+    """
+    parser = argparse.ArgumentParser(description="Run the notifier as a long-running scheduled daemon")
+    parser.add_argument("--cron", action="append", default=None,
+                        help=f"Cron expression for a report (repeatable; default: {' and '.join(DEFAULT_CRONS)})")
+    parser.add_argument("--intraday", action="append", default=[],
+                        help="Cron expression that only runs during US regular trading hours (repeatable)")
+    parser.add_argument("--tz", default="UTC", help="Time zone the cron expressions are evaluated in")
+    args = parser.parse_args(argv)
+
+    webhook_urls = webhook_urls_from_env()
+    if not webhook_urls:
+        print("Error: DISCORD_WEBHOOK_URL environment variable is not set")
+        return 1
+
+    try:
+        tz = ZoneInfo(args.tz)
+        jobs = [ScheduledJob(CronSchedule(expr, tz)) for expr in (args.cron or DEFAULT_CRONS)]
+        jobs += [ScheduledJob(CronSchedule(expr, tz), market_hours_only=True) for expr in args.intraday]
+    except (ValueError, KeyError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    return asyncio.run(Daemon(webhook_urls, jobs).run())
+
+
+def run():
+    """CLI entry point"""
+    sys.exit(main())
+
+
+if __name__ == "__main__":
+    run()
@@ -2,6 +2,15 @@
 Data fetchers for market indices
 """
 from .fear_greed_fetcher import FearGreedFetcher
-from .vix_fetcher import VIXFetcher
+from .http_cache import HTTPCache
+from .yahoo_chart_fetcher import YahooChartFetcher
 
-__all__ = ["FearGreedFetcher", "VIXFetcher"]
+__all__ = ["FearGreedFetcher", "HTTPCache", "VIXFetcher", "YahooChartFetcher"]
+
+
+def __getattr__(name):
+    # VIXFetcher pulls in yfinance (and pandas / NumPy); import it only on demand
+    if name == "VIXFetcher":
+        from .vix_fetcher import VIXFetcher
+        return VIXFetcher
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
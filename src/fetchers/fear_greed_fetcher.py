@@ -2,7 +2,12 @@
 CNN Fear & Greed Index data fetcher
 """
 import aiohttp
-from typing import Dict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..storage import FearGreedHistoryStore
+from .http_cache import HTTPCache
+from .json_stream import JSONScalarExtractor
 
 
 class FearGreedFetcher:
@@ -10,44 +15,148 @@ class FearGreedFetcher:
 
     API_URL = "https://production.dataviz.cnn.io/index/fearandgreed/graphdata"
 
+    # 七項子指標（graphdata 的 key → 顯示名稱）
+    INDICATORS = {
+        "market_momentum_sp500": "市場動能 / Market Momentum",
+        "stock_price_strength": "股價強度 / Stock Price Strength",
+        "stock_price_breadth": "股價廣度 / Stock Price Breadth",
+        "put_call_options": "賣權買權比 / Put and Call Options",
+        "market_volatility_vix": "市場波動 / Market Volatility",
+        "safe_haven_demand": "避險需求 / Safe Haven Demand",
+        "junk_bond_demand": "垃圾債需求 / Junk Bond Demand",
+    }
+
+    HISTORY_PATH = ("fear_and_greed_historical", "data")
+
+    CHUNK_SIZE = 16 * 1024
+
     @staticmethod
-    async def fetch(session: aiohttp.ClientSession) -> Dict:
+    async def fetch(
+        session: aiohttp.ClientSession,
+        cache: Optional[HTTPCache] = None,
+        history_store: Optional[FearGreedHistoryStore] = None
+    ) -> Dict:
         """
-        Fetch the CNN Fear & Greed Index from their API.
+        Fetch the CNN Fear & Greed Index and its sub-indicators.
+
+        The payload is parsed incrementally as it streams in, so the long
+        history arrays are never held in memory. With a cache, a fresh
+        cached response is used without any request; otherwise a
+        conditional request is sent and a 304 is served from disk.
+        With a history store, daily scores newer than the stored ones are
+        appended from `fear_and_greed_historical` while streaming.
 
         Args:
             session: aiohttp client session
+            cache: Optional on-disk HTTP cache
+            history_store: Optional local Fear & Greed history store
 
         Returns:
-            dict: Contains 'score', 'rating', 'timestamp'
+            dict: Contains 'score', 'rating', 'timestamp' and 'indicators'
+                (key → {'score', 'rating'} for each sub-indicator present)
 
         Raises:
             aiohttp.ClientError: If the API request fails
             ValueError: If the response format is unexpected
         """
+        url = FearGreedFetcher.API_URL
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
 
+        history: List[Tuple[datetime, float]] = []
+        extractor = FearGreedFetcher._extractor(history, history_store)
+
+        meta = cache.load_meta(url) if cache else None
+        if meta and cache.is_fresh(meta):
+            values = FearGreedFetcher._extract(extractor, cache.iter_body(url))
+            return FearGreedFetcher._finish(values, history, history_store)
+        headers.update(HTTPCache.conditional_headers(meta))
+
         async with session.get(
-            FearGreedFetcher.API_URL,
+            url,
             headers=headers,
             timeout=aiohttp.ClientTimeout(total=30)
         ) as response:
-            response.raise_for_status()
-            data = await response.json()
+            if response.status == 304 and meta:
+                cache.refresh(url, meta)
+                values = FearGreedFetcher._extract(extractor, cache.iter_body(url))
+            else:
+                response.raise_for_status()
+                if cache:
+                    with cache.store_stream(url, response.headers) as body:
+                        async for chunk in response.content.iter_chunked(FearGreedFetcher.CHUNK_SIZE):
+                            extractor.feed(chunk)
+                            body.write(chunk)
+                        values = extractor.close()
+                else:
+                    async for chunk in response.content.iter_chunked(FearGreedFetcher.CHUNK_SIZE):
+                        extractor.feed(chunk)
+                    values = extractor.close()
+
+        return FearGreedFetcher._finish(values, history, history_store)
+
+    @staticmethod
+    def _extractor(
+        history: List[Tuple[datetime, float]],
+        history_store: Optional[FearGreedHistoryStore]
+    ) -> JSONScalarExtractor:
+        """Extractor that also collects daily history newer than the store"""
+        if history_store is None:
+            return JSONScalarExtractor(max_depth=2)
+
+        last_date = history_store.last_date()
+
+        def on_point(point: Dict[str, Any]) -> None:
+            if point.get("x") is None or point.get("y") is None:
+                return
+            date = datetime.fromtimestamp(point["x"] / 1000, tz=timezone.utc).replace(tzinfo=None)
+            date = date.replace(hour=0, minute=0, second=0, microsecond=0)
+            if last_date is None or date >= last_date:
+                history.append((date, float(point["y"])))
 
-        if "fear_and_greed" not in data:
+        return JSONScalarExtractor(max_depth=2, records={FearGreedFetcher.HISTORY_PATH: on_point})
+
+    @staticmethod
+    def _finish(
+        values: Dict[Tuple[str, ...], Any],
+        history: List[Tuple[datetime, float]],
+        history_store: Optional[FearGreedHistoryStore]
+    ) -> Dict:
+        """Parse the extracted values, then persist the collected history"""
+        result = FearGreedFetcher._parse(values)
+        if history_store is not None and history:
+            history_store.append(history)
+        return result
+
+    @staticmethod
+    def _extract(extractor: JSONScalarExtractor, chunks: Iterable[bytes]) -> Dict[Tuple[str, ...], Any]:
+        """Run an extractor over an iterable of body chunks"""
+        for chunk in chunks:
+            extractor.feed(chunk)
+        return extractor.close()
+
+    @staticmethod
+    def _parse(values: Dict[Tuple[str, ...], Any]) -> Dict:
+        """Build the result from the extracted (section, field) → value pairs"""
+        if ("fear_and_greed", "score") not in values:
             raise ValueError("Unexpected API response format: missing 'fear_and_greed' key")
 
-        fng_data = data["fear_and_greed"]
+        score = round(values[("fear_and_greed", "score")] or 0)
+        rating = values.get(("fear_and_greed", "rating"), "Unknown")
+        timestamp = values.get(("fear_and_greed", "timestamp"), "")
 
-        score = round(fng_data.get("score", 0))
-        rating = fng_data.get("rating", "Unknown")
-        timestamp = fng_data.get("timestamp", "")
+        indicators = {}
+        for key in FearGreedFetcher.INDICATORS:
+            if values.get((key, "score")) is not None:
+                indicators[key] = {
+                    "score": round(values[(key, "score")]),
+                    "rating": values.get((key, "rating"), "Unknown"),
+                }
 
         return {
             "score": score,
             "rating": rating,
-            "timestamp": timestamp
+            "timestamp": timestamp,
+            "indicators": indicators
         }
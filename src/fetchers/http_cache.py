@@ -0,0 +1,128 @@
+"""
+On-disk HTTP cache with conditional requests
+保存回應內容與 ETag / Last-Modified，支援條件式請求與新鮮度 TTL
+"""
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Dict, Iterator, Optional
+
+from ..market_hours import is_market_open, next_market_open
+
+
+class HTTPCache:
+    """Stores response bodies and validators under a cache directory"""
+
+    DEFAULT_DIR = os.path.join(".cache", "http")
+
+    # 收盤後數據可能仍在更新，收盤 30 分鐘後才視為已定案
+    SETTLE_BUFFER = timedelta(minutes=30)
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = 300):
+        """
+        Initialize the cache
+
+        Args:
+            directory: Cache directory (default: .cache/http)
+            ttl: Seconds a cached response is served without revalidation
+        """
+        self.directory = directory or self.DEFAULT_DIR
+        self.ttl = ttl
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha256(url.encode()).hexdigest()[:32]
+        return os.path.join(self.directory, f"{key}.{suffix}")
+
+    def body_path(self, url: str) -> str:
+        """Path of the cached response body"""
+        return self._path(url, "body")
+
+    def load_meta(self, url: str) -> Optional[Dict]:
+        """
+        Cached validators and fetch time, or None if nothing usable is cached
+        """
+        try:
+            with open(self._path(url, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self.body_path(url)):
+            return None
+        return meta
+
+    def is_fresh(self, meta: Dict, now: Optional[float] = None) -> bool:
+        """
+        Whether the cached response can be served without any request
+
+        Fresh when younger than the TTL, or when it was fetched after the
+        market had settled and the market has not reopened since.
+        """
+        now = now if now is not None else time.time()
+        fetched_at = meta.get("fetched_at", 0)
+        if now - fetched_at < self.ttl:
+            return True
+
+        fetched = datetime.fromtimestamp(fetched_at, tz=timezone.utc)
+        current = datetime.fromtimestamp(now, tz=timezone.utc)
+        return (
+            not is_market_open(fetched, close_buffer=self.SETTLE_BUFFER)
+            and next_market_open(fetched) > current
+        )
+
+    @staticmethod
+    def conditional_headers(meta: Optional[Dict]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a cached response"""
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def iter_body(self, url: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Read the cached response body chunk by chunk"""
+        with open(self.body_path(url), "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    @contextmanager
+    def store_stream(self, url: str, headers) -> Iterator[BinaryIO]:
+        """
+        Save a 200 response body written chunk by chunk
+
+        The body only replaces the cached one (and the validators are only
+        updated) if the block exits without an exception.
+
+        Args:
+            url: Request URL
+            headers: Response headers (ETag / Last-Modified are kept)
+        """
+        body_path = self.body_path(url)
+        try:
+            with open(body_path + ".tmp", "wb") as f:
+                yield f
+        except BaseException:
+            os.remove(body_path + ".tmp")
+            raise
+        os.replace(body_path + ".tmp", body_path)
+
+        self._write_meta(url, {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        })
+
+    def refresh(self, url: str, meta: Dict) -> None:
+        """Mark a cached response as revalidated (after a 304)"""
+        self._write_meta(url, {**meta, "fetched_at": time.time()})
+
+    def _write_meta(self, url: str, meta: Dict) -> None:
+        meta_path = self._path(url, "meta.json")
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
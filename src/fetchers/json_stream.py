@@ -0,0 +1,136 @@
+"""
+Incremental JSON scalar extractor
+逐段解析 JSON 串流，只保留淺層的純量值，深層陣列（例如歷史數據）直接略過不建立物件
+"""
+import codecs
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 結構符號、完整字串，或數字 / true / false / null
+_TOKEN = re.compile(r'\s*(?:([{}\[\],:])|("(?:[^"\\]|\\.)*")|([^\s{}\[\],:"]+))')
+
+Path = Tuple[Optional[str], ...]
+
+
+class JSONScalarExtractor:
+    """
+    Collects scalar values of object members up to max_depth
+
+    Feed the payload chunk by chunk; only the current unfinished token is
+    buffered, so memory stays flat however long the skipped arrays are.
+    Values are keyed by their key path, e.g. ("fear_and_greed", "score").
+
+    Arrays of objects can also be streamed record by record: for each
+    array path in `records`, the callback receives every element's scalar
+    members as a dict as soon as the element is complete.
+    """
+
+    def __init__(
+        self,
+        max_depth: int = 2,
+        records: Optional[Dict[Path, Callable[[Dict[str, Any]], None]]] = None
+    ):
+        """
+        Args:
+            max_depth: Deepest object nesting whose scalar members are kept
+            records: Array key path → callback for each object element
+        """
+        self.max_depth = max_depth
+        self.records = records or {}
+        self.values: Dict[Path, Any] = {}
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._stack: List[str] = []           # 目前所在的容器（"{" 或 "["）
+        self._keys: List[Optional[str]] = []  # 各層物件目前的 key
+        self._record: Optional[Dict[str, Any]] = None  # 正在讀取的陣列元素
+        self._record_depth = 0
+        self._expect_key = False
+        self._done = False
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Parse the next chunk of the payload
+
+        Raises:
+            ValueError: If the payload is not valid JSON
+        """
+        self._scan(self._buffer + self._decoder.decode(chunk), final=False)
+
+    def close(self) -> Dict[Path, Any]:
+        """
+        Finish parsing and return the collected values
+
+        Raises:
+            ValueError: If the payload is truncated or not valid JSON
+        """
+        self._scan(self._buffer + self._decoder.decode(b"", final=True), final=True)
+        if self._buffer.strip() or self._stack or not self._done:
+            raise ValueError("Truncated JSON payload")
+        return self.values
+
+    def _scan(self, text: str, final: bool) -> None:
+        pos = 0
+        end = len(text)
+        while pos < end:
+            match = _TOKEN.match(text, pos)
+            if match is None:
+                rest = text[pos:].lstrip()
+                if not rest or (rest.startswith('"') and not final):
+                    break  # 只剩空白，或字串尚未結束，等待下一段
+                raise ValueError(f"Invalid JSON near: {text[pos:pos + 40]!r}")
+            punct, string, literal = match.groups()
+            if literal is not None and match.end() == end and not final:
+                break  # 數字可能被切斷，等待下一段
+            pos = match.end()
+            if punct:
+                self._on_punct(punct)
+            else:
+                self._on_value(string if string is not None else literal)
+        self._buffer = text[pos:]
+
+    def _on_punct(self, char: str) -> None:
+        if char in "{[":
+            if (
+                char == "{" and self._record is None and self._stack
+                and self._stack[-1] == "[" and tuple(self._keys[:-1]) in self.records
+            ):
+                self._record = {}
+                self._record_depth = len(self._stack) + 1
+            self._stack.append(char)
+            self._keys.append(None)
+            self._expect_key = char == "{"
+        elif char in "}]":
+            if self._record is not None and len(self._stack) == self._record_depth:
+                self.records[tuple(self._keys[:-2])](self._record)
+                self._record = None
+            if not self._stack or self._stack.pop() != ("{" if char == "}" else "["):
+                raise ValueError(f"Unbalanced {char!r} in JSON payload")
+            self._keys.pop()
+            self._expect_key = False
+            self._done = not self._stack
+        elif char == ",":
+            self._expect_key = bool(self._stack) and self._stack[-1] == "{"
+
+    def _on_value(self, token: str) -> None:
+        if self._expect_key:
+            self._keys[-1] = json.loads(token)
+            self._expect_key = False
+            return
+
+        if not self._stack:
+            self._done = True
+            return
+
+        depth = len(self._stack)
+        if self._record is not None and depth == self._record_depth:
+            self._record[self._keys[-1]] = json.loads(token)
+            return
+        if depth > self.max_depth or "[" in self._stack:
+            return
+
+        path = tuple(self._keys)
+        try:
+            self.values[path] = json.loads(token)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON value: {token[:40]!r}") from e
@@ -2,8 +2,20 @@
 VIX data fetcher using Yahoo Finance
 """
 import yfinance as yf
-from datetime import datetime, timedelta
-from typing import List, Tuple
+from datetime import datetime, time, timedelta
+from typing import List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+try:
+    from yfinance.exceptions import YFException
+except ImportError:  # yfinance < 0.2.30 has no exception hierarchy
+    YFException = ValueError
+
+from ..models import VIXSnapshot
+from ..storage import VIXHistoryStore
+
+# 下載失敗的類型：網路（requests / curl_cffi 皆為 OSError）、無數據或格式錯誤、yfinance 自身的錯誤
+DOWNLOAD_ERRORS = (OSError, ValueError, YFException)
 
 
 class VIXFetcher:
@@ -11,6 +23,11 @@ class VIXFetcher:
 
     SYMBOL = "^VIX"
 
+    # VIX 指數於美東時間 9:30-16:15 計算，期間最後一筆為盤中數據
+    MARKET_TZ = ZoneInfo("America/New_York")
+    SESSION_OPEN = time(9, 30)
+    SESSION_CLOSE = time(16, 15)
+
     @staticmethod
     def fetch_current() -> float:
         """
@@ -31,12 +48,17 @@ class VIXFetcher:
         return float(data['Close'].iloc[-1])
 
     @staticmethod
-    def fetch_history(days: int = 30) -> List[Tuple[datetime, float]]:
+    def fetch_history(days: int = 30, store: Optional[VIXHistoryStore] = None) -> List[Tuple[datetime, float]]:
         """
         Fetch historical VIX data
 
+        With a store, only bars from the last stored date onwards are
+        downloaded (the last bar is refetched in case it was intraday),
+        merged into the store, and the full window is read back from it.
+
         Args:
             days: Number of days of historical data to fetch
+            store: Optional local history store for incremental top-ups
 
         Returns:
             List of (date, vix_value) tuples
@@ -44,14 +66,83 @@ class VIXFetcher:
         Raises:
             Exception: If data fetch fails
         """
-        vix = yf.Ticker(VIXFetcher.SYMBOL)
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
+        return VIXFetcher._fetch_bars(start_date, end_date, store)
+
+    @staticmethod
+    def fetch_snapshot(days: int = 30, store: Optional[VIXHistoryStore] = None) -> VIXSnapshot:
+        """
+        Fetch VIX history and the latest quote in a single request
 
+        The history includes today's bar, so the current value is simply
+        the last bar; is_intraday tells whether that bar is still moving.
+
+        Args:
+            days: Number of days of historical data to fetch
+            store: Optional local history store for incremental top-ups
+
+        Returns:
+            VIXSnapshot: History, current value and intraday flag
+
+        Raises:
+            Exception: If data fetch fails
+        """
+        now = datetime.now()
+        # end 為不含當日，往後推一天以包含今日（盤中）數據
+        history = VIXFetcher._fetch_bars(now - timedelta(days=days), now + timedelta(days=1), store)
+        if not history:
+            raise Exception("Failed to fetch VIX data")
+
+        last_date, current = history[-1]
+        return VIXSnapshot(
+            history=history,
+            current=current,
+            is_intraday=VIXFetcher._is_intraday(last_date),
+        )
+
+    @staticmethod
+    def _is_intraday(bar_date: datetime, now: Optional[datetime] = None) -> bool:
+        """Whether a daily bar dated bar_date is today's bar during the session"""
+        now = now or datetime.now(VIXFetcher.MARKET_TZ)
+        return (
+            bar_date.date() == now.date()
+            and now.weekday() < 5
+            and VIXFetcher.SESSION_OPEN <= now.time() < VIXFetcher.SESSION_CLOSE
+        )
+
+    @staticmethod
+    def _fetch_bars(
+        start_date: datetime,
+        end_date: datetime,
+        store: Optional[VIXHistoryStore] = None
+    ) -> List[Tuple[datetime, float]]:
+        """Download bars in [start_date, end_date), topping up the store if given"""
+        if store is None:
+            return VIXFetcher._download(start_date, end_date)
+
+        last_date = store.last_date(VIXFetcher.SYMBOL)
+        fetch_start = max(start_date, last_date) if last_date else start_date
+
+        try:
+            store.upsert(VIXFetcher.SYMBOL, VIXFetcher._download(fetch_start, end_date))
+        except DOWNLOAD_ERRORS as e:
+            # 沒有新數據（例如週末）或暫時無法連線時沿用已保存的歷史，但不接受過舊的數據
+            if not VIXHistoryStore.can_stand_in(last_date, start_date):
+                raise
+            print(f"Warning: {VIXFetcher.SYMBOL} download failed ({type(e).__name__}: {e}); "
+                  f"using stored history up to {last_date:%Y-%m-%d}")
+
+        return store.load(VIXFetcher.SYMBOL, start=start_date, end=end_date - timedelta(days=1))
+
+    @staticmethod
+    def _download(start_date: datetime, end_date: datetime) -> List[Tuple[datetime, float]]:
+        """Download daily closes between start_date and end_date"""
+        vix = yf.Ticker(VIXFetcher.SYMBOL)
         data = vix.history(start=start_date, end=end_date)
 
         if data.empty:
-            raise Exception("Failed to fetch VIX historical data")
+            raise ValueError("Failed to fetch VIX historical data")
 
         history = []
         for date, row in data.iterrows():
@@ -0,0 +1,414 @@
+"""
+VIX data fetcher using Yahoo Finance's chart JSON endpoint
+Native aiohttp alternative to yfinance (no pandas / NumPy needed)
+"""
+import asyncio
+import time
+import aiohttp
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..models import VIXSnapshot
+from ..storage import VIXHistoryStore
+
+
+class YahooChartFetcher:
+    """Fetches daily VIX bars from Yahoo's chart API over the shared session"""
+
+    BASE_URL = "https://query1.finance.yahoo.com"
+    CHART_PATH = "/v8/finance/chart/{symbol}"
+    SPARK_PATH = "/v7/finance/spark"
+    SYMBOL = "^VIX"
+
+    # spark 端點單次請求的代號上限
+    SPARK_MAX_SYMBOLS = 20
+
+    # spark 只接受固定的 range 參數：(涵蓋天數, range)
+    SPARK_RANGES = ((5, "5d"), (31, "1mo"), (92, "3mo"), (183, "6mo"), (366, "1y"),
+                    (731, "2y"), (1827, "5y"), (3653, "10y"))
+
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    }
+
+    @staticmethod
+    async def fetch_history(
+        session: aiohttp.ClientSession,
+        days: int = 30,
+        store: Optional[VIXHistoryStore] = None,
+        symbol: str = SYMBOL
+    ) -> List[Tuple[datetime, float]]:
+        """
+        Fetch historical VIX data (excluding today's bar)
+
+        Args:
+            session: aiohttp client session
+            days: Number of days of historical data to fetch
+            store: Optional local history store for incremental top-ups
+            symbol: Ticker symbol
+
+        Returns:
+            List of (date, vix_value) tuples
+
+        Raises:
+            aiohttp.ClientError: If the API request fails
+            ValueError: If the response format is unexpected
+        """
+        end_date = datetime.now()
+        history, _meta = await YahooChartFetcher._fetch_bars(
+            session, end_date - timedelta(days=days), end_date, store, symbol
+        )
+        return history
+
+    @staticmethod
+    async def fetch_snapshot(
+        session: aiohttp.ClientSession,
+        days: int = 30,
+        store: Optional[VIXHistoryStore] = None,
+        symbol: str = SYMBOL
+    ) -> VIXSnapshot:
+        """
+        Fetch VIX history and the latest quote in a single request
+
+        Args:
+            session: aiohttp client session
+            days: Number of days of historical data to fetch
+            store: Optional local history store for incremental top-ups
+            symbol: Ticker symbol
+
+        Returns:
+            VIXSnapshot: History, current value and intraday flag
+
+        Raises:
+            aiohttp.ClientError: If the API request fails
+            ValueError: If the response format is unexpected
+        """
+        now = datetime.now()
+        history, meta = await YahooChartFetcher._fetch_bars(
+            session, now - timedelta(days=days), now + timedelta(days=1), store, symbol
+        )
+        if not history:
+            raise ValueError(f"No {symbol} data returned")
+        return YahooChartFetcher._snapshot(history, meta)
+
+    @staticmethod
+    async def fetch_snapshots(
+        session: aiohttp.ClientSession,
+        symbols: Sequence[str],
+        days: int = 30,
+        store: Optional[VIXHistoryStore] = None
+    ) -> Dict[str, VIXSnapshot]:
+        """
+        Fetch history and the latest quote of several symbols at once
+
+        Uses Yahoo's spark endpoint, one request per 20 symbols, so adding
+        a symbol does not add a round trip.
+
+        Args:
+            session: aiohttp client session
+            symbols: Ticker symbols (e.g. ^VIX, ^VXN, ^VVIX)
+            days: Number of days of historical data to fetch
+            store: Optional local history store for incremental top-ups
+
+        Returns:
+            Snapshots by symbol; symbols without data are left out
+
+        Raises:
+            aiohttp.ClientError: If the API request fails
+            ValueError: If the response format is unexpected
+        """
+        now = datetime.now()
+        bars = await YahooChartFetcher._fetch_many(
+            session, symbols, now - timedelta(days=days), now + timedelta(days=1), store
+        )
+        return {
+            symbol: YahooChartFetcher._snapshot(history, meta)
+            for symbol, (history, meta) in bars.items()
+            if history
+        }
+
+    @staticmethod
+    async def fetch_minute_bars(
+        session: aiohttp.ClientSession,
+        symbol: str = SYMBOL,
+        interval: str = "1m"
+    ) -> List[Tuple[datetime, float, float, float, float]]:
+        """
+        Fetch today's intraday bars (regular session)
+
+        Args:
+            session: aiohttp client session
+            symbol: Ticker symbol
+            interval: Bar size (1m, 2m, 5m, ...)
+
+        Returns:
+            List of (UTC timestamp, open, high, low, close) tuples
+
+        Raises:
+            aiohttp.ClientError: If the API request fails
+            ValueError: If the response format is unexpected
+        """
+        params = {"range": "1d", "interval": interval, "includePrePost": "false"}
+        async with session.get(
+            YahooChartFetcher.BASE_URL + YahooChartFetcher.CHART_PATH.format(symbol=symbol),
+            params=params,
+            headers=YahooChartFetcher.HEADERS,
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            response.raise_for_status()
+            payload = await response.json()
+        return YahooChartFetcher.parse_bars(payload)
+
+    @staticmethod
+    def _snapshot(history: List[Tuple[datetime, float]], meta: Dict) -> VIXSnapshot:
+        """Wrap bars in a snapshot, flagging an unfinished regular session"""
+        regular = meta.get("currentTradingPeriod", {}).get("regular", {})
+        now_ts = time.time()
+        is_intraday = (
+            regular.get("start", 0) <= now_ts < regular.get("end", 0)
+            and meta.get("regularMarketTime", 0) >= regular.get("start", 0)
+        )
+
+        return VIXSnapshot(history=history, current=history[-1][1], is_intraday=is_intraday)
+
+    @staticmethod
+    async def _fetch_bars(
+        session: aiohttp.ClientSession,
+        start_date: datetime,
+        end_date: datetime,
+        store: Optional[VIXHistoryStore],
+        symbol: str
+    ) -> Tuple[List[Tuple[datetime, float]], Dict]:
+        """Download bars in [start_date, end_date), topping up the store if given"""
+        if store is None:
+            return await YahooChartFetcher._download(session, start_date, end_date, symbol)
+
+        last_date = store.last_date(symbol)
+        fetch_start = max(start_date, last_date) if last_date else start_date
+
+        meta: Dict = {}
+        try:
+            bars, meta = await YahooChartFetcher._download(session, fetch_start, end_date, symbol)
+            store.upsert(symbol, bars)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            # 沒有新數據（例如週末）或暫時無法連線時沿用已保存的歷史，但不接受過舊的數據
+            if not VIXHistoryStore.can_stand_in(last_date, start_date):
+                raise
+            print(f"Warning: {symbol} download failed ({type(e).__name__}: {e}); "
+                  f"using stored history up to {last_date:%Y-%m-%d}")
+
+        return store.load(symbol, start=start_date, end=end_date - timedelta(days=1)), meta
+
+    @staticmethod
+    async def _fetch_many(
+        session: aiohttp.ClientSession,
+        symbols: Sequence[str],
+        start_date: datetime,
+        end_date: datetime,
+        store: Optional[VIXHistoryStore]
+    ) -> Dict[str, Tuple[List[Tuple[datetime, float]], Dict]]:
+        """Batched _fetch_bars: one download covering the stalest symbol"""
+        if store is None:
+            return await YahooChartFetcher._download_many(session, symbols, start_date, end_date)
+
+        last_dates = {symbol: store.last_date(symbol) for symbol in symbols}
+        fetch_start = min(
+            max(start_date, last_date) if last_date else start_date
+            for last_date in last_dates.values()
+        )
+
+        downloaded: Dict[str, Tuple[List[Tuple[datetime, float]], Dict]] = {}
+        try:
+            downloaded = await YahooChartFetcher._download_many(session, symbols, fetch_start, end_date)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            # 沒有新數據（例如週末）或暫時無法連線時，各代號沿用夠新的已保存歷史
+            if not any(VIXHistoryStore.can_stand_in(last_date, start_date) for last_date in last_dates.values()):
+                raise
+            print(f"Warning: Batch download failed ({type(e).__name__}: {e})")
+
+        results = {}
+        for symbol in symbols:
+            if symbol in downloaded:
+                bars, meta = downloaded[symbol]
+                store.upsert(symbol, bars)
+            elif VIXHistoryStore.can_stand_in(last_dates[symbol], start_date):
+                meta = {}
+                print(f"Warning: No fresh data for {symbol}; using stored history up to {last_dates[symbol]:%Y-%m-%d}")
+            else:
+                # 已保存的歷史過舊或不存在：視為缺漏，不以舊數據產生訊號
+                continue
+            history = store.load(symbol, start=start_date, end=end_date - timedelta(days=1))
+            if history:
+                results[symbol] = (history, meta)
+        return results
+
+    @staticmethod
+    async def _download_many(
+        session: aiohttp.ClientSession,
+        symbols: Sequence[str],
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[str, Tuple[List[Tuple[datetime, float]], Dict]]:
+        """Request the spark endpoint (batches of 20 symbols, concurrently) and parse it"""
+        span = (end_date - start_date).days
+        data_range = next((name for days, name in YahooChartFetcher.SPARK_RANGES if span <= days), "max")
+        step = YahooChartFetcher.SPARK_MAX_SYMBOLS
+
+        async def download(batch: Sequence[str]) -> Dict:
+            params = {"symbols": ",".join(batch), "range": data_range, "interval": "1d"}
+            async with session.get(
+                YahooChartFetcher.BASE_URL + YahooChartFetcher.SPARK_PATH,
+                params=params,
+                headers=YahooChartFetcher.HEADERS,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+                response.raise_for_status()
+                return await response.json()
+
+        payloads = await asyncio.gather(
+            *(download(symbols[i:i + step]) for i in range(0, len(symbols), step))
+        )
+
+        # range 以現在為準，再依 [start_date, end_date) 篩選（end 不含當日）
+        start_day = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        end_day = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        results = {}
+        for payload in payloads:
+            for symbol, (history, meta) in YahooChartFetcher.parse_spark(payload).items():
+                results[symbol] = ([(date, value) for date, value in history if start_day <= date < end_day], meta)
+        if not results:
+            raise ValueError(f"Failed to fetch {', '.join(symbols)} historical data")
+        return results
+
+    @staticmethod
+    async def _download(
+        session: aiohttp.ClientSession,
+        start_date: datetime,
+        end_date: datetime,
+        symbol: str
+    ) -> Tuple[List[Tuple[datetime, float]], Dict]:
+        """Request the chart endpoint and parse it"""
+        params = {
+            "period1": str(int(start_date.timestamp())),
+            "period2": str(int(end_date.timestamp())),
+            "interval": "1d",
+            "includePrePost": "false",
+        }
+
+        async with session.get(
+            YahooChartFetcher.BASE_URL + YahooChartFetcher.CHART_PATH.format(symbol=symbol),
+            params=params,
+            headers=YahooChartFetcher.HEADERS,
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            response.raise_for_status()
+            payload = await response.json()
+
+        history, meta = YahooChartFetcher.parse_chart(payload)
+        if not history:
+            raise ValueError(f"Failed to fetch {symbol} historical data")
+
+        # end 不含當日，與 yfinance 的 history(end=...) 一致
+        end_day = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        return [(date, value) for date, value in history if date < end_day], meta
+
+    @staticmethod
+    def parse_chart(payload: Dict) -> Tuple[List[Tuple[datetime, float]], Dict]:
+        """
+        Parse a chart API response into daily (date, close) tuples
+
+        Bars are stamped with their calendar date in the exchange's time
+        zone (midnight, timezone-naive), matching yfinance's daily index.
+        Bars without a close are skipped.
+
+        Args:
+            payload: Decoded chart JSON
+
+        Returns:
+            Tuple of (history, meta)
+
+        Raises:
+            ValueError: If the response format is unexpected
+        """
+        chart = payload.get("chart") or {}
+        if chart.get("error"):
+            raise ValueError(f"Yahoo chart error: {chart['error']}")
+
+        try:
+            result = chart["result"][0]
+            meta = result["meta"]
+            timestamps = result.get("timestamp") or []
+            closes = result["indicators"]["quote"][0].get("close") or []
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"Unexpected chart response format: {e}") from e
+
+        offset = meta.get("gmtoffset", 0)
+        history = []
+        for ts, close in zip(timestamps, closes):
+            if close is None:
+                continue
+            local = datetime.fromtimestamp(ts + offset, tz=timezone.utc).replace(tzinfo=None)
+            history.append((local.replace(hour=0, minute=0, second=0, microsecond=0), float(close)))
+
+        return history, meta
+
+    @staticmethod
+    def parse_spark(payload: Dict) -> Dict[str, Tuple[List[Tuple[datetime, float]], Dict]]:
+        """
+        Parse a spark API response (several symbols) into daily bars
+
+        Each symbol's entry has the same shape as a chart result; symbols
+        Yahoo could not resolve are skipped with a warning.
+
+        Args:
+            payload: Decoded spark JSON
+
+        Returns:
+            (history, meta) by symbol
+
+        Raises:
+            ValueError: If the response format is unexpected
+        """
+        spark = payload.get("spark")
+        if not isinstance(spark, dict):
+            raise ValueError("Unexpected spark response format: no 'spark' object")
+        if spark.get("error"):
+            raise ValueError(f"Yahoo spark error: {spark['error']}")
+
+        results = {}
+        for entry in spark.get("result") or []:
+            symbol = entry.get("symbol")
+            try:
+                results[symbol] = YahooChartFetcher.parse_chart({"chart": {"result": entry["response"]}})
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Warning: No chart data for {symbol} - {e!r}")
+        return results
+
+    @staticmethod
+    def parse_bars(payload: Dict) -> List[Tuple[datetime, float, float, float, float]]:
+        """
+        Parse a chart API response into OHLC bars with UTC timestamps
+
+        Bars missing any price (e.g. the minute still forming) are skipped.
+
+        Raises:
+            ValueError: If the response format is unexpected
+        """
+        chart = payload.get("chart") or {}
+        if chart.get("error"):
+            raise ValueError(f"Yahoo chart error: {chart['error']}")
+
+        try:
+            result = chart["result"][0]
+            timestamps = result.get("timestamp") or []
+            quote = result["indicators"]["quote"][0]
+            columns = [quote.get(key) or [] for key in ("open", "high", "low", "close")]
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"Unexpected chart response format: {e}") from e
+
+        bars = []
+        for ts, *prices in zip(timestamps, *columns):
+            if None in prices:
+                continue
+            bars.append((datetime.fromtimestamp(ts, tz=timezone.utc), *map(float, prices)))
+        return bars
@@ -5,91 +5,311 @@ Fetches market indices and sends comprehensive analysis to Discord.
 """
 import os
 import sys
+import time
 import asyncio
 import aiohttp
 
-from datetime import datetime
+from typing import Awaitable, Dict, List, Optional, TypeVar
+
 from dotenv import load_dotenv, find_dotenv
 
-from .fetchers import FearGreedFetcher, VIXFetcher
-from .monitors import VIXMonitor
-from .notifiers import DiscordNotifier
+from .fetchers import FearGreedFetcher, HTTPCache, YahooChartFetcher
+from .models import MarketSignal, VIXSnapshot
+from .monitors import IntradayVIXMonitor, TermStructureMonitor, VIXMonitor, VolatilityRegistry
+from .notifiers import DiscordNotifier, NotificationGate, NotificationOutbox, describe_error
+from .storage import FearGreedHistoryStore, VIXHistoryStore
 
 load_dotenv(find_dotenv())
 
+T = TypeVar("T")
 
-async def main() -> int:
+# Per-source fetch timeouts (seconds)
+FEAR_GREED_TIMEOUT = 30
+VIX_TIMEOUT = 30
+
+# Serve cached CNN responses without revalidation for this long (seconds)
+FEAR_GREED_TTL = float(os.environ.get("FEAR_GREED_TTL", 300))
+
+# Resend an unchanged report after this long (hours)
+NOTIFY_HEARTBEAT_HOURS = float(os.environ.get("NOTIFY_HEARTBEAT_HOURS", 24))
+
+
+def webhook_urls_from_env() -> List[str]:
+    """DISCORD_WEBHOOK_URL may hold several webhooks separated by commas or whitespace"""
+    return os.environ.get("DISCORD_WEBHOOK_URL", "").replace(",", " ").split()
+
+
+def registry_from_env() -> Optional[VolatilityRegistry]:
+    """VOLATILITY_SYMBOLS (e.g. "^VIX,^VXN,^VVIX") enables the multi-gauge report"""
+    symbols = os.environ.get("VOLATILITY_SYMBOLS", "").replace(",", " ").split()
+    return VolatilityRegistry(symbols) if symbols else None
+
+
+def term_structure_from_env() -> Optional[TermStructureMonitor]:
+    """VIX_TERM_STRUCTURE=1 adds the VIX9D / VIX / VIX3M curve to phase detection"""
+    enabled = os.environ.get("VIX_TERM_STRUCTURE", "").lower() in ("1", "true", "yes")
+    return TermStructureMonitor() if enabled else None
+
+
+async def _timed(name: str, awaitable: Awaitable[T], timeout: float) -> T:
+    """Await a fetch with a timeout and log how long it took"""
+    started = time.perf_counter()
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    finally:
+        print(f"  [{name}] finished in {time.perf_counter() - started:.2f}s")
+
+
+async def _fetch_vix_snapshot(session: aiohttp.ClientSession) -> VIXSnapshot:
     """
-    Main function to fetch market data and send to Discord.
+    Fetch VIX history + latest quote, topped up from the local store.
+
+    Uses Yahoo's chart endpoint over the shared session by default;
+    VIX_SOURCE=yfinance switches to the (blocking) yfinance fetcher,
+    which then runs in a worker thread.
+    """
+    store_path = os.environ.get("VIX_STORE_PATH")
+
+    if os.environ.get("VIX_SOURCE", "chart").lower() == "yfinance":
+        from .fetchers import VIXFetcher
+
+        def fetch_blocking() -> VIXSnapshot:
+            with VIXHistoryStore(store_path) as store:
+                return VIXFetcher.fetch_snapshot(days=30, store=store)
+
+        return await asyncio.to_thread(fetch_blocking)
+
+    with VIXHistoryStore(store_path) as store:
+        return await YahooChartFetcher.fetch_snapshot(session, days=30, store=store)
+
+
+async def _fetch_volatility_snapshots(session: aiohttp.ClientSession, symbols: List[str]) -> Dict[str, VIXSnapshot]:
+    """Fetch every monitored volatility index in one batched request, topped up from the local store"""
+    with VIXHistoryStore(os.environ.get("VIX_STORE_PATH")) as store:
+        return await YahooChartFetcher.fetch_snapshots(session, symbols, days=30, store=store)
+
+
+async def _feed_minute_bars(session: aiohttp.ClientSession, intraday: IntradayVIXMonitor) -> None:
+    """Overwrite today's VIX point with the latest minute bar; a failed fetch keeps the daily quote"""
+    try:
+        bars = await asyncio.wait_for(YahooChartFetcher.fetch_minute_bars(session), VIX_TIMEOUT)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        print(f"Warning: Minute bars unavailable - {type(e).__name__}: {e}")
+        return
+
+    intraday.feed(bars)
+    today = intraday.today
+    if today:
+        print(f"VIX today: O {today.open:.2f} H {today.high:.2f} L {today.low:.2f} C {today.close:.2f} "
+              f"({len(intraday.bars)} minute bars)")
+
+
+async def run_cycle(
+    session: aiohttp.ClientSession,
+    notifier: DiscordNotifier,
+    http_cache: Optional[HTTPCache] = None,
+    fng_store: Optional[FearGreedHistoryStore] = None,
+    monitor: Optional[VIXMonitor] = None,
+    gate: Optional[NotificationGate] = None,
+    registry: Optional[VolatilityRegistry] = None,
+    term_structure: Optional[TermStructureMonitor] = None,
+    intraday: Optional[IntradayVIXMonitor] = None
+) -> Optional[VIXMonitor]:
+    """
+    Fetch both sources once and send the report.
+
+    Args:
+        session: Shared aiohttp client session
+        notifier: Discord notifier
+        http_cache: Optional CNN response cache
+        fng_store: Optional local Fear & Greed history store
+        monitor: Warm VIX monitor from a previous cycle; only bars from its
+            latest date onwards are fed into it
+        gate: Optional change detector; reports are only sent on a
+            phase / signal transition, a threshold crossing or a heartbeat
+        registry: Optional multi-symbol registry; all of its symbols are
+            fetched in one batch, its ^VIX monitor replaces `monitor` and
+            the other gauges are added to the report
+        term_structure: Optional VIX curve monitor; its symbols join the
+            same batch and an inverted curve feeds into phase detection
+        intraday: Optional minute-bar monitor wrapping this cycle's VIX
+            monitor (registry.primary with a registry); during the session
+            today's point is updated from Yahoo's 1-minute bars
+
+    The notifier's outbox (if any) is flushed alongside the fetches, so
+    reports missed during a Discord outage go out first and in order.
 
     Returns:
-        int: Exit code (0 for success, 1 for failure)
+        The up-to-date VIX monitor (the one passed in if VIX failed)
+
+    Raises:
+        aiohttp.ClientError / ValueError: If Fear & Greed cannot be fetched,
+            or if no webhook accepted the report
     """
-    # Get webhook URL from environment variable
-    webhook_url = os.environ.get("DISCORD_WEBHOOK_URL")
+    # Fetch all sources concurrently over the shared session;
+    # messages left undelivered by an earlier outage are replayed meanwhile
+    print("Fetching CNN Fear & Greed Index and VIX data...")
+    batch = list(dict.fromkeys(
+        (registry.symbols if registry else []) + (list(term_structure.SYMBOLS) if term_structure else [])
+    ))
+    started = time.perf_counter()
+    fng_result, vix_result, _replayed = await asyncio.gather(
+        _timed("CNN Fear & Greed", FearGreedFetcher.fetch(session, http_cache, fng_store), FEAR_GREED_TIMEOUT),
+        _timed(
+            "Yahoo VIX",
+            _fetch_volatility_snapshots(session, batch) if batch else _fetch_vix_snapshot(session),
+            VIX_TIMEOUT,
+        ),
+        notifier.flush(session),
+        return_exceptions=True,
+    )
+    print(f"All sources fetched in {time.perf_counter() - started:.2f}s")
 
-    if not webhook_url:
-        print("Error: DISCORD_WEBHOOK_URL environment variable is not set")
-        return 1
+    # Fear & Greed is required
+    if isinstance(fng_result, BaseException):
+        raise fng_result
+    fng_data = fng_result
+    print(f"Fear & Greed: {fng_data['score']} - {fng_data['rating']}")
 
+    market_signal: Optional[MarketSignal] = None
+    gauges: Dict[str, MarketSignal] = {}
     try:
-        async with aiohttp.ClientSession() as session:
-            # Initialize notifier
-            notifier = DiscordNotifier(webhook_url)
+        if isinstance(vix_result, BaseException):
+            raise vix_result
+
+        if batch:
+            # 批次模式：所有代號一次取得，^VIX 仍決定進場訊號
+            if VolatilityRegistry.PRIMARY not in vix_result:
+                raise ValueError(f"No {VolatilityRegistry.PRIMARY} data returned")
+            snapshot = vix_result[VolatilityRegistry.PRIMARY]
+        else:
+            snapshot = vix_result
+
+        if registry:
+            missing = registry.update(vix_result)
+            if missing:
+                print(f"Warning: No data for {', '.join(missing)}")
+            monitor = registry.primary
+        else:
+            if monitor is None:
+                monitor = intraday.monitor if intraday else VIXMonitor(lookback_days=30)
+            # Bulk-load the history on the first run; a warm monitor (daemon
+            # mode) only takes bars from its latest date onwards
+            VolatilityRegistry.top_up(monitor, snapshot.history)
 
-            # Fetch Fear & Greed Index
-            print("Fetching CNN Fear & Greed Index...")
-            fng_data = await FearGreedFetcher.fetch(session)
-            print(f"Fear & Greed: {fng_data['score']} - {fng_data['rating']}")
+        if intraday and snapshot.is_intraday:
+            await _feed_minute_bars(session, intraday)
 
-            # Fetch VIX data
-            print("\nFetching VIX data...")
+        session_note = " (intraday)" if snapshot.is_intraday else ""
+        print(f"Current VIX: {snapshot.current:.2f}{session_note}")
+        print(f"Fetched {len(snapshot.history)} days of VIX history")
+
+        # VIX term structure (optional; the spot signal does not depend on it)
+        curve = None
+        if term_structure:
             try:
-                # Get current VIX
-                current_vix = VIXFetcher.fetch_current()
-                print(f"Current VIX: {current_vix:.2f}")
+                term_structure.update(vix_result)
+                curve = term_structure.current()
+            except ValueError as e:
+                print(f"Warning: {e}")
+            if curve:
+                state = "inverted" if curve.inverted else "contango"
+                print(f"VIX/VIX3M: {curve.long_ratio:.2f} ({state}), VIX9D/VIX: {curve.short_ratio:.2f}")
+
+        # Generate market signal
+        if registry:
+            signals = registry.evaluate(curve)
+            market_signal = signals.pop(registry.PRIMARY)
+            gauges = {registry.name(symbol): signal for symbol, signal in signals.items()}
+        else:
+            market_signal = monitor.generate_signal(curve)
+        print(f"\nMarket Phase: {market_signal.phase.value}")
+        print(f"Signal: {market_signal.signal.value}")
+        print(f"Risk Level: {market_signal.risk_level}")
+        for name, signal in gauges.items():
+            print(f"{name}: {signal.vix_current:.2f} ({signal.phase.value})")
+
+    except Exception as vix_error:
+        print(f"Warning: VIX data fetch failed - {vix_error!r}")
+        print("Falling back to Fear & Greed Index only...")
 
-                # Get historical VIX data
-                vix_history = VIXFetcher.fetch_history(days=30)
-                print(f"Fetched {len(vix_history)} days of VIX history")
+    # 只送給有變化（或到達心跳間隔）的 webhook；送達的才記錄狀態
+    if gate:
+        reasons = {}
+        for url in notifier.webhook_urls:
+            reason = gate.check(fng_data, market_signal, destination=url)
+            if reason:
+                reasons[url] = reason
+    else:
+        reasons = dict.fromkeys(notifier.webhook_urls, "always")
 
-                # Initialize VIX monitor and add historical data
-                monitor = VIXMonitor(lookback_days=30)
-                for date, value in vix_history:
-                    monitor.add_data(date, value)
+    if not reasons:
+        print("\nNo phase, signal or threshold change since the last report; not sending")
+        return monitor
 
-                # Add current VIX
-                monitor.add_data(datetime.now(), current_vix)
+    report = "combined report" if market_signal else "Fear & Greed only report"
+    print(f"\nSending {report} to {len(reasons)} of {len(notifier.webhook_urls)} Discord webhook(s) "
+          f"({', '.join(sorted(set(reasons.values())))})...")
+    if market_signal:
+        results = await notifier.send_combined_report(
+            session, fng_data, market_signal, destinations=list(reasons), gauges=gauges or None
+        )
+    else:
+        results = await notifier.send_fear_greed_only(session, fng_data, destinations=list(reasons))
 
-                # Generate market signal
-                market_signal = monitor.generate_signal()
-                print(f"\nMarket Phase: {market_signal.phase.value}")
-                print(f"Signal: {market_signal.signal.value}")
-                print(f"Risk Level: {market_signal.risk_level}")
+    # 已存入 outbox 的訊息會在下次執行時補送，視同已送出
+    delivered = [result.url for result in results if result.ok or result.queued]
+    if gate:
+        gate.record(fng_data, market_signal, destinations=delivered)
+    queued = sum(1 for result in results if result.queued)
+    print(f"Sent to {len(delivered) - queued} of {len(results)} webhook(s)"
+          + (f", {queued} queued for replay" if queued else ""))
 
-                # Send combined report to Discord
-                print("\nSending combined report to Discord...")
-                await notifier.send_combined_report(session, fng_data, market_signal)
-                print("Combined report sent successfully!")
+    return monitor
 
-            except Exception as vix_error:
-                print(f"Warning: VIX data fetch failed - {vix_error}")
-                print("Falling back to Fear & Greed Index only...")
 
-                # Send Fear & Greed only
-                await notifier.send_fear_greed_only(session, fng_data)
-                print("Fear & Greed notification sent successfully!")
+async def main() -> int:
+    """
+    Main function to fetch market data and send to Discord.
+
+    Returns:
+        int: Exit code (0 for success, 1 for failure)
+    """
+    # Get webhook URL(s) from environment variable
+    webhook_urls = webhook_urls_from_env()
 
+    if not webhook_urls:
+        print("Error: DISCORD_WEBHOOK_URL environment variable is not set")
+        return 1
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            # Initialize notifier (with its outbox), the CNN response cache,
+            # the F&G history and the last-sent state
+            outbox = NotificationOutbox(os.environ.get("NOTIFY_OUTBOX_PATH"))
+            notifier = DiscordNotifier(webhook_urls, outbox=outbox)
+            http_cache = HTTPCache(os.environ.get("HTTP_CACHE_DIR"), ttl=FEAR_GREED_TTL)
+            fng_store = FearGreedHistoryStore(os.environ.get("FEAR_GREED_STORE_DIR"))
+            gate = NotificationGate(os.environ.get("NOTIFY_STATE_PATH"), heartbeat=NOTIFY_HEARTBEAT_HOURS * 3600)
+
+            try:
+                await run_cycle(
+                    session, notifier, http_cache, fng_store, gate=gate,
+                    registry=registry_from_env(), term_structure=term_structure_from_env()
+                )
+            finally:
+                outbox.close()
             return 0
 
     except aiohttp.ClientError as e:
-        print(f"Error: Network request failed - {e}")
+        # 例外內容可能含 webhook URL（含 token），只記錄類型與狀態碼
+        print(f"Error: Network request failed - {describe_error(e)}")
         return 1
     except ValueError as e:
         print(f"Error: Invalid data - {e}")
         return 1
     except Exception as e:
-        print(f"Error: Unexpected error - {e}")
+        print(f"Error: Unexpected error - {describe_error(e)}")
         return 1
 
 
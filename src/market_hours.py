@@ -0,0 +1,68 @@
+"""
+US equity market hours helpers
+美股交易時段判斷（未計入假日）
+"""
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+MARKET_TZ = ZoneInfo("America/New_York")
+REGULAR_OPEN = time(9, 30)
+REGULAR_CLOSE = time(16, 0)
+
+
+def is_market_open(now: datetime, close_buffer: timedelta = timedelta(0)) -> bool:
+    """
+    Whether the regular session is open at `now`
+
+    Args:
+        now: Timezone-aware datetime
+        close_buffer: Extra time after the close still treated as open
+            (e.g. for data that settles after the bell)
+    """
+    local = now.astimezone(MARKET_TZ)
+    if local.weekday() >= 5:
+        return False
+    opened = datetime.combine(local.date(), REGULAR_OPEN, MARKET_TZ)
+    closed = datetime.combine(local.date(), REGULAR_CLOSE, MARKET_TZ) + close_buffer
+    return opened <= local < closed
+
+
+def next_market_open(after: datetime) -> datetime:
+    """
+    Next regular-session open strictly after `after`
+
+    Args:
+        after: Timezone-aware datetime
+
+    Returns:
+        Timezone-aware datetime in America/New_York
+    """
+    local = after.astimezone(MARKET_TZ)
+    day = local.date()
+    while True:
+        candidate = datetime.combine(day, REGULAR_OPEN, MARKET_TZ)
+        if candidate > local and candidate.weekday() < 5:
+            return candidate
+        day += timedelta(days=1)
+
+
+def sessions_closed_since(day: datetime, now: datetime) -> int:
+    """
+    Regular sessions after `day` that have already closed by `now`
+
+    Used to tell how far behind a daily bar is (holidays count as sessions,
+    so a long weekend reads as one session behind).
+
+    Args:
+        day: Date of the bar (the time part is ignored)
+        now: Timezone-aware datetime
+    """
+    local = now.astimezone(MARKET_TZ)
+    count = 0
+    current = day.date() + timedelta(days=1)
+    while current <= local.date():
+        closed = current < local.date() or local.time() >= REGULAR_CLOSE
+        if current.weekday() < 5 and closed:
+            count += 1
+        current += timedelta(days=1)
+    return count
@@ -1,6 +1,7 @@
 """
 Data models and enums for market signals
 """
-from .market_signal import MarketPhase, Signal, VIXData, MarketSignal
+from .market_signal import MarketPhase, Signal, TermStructure, VIXData, VIXSnapshot, MarketSignal
+from .vix_history import VIXHistory
 
-__all__ = ["MarketPhase", "Signal", "VIXData", "MarketSignal"]
+__all__ = ["MarketPhase", "Signal", "TermStructure", "VIXData", "VIXHistory", "VIXSnapshot", "MarketSignal"]
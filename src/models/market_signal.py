@@ -4,7 +4,7 @@ Data models and enums for market signal analysis
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import List, Optional, Tuple
 
 
 class MarketPhase(Enum):
@@ -28,13 +28,39 @@ class Signal(Enum):
     NORMAL = "正常持有 / Normal"
 
 
-@dataclass
+@dataclass(slots=True)
 class VIXData:
     """VIX Data / VIX 數據"""
     date: datetime
     value: float
 
 
+@dataclass
+class VIXSnapshot:
+    """VIX Snapshot / VIX 快照（歷史 + 最新報價）"""
+    history: List[Tuple[datetime, float]]
+    current: float
+    is_intraday: bool  # 最後一筆為盤中尚未收盤的數據
+
+
+@dataclass
+class TermStructure:
+    """VIX Term Structure / VIX 期限結構（VIX9D / VIX / VIX3M）"""
+    date: datetime
+    vix9d: float
+    vix: float
+    vix3m: float
+    short_ratio: float  # VIX9D / VIX
+    long_ratio: float  # VIX / VIX3M
+    short_inverted_days: int  # VIX9D > VIX 的連續天數
+    long_inverted_days: int  # VIX > VIX3M 的連續天數
+
+    @property
+    def inverted(self) -> bool:
+        """Backwardation: spot VIX above 3-month VIX / 逆價差（倒掛）"""
+        return self.long_ratio > 1.0
+
+
 @dataclass
 class MarketSignal:
     """Market Signal / 市場訊號"""
@@ -46,3 +72,4 @@ class MarketSignal:
     days_declining: int
     reason: str
     risk_level: str  # "低 / Low", "中 / Medium", "高 / High", "極高 / Very High"
+    term_structure: Optional[TermStructure] = None
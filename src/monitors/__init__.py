@@ -1,6 +1,17 @@
 """
 Market monitors and signal analyzers
 """
+from .intraday_monitor import IntradayVIXMonitor
+from .term_structure import TermStructureMonitor
 from .vix_monitor import VIXMonitor
+from .volatility_registry import VolatilityRegistry
 
-__all__ = ["VIXMonitor"]
+__all__ = ["IntradayVIXMonitor", "TermStructureMonitor", "VIXMonitor", "VolatilityRegistry", "SignalSeries", "score_series"]
+
+
+def __getattr__(name):
+    # The vectorized engine needs NumPy; import it only on demand
+    if name in ("SignalSeries", "score_series"):
+        from . import signal_engine
+        return getattr(signal_engine, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
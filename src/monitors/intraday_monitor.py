@@ -0,0 +1,127 @@
+"""
+Intraday streaming VIX monitor
+盤中逐筆 / 逐分鐘更新：以固定長度的環狀緩衝保存分鐘 K 棒，原地彙整當日 OHLC，每根 K 棒 O(1) 重新評估訊號
+"""
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Deque, Iterable, Optional, Tuple
+
+from ..market_hours import MARKET_TZ
+from ..models import MarketSignal
+from .vix_monitor import VIXMonitor
+
+# (時間, 開, 高, 低, 收)
+BarTuple = Tuple[datetime, float, float, float, float]
+
+
+@dataclass
+class Bar:
+    """OHLC Bar / K 棒（分鐘或日）"""
+    start: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+
+    def extend(self, high: float, low: float, close: float):
+        """把同一時段的新數據併入（原地更新）"""
+        self.high = max(self.high, high)
+        self.low = min(self.low, low)
+        self.close = close
+
+
+class IntradayVIXMonitor:
+    """Feeds minute bars or ticks into a daily VIXMonitor with bounded memory"""
+
+    # 一個正規交易時段的分鐘數（9:30-16:00）
+    SESSION_MINUTES = 390
+
+    def __init__(self, monitor: Optional[VIXMonitor] = None, max_bars: int = SESSION_MINUTES):
+        """
+        Args:
+            monitor: 日線監控器（通常已載入歷史）；預設為新的 VIXMonitor
+            max_bars: 保留的分鐘 K 棒數（環狀緩衝，超過時丟棄最舊的）
+        """
+        self.monitor = monitor or VIXMonitor()
+        self.bars: Deque[Bar] = deque(maxlen=max_bars)
+        self.days: Deque[Bar] = deque(maxlen=self.monitor.lookback_days + 1)
+        self.signal: Optional[MarketSignal] = None
+
+    @staticmethod
+    def _minute(timestamp: datetime) -> datetime:
+        """K 棒起始時間（交易所時區的整分鐘）"""
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.astimezone(MARKET_TZ).replace(second=0, microsecond=0)
+
+    def on_tick(self, timestamp: datetime, price: float) -> MarketSignal:
+        """
+        新增一筆報價，併入所屬的分鐘 K 棒
+
+        Args:
+            timestamp: 報價時間（無時區視為 UTC）
+            price: VIX 報價
+
+        Returns:
+            MarketSignal: 以最新報價作為當日收盤的訊號
+        """
+        return self.on_bar(timestamp, price, price, price, price)
+
+    def on_bar(self, timestamp: datetime, open_price: float, high: float, low: float, close: float) -> MarketSignal:
+        """
+        新增（或更新）一根分鐘 K 棒
+
+        同一分鐘的數據會原地併入最新的 K 棒；早於最新 K 棒的數據略過。
+
+        Args:
+            timestamp: K 棒時間（無時區視為 UTC）
+            open_price, high, low, close: 價格
+
+        Returns:
+            MarketSignal: 以最新收盤作為當日收盤的訊號
+        """
+        start = self._minute(timestamp)
+        latest = self.bars[-1] if self.bars else None
+        if latest is not None and start < latest.start:
+            return self.signal
+
+        if latest is not None and start == latest.start:
+            latest.extend(high, low, close)
+        else:
+            self.bars.append(Bar(start, open_price, high, low, close))
+
+        self._update_day(start, open_price, high, low, close)
+        self.signal = self.monitor.generate_signal()
+        return self.signal
+
+    def feed(self, bars: Iterable[BarTuple]) -> Optional[MarketSignal]:
+        """
+        依序餵入多根 K 棒（例如一次輪詢取得的分鐘數據）
+
+        Returns:
+            最後一根 K 棒之後的訊號
+        """
+        for bar in bars:
+            self.on_bar(*bar)
+        return self.signal
+
+    def _update_day(self, start: datetime, open_price: float, high: float, low: float, close: float):
+        """原地更新當日 OHLC，並以最新收盤覆寫日線監控器的當日數據"""
+        day = start.replace(hour=0, minute=0, tzinfo=None)
+        today = self.days[-1] if self.days else None
+        if today is not None and today.start == day:
+            today.extend(high, low, close)
+        else:
+            self.days.append(Bar(day, open_price, high, low, close))
+
+        history = self.monitor.vix_history
+        if history and history.date_at(-1) == day:
+            self.monitor.update_last(close)
+        else:
+            self.monitor.add_data(day, close)
+
+    @property
+    def today(self) -> Optional[Bar]:
+        """當日（最新交易日）的 OHLC"""
+        return self.days[-1] if self.days else None
@@ -0,0 +1,216 @@
+"""
+Vectorized VIX Signal Engine
+以 NumPy 一次計算整段 VIX 序列每一天的市場階段與進場訊號
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+import numpy as np
+
+from ..models import MarketPhase, Signal
+from .vix_monitor import VIXMonitor
+
+# 階段、訊號與風險等級的整數編碼（對應下列查表陣列的索引）
+_PHASES = np.array(list(MarketPhase), dtype=object)
+_SIGNALS = np.array(list(Signal), dtype=object)
+_RISK_LEVELS = np.array(["低 / Low", "中 / Medium", "高 / High", "極高 / Very High"], dtype=object)
+
+_CALM, _TENSION, _PANIC_RISING, _PANIC_PEAK, _PANIC_FALLING, _RECOVERY = (
+    list(MarketPhase).index(phase) for phase in (
+        MarketPhase.CALM, MarketPhase.TENSION, MarketPhase.PANIC_RISING,
+        MarketPhase.PANIC_PEAK, MarketPhase.PANIC_FALLING, MarketPhase.RECOVERY,
+    )
+)
+_STAY_OUT, _WATCH_CLOSELY, _PREPARE, _ENTRY_30, _ENTRY_60, _ENTRY_100, _NORMAL = (
+    list(Signal).index(signal) for signal in (
+        Signal.STAY_OUT, Signal.WATCH_CLOSELY, Signal.PREPARE, Signal.ENTRY_30,
+        Signal.ENTRY_60, Signal.ENTRY_100, Signal.NORMAL,
+    )
+)
+_LOW, _MEDIUM, _HIGH, _VERY_HIGH = range(4)
+
+
+@dataclass
+class SignalSeries:
+    """Per-day signal arrays / 每日訊號陣列"""
+    dates: np.ndarray            # datetime64[us]
+    vix: np.ndarray              # float64
+    phase_codes: np.ndarray      # int8，索引 list(MarketPhase)
+    signal_codes: np.ndarray     # int8，索引 list(Signal)
+    risk_codes: np.ndarray       # int8，索引 低/中/高/極高
+    peak: np.ndarray             # 30 筆窗口高點
+    change_from_peak: np.ndarray  # 從高點回落比例，無高點時為 NaN
+    rising_days: np.ndarray
+    declining_days: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.vix)
+
+    @property
+    def phase(self) -> np.ndarray:
+        """MarketPhase 物件陣列"""
+        return _PHASES[self.phase_codes]
+
+    @property
+    def signal(self) -> np.ndarray:
+        """Signal 物件陣列"""
+        return _SIGNALS[self.signal_codes]
+
+    @property
+    def risk_level(self) -> np.ndarray:
+        """風險等級字串陣列"""
+        return _RISK_LEVELS[self.risk_codes]
+
+
+def _to_datetime64(dates: Any) -> np.ndarray:
+    """將日期序列轉為 naive datetime64[us]（保留當地時間，與 add_data 一致）"""
+    if getattr(dates, "tz", None) is not None:
+        dates = dates.tz_localize(None)
+    if getattr(dates, "dtype", None) is not None and dates.dtype.kind == "M":
+        return np.asarray(dates, dtype="datetime64[us]")
+    return np.array(
+        [d.replace(tzinfo=None) if isinstance(d, datetime) else d for d in dates],
+        dtype="datetime64[us]",
+    )
+
+
+def _range_max(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """以稀疏表（sparse table）計算 values[starts[i]:i+1] 的最大值"""
+    n = len(values)
+    ends = np.arange(n)
+    lengths = ends - starts + 1
+
+    # 只建到最長查詢區間所需的層數（窗口最多 30 筆時僅 5 層）
+    table = [values]
+    width = 1
+    while width * 2 <= lengths.max():
+        previous = table[-1]
+        table.append(np.maximum(previous[:-width], previous[width:]))
+        width *= 2
+
+    levels = np.floor(np.log2(lengths)).astype(np.int64)
+
+    result = np.empty(n, dtype=np.float64)
+    for level in np.unique(levels):
+        mask = levels == level
+        row = table[level]
+        result[mask] = np.maximum(row[starts[mask]], row[ends[mask] - (1 << level) + 1])
+    return result
+
+
+def _run_lengths(step: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """計算以每一天結尾、連續符合 step 的天數（不超過保留的數據筆數）"""
+    n = len(step)
+    index = np.arange(n)
+    resets = np.where(step, 0, index)
+    runs = index - np.maximum.accumulate(resets)
+    return np.minimum(runs, index - starts)
+
+
+def score_series(dates: Any, values: Any, monitor: Optional[VIXMonitor] = None) -> SignalSeries:
+    """
+    一次計算整段 VIX 序列每一天的訊號
+
+    第 i 天的結果等同於依序 add_data 前 i+1 筆數據後呼叫 generate_signal()。
+
+    Args:
+        dates: 依日期遞增排列的日期序列（datetime 清單、datetime64 陣列或 DatetimeIndex）
+        values: 對應的 VIX 值
+        monitor: 提供回溯天數與閾值的監控器（預設為 VIXMonitor()）
+
+    Returns:
+        SignalSeries: 每日階段、訊號、風險等級、高點與回落幅度
+
+    Raises:
+        ValueError: 日期未遞增排序或長度不一致
+    """
+    if monitor is None:
+        monitor = VIXMonitor()
+
+    dates = _to_datetime64(dates)
+    vix = np.asarray(values, dtype=np.float64)
+    n = len(vix)
+    if len(dates) != n:
+        raise ValueError(f"dates and values differ in length ({len(dates)} != {n})")
+    if n and np.any(dates[1:] < dates[:-1]):
+        raise ValueError("dates must be sorted in ascending order")
+
+    # 每一天保留的歷史起點（與 add_data 的回溯窗口一致）
+    cutoff = dates - np.timedelta64(monitor.lookback_days, "D")
+    starts = np.searchsorted(dates, cutoff, side="left")
+    index = np.arange(n)
+
+    if n:
+        peak_30 = _range_max(vix, np.maximum(starts, index - 29))
+    else:
+        peak_30 = np.empty(0, dtype=np.float64)
+
+    up = np.zeros(n, dtype=bool)
+    down = np.zeros(n, dtype=bool)
+    up[1:] = vix[1:] > vix[:-1]
+    down[1:] = vix[1:] < vix[:-1]
+    rising = _run_lengths(up, starts)
+    declining = _run_lengths(down, starts)
+
+    # 市場階段（與 detect_phase 的判斷順序相同）
+    panic_falling = (vix >= monitor.PANIC_THRESHOLD) & (declining >= 3)
+    panic_peak = (vix >= monitor.EXTREME_PANIC_THRESHOLD) & (rising == 0)
+    panic_rising = (vix >= monitor.TENSION_THRESHOLD) & (rising >= 3)
+    recovery = (vix < monitor.PANIC_THRESHOLD) & (peak_30 > monitor.PANIC_THRESHOLD)
+    tension = vix >= monitor.TENSION_THRESHOLD
+    phase_codes = np.select(
+        [panic_falling, panic_peak, panic_rising, recovery, tension],
+        [_PANIC_FALLING, _PANIC_PEAK, _PANIC_RISING, _RECOVERY, _TENSION],
+        default=_CALM,
+    ).astype(np.int8)
+
+    # 從高點回落比例（高點 <= 0 時視為無資料）
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = np.where(peak_30 > 0, (peak_30 - vix) / peak_30, np.nan)
+
+    # generate_signal 以 `change and change >= X` 判斷，回落 0 視為不成立
+    def declined(threshold: float) -> np.ndarray:
+        return (change != 0) & (change >= threshold)
+
+    decline_50 = declined(monitor.PEAK_DECLINE_50)
+    decline_40 = declined(monitor.PEAK_DECLINE_40)
+    decline_30 = declined(monitor.PEAK_DECLINE_30)
+    confirmed = declining >= monitor.MIN_DECLINING_DAYS
+
+    is_falling = phase_codes == _PANIC_FALLING
+    is_recovery = phase_codes == _RECOVERY
+    conditions = [
+        is_falling & decline_50 & confirmed,
+        is_falling & decline_50,
+        is_falling & decline_40 & confirmed,
+        is_falling & decline_40,
+        is_falling & decline_30 & confirmed,
+        is_falling,
+        phase_codes == _PANIC_PEAK,
+        phase_codes == _PANIC_RISING,
+        is_recovery & decline_50,
+        is_recovery & (vix < monitor.CALM_THRESHOLD),
+        is_recovery,
+        phase_codes == _TENSION,
+    ]
+    signal_codes = np.select(conditions, [
+        _ENTRY_100, _ENTRY_60, _ENTRY_60, _PREPARE, _ENTRY_30, _WATCH_CLOSELY,
+        _WATCH_CLOSELY, _STAY_OUT, _ENTRY_100, _ENTRY_100, _ENTRY_60, _STAY_OUT,
+    ], default=_NORMAL).astype(np.int8)
+    risk_codes = np.select(conditions, [
+        _LOW, _MEDIUM, _MEDIUM, _MEDIUM, _MEDIUM, _HIGH,
+        _HIGH, _VERY_HIGH, _LOW, _LOW, _MEDIUM, _HIGH,
+    ], default=_LOW).astype(np.int8)
+
+    return SignalSeries(
+        dates=dates,
+        vix=vix,
+        phase_codes=phase_codes,
+        signal_codes=signal_codes,
+        risk_codes=risk_codes,
+        peak=peak_30,
+        change_from_peak=change,
+        rising_days=rising,
+        declining_days=declining,
+    )
@@ -0,0 +1,121 @@
+"""
+VIX term-structure monitor
+追蹤 VIX9D / VIX / VIX3M 期限結構，逐日累計倒掛（逆價差）天數
+"""
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, List, Mapping, Optional, Tuple
+
+from ..models import TermStructure, VIXSnapshot
+
+# (日期, VIX9D, VIX, VIX3M)
+CurvePoint = Tuple[datetime, float, float, float]
+
+
+class TermStructureMonitor:
+    """Keeps the recent VIX curve and its inversion run lengths"""
+
+    SHORT = "^VIX9D"
+    SPOT = "^VIX"
+    LONG = "^VIX3M"
+    SYMBOLS = (SHORT, SPOT, LONG)
+
+    def __init__(self, lookback_days: int = 30):
+        """
+        Args:
+            lookback_days: 保留歷史數據天數
+        """
+        self.lookback_days = lookback_days
+        self.history: Deque[TermStructure] = deque()
+
+    def add_point(self, date: datetime, vix9d: float, vix: float, vix3m: float):
+        """
+        新增一天的期限結構
+
+        依序到達時只與前一天比較（O(1)）；同日期覆寫最新一筆（盤中更新），
+        亂序數據則重建整段歷史。
+
+        Args:
+            date: 數據日期
+            vix9d: VIX9D 收盤
+            vix: VIX 收盤
+            vix3m: VIX3M 收盤
+        """
+        if date.tzinfo is not None:
+            date = date.replace(tzinfo=None)
+
+        if self.history and date < self.history[-1].date:
+            points = [self._point_of(entry) for entry in self.history if entry.date != date]
+            points.append((date, vix9d, vix, vix3m))
+            self._rebuild(sorted(points))
+            return
+
+        if self.history and date == self.history[-1].date:
+            self.history.pop()
+        self.history.append(self._next(date, vix9d, vix, vix3m))
+        self._evict_expired()
+
+    def update(self, snapshots: Mapping[str, VIXSnapshot]):
+        """
+        以批次抓取的快照更新：只取三個代號都有的日期，且不早於最新一筆
+
+        Args:
+            snapshots: 各代號的快照（需包含 ^VIX9D、^VIX、^VIX3M）
+        """
+        if not all(symbol in snapshots for symbol in self.SYMBOLS):
+            missing = [symbol for symbol in self.SYMBOLS if symbol not in snapshots]
+            raise ValueError(f"No term-structure data for {', '.join(missing)}")
+
+        short, spot, long = (dict(snapshots[symbol].history) for symbol in self.SYMBOLS)
+        latest = self.history[-1].date if self.history else None
+        for date in sorted(set(short) & set(spot) & set(long)):
+            if latest is None or date >= latest:
+                self.add_point(date, short[date], spot[date], long[date])
+
+    def current(self) -> Optional[TermStructure]:
+        """最新的期限結構"""
+        return self.history[-1] if self.history else None
+
+    def _next(self, date: datetime, vix9d: float, vix: float, vix3m: float) -> TermStructure:
+        """依前一天的連續天數計算新的一天"""
+        previous = self.history[-1] if self.history else None
+        short_ratio = vix9d / vix if vix else 0.0
+        long_ratio = vix / vix3m if vix3m else 0.0
+
+        short_days = long_days = 0
+        if short_ratio > 1.0:
+            short_days = (previous.short_inverted_days if previous else 0) + 1
+        if long_ratio > 1.0:
+            long_days = (previous.long_inverted_days if previous else 0) + 1
+
+        return TermStructure(
+            date=date,
+            vix9d=vix9d,
+            vix=vix,
+            vix3m=vix3m,
+            short_ratio=short_ratio,
+            long_ratio=long_ratio,
+            short_inverted_days=short_days,
+            long_inverted_days=long_days,
+        )
+
+    @staticmethod
+    def _point_of(entry: TermStructure) -> CurvePoint:
+        return entry.date, entry.vix9d, entry.vix, entry.vix3m
+
+    def _rebuild(self, points: List[CurvePoint]):
+        """亂序插入後重新計算所有連續天數"""
+        self.history = deque()
+        for point in points:
+            self.history.append(self._next(*point))
+        self._evict_expired()
+
+    def _evict_expired(self):
+        """只保留最近N天（基於最新數據的日期）；連續天數不超過保留的數據"""
+        cutoff_date = self.history[-1].date - timedelta(days=self.lookback_days)
+        while self.history[0].date < cutoff_date:
+            self.history.popleft()
+
+        latest = self.history[-1]
+        latest.short_inverted_days = min(latest.short_inverted_days, len(self.history))
+        latest.long_inverted_days = min(latest.long_inverted_days, len(self.history))
@@ -2,15 +2,23 @@
 VIX Market Signal Monitor
 追蹤 VIX 趨勢並判斷進場時機
 """
-from datetime import datetime, timedelta
-from typing import List, Optional
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
-from ..models import MarketPhase, Signal, VIXData, MarketSignal
+from ..models import MarketPhase, Signal, TermStructure, VIXHistory, MarketSignal
+from ..models.vix_history import MICROS_PER_DAY, to_micros
 
 
 class VIXMonitor:
     """VIX 監控器 - 分析 VIX 趨勢並生成進場訊號"""
 
+    # 同一版本下最多快取幾種期限結構的訊號
+    _SIGNAL_CACHE_SIZE = 8
+
     def __init__(self, lookback_days: int = 30):
         """
         初始化 VIX 監控器
@@ -19,7 +27,25 @@ class VIXMonitor:
             lookback_days: 保留歷史數據天數
         """
         self.lookback_days = lookback_days
-        self.vix_history: List[VIXData] = []
+        # 欄位式儲存（時間戳 + 數值陣列），讀取時才建立 VIXData
+        self.vix_history = VIXHistory()
+
+        # 滾動高點：每個已註冊的窗口維護一個單調遞減佇列 (序號, VIX值)
+        # 序號從 _seq_head（vix_history[0]）連續編到 _seq_next - 1
+        self._peak_windows: Dict[int, Deque[Tuple[int, float]]] = {}
+        self._seq_head = 0
+        self._seq_next = 0
+
+        # 連續上升/下降天數，隨 append 更新
+        self._rising_days = 0
+        self._declining_days = 0
+        # 最新一筆加入前的連續天數，讓 update_last 覆寫最新值時不必重算
+        self._runs_before_last: Tuple[int, int] = (0, 0)
+
+        # 歷史版本：每次數據變動加一，訊號快取以此判斷是否失效
+        self._version = 0
+        # id(期限結構) → (快取鍵, 期限結構, 訊號)
+        self._signal_cache: Dict[int, Tuple[Tuple, Optional[TermStructure], MarketSignal]] = {}
 
         # VIX 閾值設定
         self.CALM_THRESHOLD = 20
@@ -33,6 +59,85 @@ class VIXMonitor:
         self.PEAK_DECLINE_50 = 0.50  # 從高點回落50% → ENTRY_100
         self.MIN_DECLINING_DAYS = 5  # 最少連續下降天數
 
+        # 訊號判斷會用到的高點窗口，預先註冊
+        for days in (10, 30):
+            self.register_peak_window(days)
+
+    @classmethod
+    def from_series(cls, data: Any, values: Any = None, lookback_days: int = 30) -> "VIXMonitor":
+        """
+        以整段歷史建立 VIX 監控器
+
+        Args:
+            data: (date, value) 清單、pandas Series，或搭配 values 的日期陣列
+            values: 與 data 配對的 VIX 值陣列（選填）
+            lookback_days: 保留歷史數據天數
+
+        Returns:
+            VIXMonitor: 已載入數據的監控器
+        """
+        monitor = cls(lookback_days=lookback_days)
+        monitor.add_many(data, values)
+        return monitor
+
+    def add_many(self, data: Any, values: Any = None):
+        """
+        批次新增 VIX 數據：排序一次、去除重複日期、套用一次回溯窗口
+
+        相同日期的數據只保留最後一筆（既有數據視為在新數據之前）。
+
+        Args:
+            data: (date, value) 清單、pandas Series，或搭配 values 的日期陣列
+            values: 與 data 配對的 VIX 值陣列（選填）
+        """
+        # 以 (微秒時間戳, 數值) 處理，不建立中間的 VIXData
+        points = list(zip(self.vix_history.timestamps(), self.vix_history.values()))
+        for date, vix_value in self._iter_points(data, values):
+            if date.tzinfo is not None:
+                date = date.replace(tzinfo=None)
+            points.append((to_micros(date), float(vix_value)))
+
+        if not points:
+            return
+
+        points.sort(key=itemgetter(0))
+
+        deduped: List[Tuple[int, float]] = []
+        for point in points:
+            if deduped and deduped[-1][0] == point[0]:
+                deduped[-1] = point
+            else:
+                deduped.append(point)
+
+        cutoff = deduped[-1][0] - self.lookback_days * MICROS_PER_DAY
+        start = bisect_left(deduped, cutoff, key=itemgetter(0))
+
+        kept = deduped[start:]
+        self.vix_history = VIXHistory.from_columns(map(itemgetter(0), kept), map(itemgetter(1), kept))
+        self._rebuild_derived_state()
+        self._bump_version()
+
+    @staticmethod
+    def _iter_points(data: Any, values: Any = None):
+        """將各種輸入格式轉為 (datetime, value) 序列"""
+        if values is not None:
+            dates = data
+            if getattr(dates, "dtype", None) is not None and dates.dtype.kind == "M":
+                # NumPy datetime64 → datetime
+                dates = dates.astype("datetime64[us]").tolist()
+            if hasattr(values, "tolist"):
+                values = values.tolist()
+            return zip(dates, values)
+
+        if hasattr(data, "index") and hasattr(data, "to_numpy"):
+            # pandas Series：索引為日期，值為 VIX
+            index = data.index
+            if getattr(index, "tz", None) is not None:
+                index = index.tz_localize(None)
+            return zip(index.to_pydatetime(), data.to_numpy(dtype=float).tolist())
+
+        return data
+
     def add_data(self, date: datetime, vix_value: float):
         """
         新增 VIX 數據
@@ -45,22 +150,194 @@ class VIXMonitor:
         if date.tzinfo is not None:
             date = date.replace(tzinfo=None)
 
-        self.vix_history.append(VIXData(date, vix_value))
+        # 只轉換一次時間戳，之後的比較、淘汰與二分搜尋都以整數進行
+        micros = to_micros(date)
+
+        # 按日期插入：依序到達時直接 append，否則以二分搜尋找到插入位置
+        # （bisect_right 讓同日期的新數據排在舊數據之後，與穩定排序一致）
+        latest = self.vix_history.last_timestamp()
+        if latest is None or micros >= latest:
+            self._runs_before_last = (self._rising_days, self._declining_days)
+            self._update_run_lengths(vix_value)
+            self.vix_history.append_micros(micros, vix_value)
+            self._push_peaks(self._seq_next, vix_value)
+            self._seq_next += 1
+            self._evict_expired()
+            self._trim_peaks()
+        else:
+            self.vix_history.insert_micros(self.vix_history.bisect_right_micros(micros), micros, vix_value)
+            self._evict_expired()
+            self._rebuild_derived_state()
+        self._bump_version()
+
+    @property
+    def version(self) -> int:
+        """歷史版本（每次 add_data / add_many / update_last 加一）"""
+        return self._version
+
+    def _bump_version(self):
+        """數據已變動：先前快取的訊號全部失效"""
+        self._version += 1
+        self._signal_cache.clear()
+
+    def _evict_expired(self):
+        """只保留最近N天（基於最新數據的日期，而非系統當前時間）"""
+        latest = self.vix_history.last_timestamp()
+        if latest is None:
+            return
+
+        cutoff = latest - self.lookback_days * MICROS_PER_DAY
+        dropped = self.vix_history.drop_before_micros(cutoff)
+        if not dropped:
+            return
+        self._seq_head += dropped
+
+        # 連續天數不能超過保留下來的數據
+        max_run = len(self.vix_history) - 1
+        self._rising_days = min(self._rising_days, max_run)
+        self._declining_days = min(self._declining_days, max_run)
+
+    def _update_run_lengths(self, vix_value: float):
+        """依新數據與目前最新值比較，更新連續上升/下降天數"""
+        previous = self.vix_history.last_value()
+        if previous is None:
+            return
+
+        self._rising_days, self._declining_days = self._advance_runs(
+            self._rising_days, self._declining_days, previous, vix_value
+        )
+
+    @staticmethod
+    def _advance_runs(rising: int, declining: int, previous: float, vix_value: float) -> Tuple[int, int]:
+        """前一天的連續天數加上新的一天"""
+        if vix_value > previous:
+            return rising + 1, 0
+        if vix_value < previous:
+            return 0, declining + 1
+        return 0, 0
+
+    def _push_peaks(self, seq: int, vix_value: float):
+        """將新數據推入每個高點窗口的單調佇列"""
+        for window in self._peak_windows.values():
+            while window and window[-1][1] <= vix_value:
+                window.pop()
+            window.append((seq, vix_value))
+
+    def _trim_peaks(self):
+        """移除已滑出窗口或已被淘汰的高點"""
+        last_seq = self._seq_next - 1
+        for days, window in self._peak_windows.items():
+            first_seq = max(self._seq_head, last_seq - days + 1)
+            while window and window[0][0] < first_seq:
+                window.popleft()
+
+    def _rebuild_derived_state(self):
+        """亂序插入後重新編號並重建所有衍生狀態"""
+        self._seq_head = 0
+        self._seq_next = len(self.vix_history)
+        for days in self._peak_windows:
+            self._peak_windows[days] = self._build_peak_window(days)
+
+        last = len(self.vix_history) - 1
+        self._rising_days, self._declining_days = self._runs_ending_at(last)
+        self._runs_before_last = self._runs_ending_at(last - 1)
+
+    def _runs_ending_at(self, index: int) -> Tuple[int, int]:
+        """往回數到 vix_history[index] 為止的連續上升/下降天數"""
+        rising = declining = 0
+        while index > 0:
+            latest = self.vix_history.value_at(index)
+            previous = self.vix_history.value_at(index - 1)
+            if latest > previous and declining == 0:
+                rising += 1
+            elif latest < previous and rising == 0:
+                declining += 1
+            else:
+                break
+            index -= 1
+        return rising, declining
+
+    def _build_peak_window(self, days: int) -> Deque[Tuple[int, float]]:
+        """以最近 days 筆數據建立單調佇列"""
+        window: Deque[Tuple[int, float]] = deque()
+        start = max(0, len(self.vix_history) - days)
+        for offset in range(start, len(self.vix_history)):
+            vix_value = self.vix_history.value_at(offset)
+            while window and window[-1][1] <= vix_value:
+                window.pop()
+            window.append((self._seq_head + offset, vix_value))
+        return window
+
+    def update_last(self, vix_value: float):
+        """
+        覆寫最新一筆數據的值（例如盤中每根 K 棒更新當日數據）
+
+        與用同日期呼叫 add_data 不同，不會新增一筆重複日期的數據；
+        連續天數為 O(1)。數值變大時每個高點窗口只需從尾端淘汰；數值變小時，
+        每個已註冊的窗口只重新掃描先前被最新一筆淘汰的那一段（最多一個窗口長度）。
 
-        # 按日期排序
-        self.vix_history.sort(key=lambda x: x.date)
+        Args:
+            vix_value: 最新 VIX 值
+        """
+        if not self.vix_history:
+            raise ValueError("No data to update")
 
-        # 只保留最近N天（基於最新數據的日期，而非系統當前時間）
-        if self.vix_history:
-            latest_date = self.vix_history[-1].date
-            cutoff_date = latest_date - timedelta(days=self.lookback_days)
-            self.vix_history = [d for d in self.vix_history if d.date >= cutoff_date]
+        previous_value = self.vix_history.value_at(-1)
+        self.vix_history.set_value(-1, vix_value)
+
+        if len(self.vix_history) > 1:
+            rising, declining = self._advance_runs(
+                *self._runs_before_last, self.vix_history.value_at(-2), vix_value
+            )
+            max_run = len(self.vix_history) - 1
+            self._rising_days = min(rising, max_run)
+            self._declining_days = min(declining, max_run)
+
+        last_seq = self._seq_next - 1
+        for days, window in self._peak_windows.items():
+            if vix_value >= previous_value:
+                # 最新一筆一定在佇列尾端；數值變大只需再往前淘汰
+                self._push_window(window, last_seq, vix_value)
+            else:
+                # 數值變小時，先前被它淘汰的數據要重新納入
+                self._rescan_peak_tail(days, window, last_seq, vix_value)
+        self._bump_version()
+
+    def _rescan_peak_tail(self, days: int, window: Deque[Tuple[int, float]], last_seq: int, vix_value: float):
+        """
+        最新一筆的值變小後修正單調佇列
+
+        佇列中倒數第二個元素之後、最新一筆之前的數據都曾被淘汰，只重新掃描這一段。
+        """
+        window.pop()
+        first_seq = max(self._seq_head, last_seq - days + 1)
+        start_seq = window[-1][0] + 1 if window else first_seq
+        for seq in range(start_seq, last_seq):
+            self._push_window(window, seq, self.vix_history.value_at(seq - self._seq_head))
+        self._push_window(window, last_seq, vix_value)
+
+    @staticmethod
+    def _push_window(window: Deque[Tuple[int, float]], seq: int, vix_value: float):
+        """推入單調遞減佇列（淘汰尾端不大於新值的元素）"""
+        while window and window[-1][1] <= vix_value:
+            window.pop()
+        window.append((seq, vix_value))
+
+    def register_peak_window(self, days: int):
+        """
+        註冊滾動高點窗口，之後 get_peak_vix(days) 為 O(1)
+
+        Args:
+            days: 窗口筆數
+        """
+        if days < 1:
+            raise ValueError(f"Peak window must be at least 1 day, got {days}")
+        if days not in self._peak_windows:
+            self._peak_windows[days] = self._build_peak_window(days)
 
     def get_current_vix(self) -> Optional[float]:
         """取得最新 VIX 值"""
-        if not self.vix_history:
-            return None
-        return self.vix_history[-1].value
+        return self.vix_history.last_value()
 
     def get_peak_vix(self, days: int = 30) -> Optional[float]:
         """
@@ -72,42 +349,34 @@ class VIXMonitor:
         Returns:
             VIX 高點值
         """
-        if not self.vix_history:
-            return None
-
-        recent_data = self.vix_history[-days:] if len(self.vix_history) >= days else self.vix_history
-        return max(d.value for d in recent_data)
+        if days <= 0:
+            if not self.vix_history:
+                return None
+            # 與原本的切片語意相同：0 取全部歷史，負數略過最早的 |days| 筆
+            return max(islice(self.vix_history.values(), -days, None))
+
+        # 未註冊的窗口在第一次查詢時註冊，之後隨數據更新；沒有數據時窗口為空
+        window = self._peak_windows.get(days)
+        if window is None:
+            self.register_peak_window(days)
+            window = self._peak_windows[days]
+        return window[0][1] if window else None
 
     def get_declining_days(self) -> int:
         """計算連續下降天數"""
-        if len(self.vix_history) < 2:
-            return 0
-
-        days = 0
-        for i in range(len(self.vix_history) - 1, 0, -1):
-            if self.vix_history[i].value < self.vix_history[i-1].value:
-                days += 1
-            else:
-                break
-        return days
+        return self._declining_days
 
     def get_rising_days(self) -> int:
         """計算連續上升天數"""
-        if len(self.vix_history) < 2:
-            return 0
+        return self._rising_days
 
-        days = 0
-        for i in range(len(self.vix_history) - 1, 0, -1):
-            if self.vix_history[i].value > self.vix_history[i-1].value:
-                days += 1
-            else:
-                break
-        return days
-
-    def detect_phase(self) -> MarketPhase:
+    def detect_phase(self, term_structure: Optional[TermStructure] = None) -> MarketPhase:
         """
         偵測當前市場階段
 
+        Args:
+            term_structure: 最新的 VIX 期限結構（選填）；倒掛時比現貨閾值更早判定恐慌加速
+
         Returns:
             MarketPhase: 市場階段
         """
@@ -132,6 +401,11 @@ class VIXMonitor:
         if current_vix >= self.TENSION_THRESHOLD and rising_days >= 3:
             return MarketPhase.PANIC_RISING
 
+        # 期限結構倒掛（VIX > VIX3M）且 VIX 未回落：恐慌加速的領先訊號
+        if (term_structure and term_structure.inverted
+                and current_vix >= self.CALM_THRESHOLD and declining_days == 0):
+            return MarketPhase.PANIC_RISING
+
         # 復甦期：VIX < 35 且曾經恐慌過（30天內有超過35的高點）
         # 這包含了從恐慌消退到完全平靜的過渡期
         if current_vix < self.PANIC_THRESHOLD and peak_vix_30d and peak_vix_30d > self.PANIC_THRESHOLD:
@@ -144,13 +418,39 @@ class VIXMonitor:
         # 平靜期：VIX < 20 且近期沒有恐慌
         return MarketPhase.CALM
 
-    def generate_signal(self) -> MarketSignal:
+    def _signal_key(self) -> Tuple:
+        """訊號快取鍵：歷史版本加上所有閾值（閾值可在建立後調整）"""
+        return (
+            self._version,
+            self.CALM_THRESHOLD, self.TENSION_THRESHOLD, self.PANIC_THRESHOLD, self.EXTREME_PANIC_THRESHOLD,
+            self.PEAK_DECLINE_30, self.PEAK_DECLINE_40, self.PEAK_DECLINE_50, self.MIN_DECLINING_DAYS,
+        )
+
+    def generate_signal(self, term_structure: Optional[TermStructure] = None) -> MarketSignal:
         """
         生成進場訊號
 
+        數據未變動時重複呼叫直接回傳快取的同一個訊號物件（呼叫端不應修改它）。
+
+        Args:
+            term_structure: 最新的 VIX 期限結構（選填），作為階段判斷的輸入並附在訊號上
+
         Returns:
             MarketSignal: 市場訊號和建議
         """
+        key = self._signal_key()
+        cached = self._signal_cache.get(id(term_structure))
+        if cached is not None and cached[0] == key and cached[1] is term_structure:
+            return cached[2]
+
+        signal = self._evaluate_signal(term_structure)
+        if len(self._signal_cache) >= self._SIGNAL_CACHE_SIZE:
+            self._signal_cache.clear()
+        self._signal_cache[id(term_structure)] = (key, term_structure, signal)
+        return signal
+
+    def _evaluate_signal(self, term_structure: Optional[TermStructure]) -> MarketSignal:
+        """依目前數據計算訊號（不經快取）"""
         current_vix = self.get_current_vix()
         if current_vix is None:
             return MarketSignal(
@@ -161,12 +461,14 @@ class VIXMonitor:
                 vix_change_from_peak=None,
                 days_declining=0,
                 reason="無數據 / No data",
-                risk_level="未知 / Unknown"
+                risk_level="未知 / Unknown",
+                term_structure=term_structure
             )
 
-        phase = self.detect_phase()
+        phase = self.detect_phase(term_structure)
         peak_vix = self.get_peak_vix(days=30)
         declining_days = self.get_declining_days()
+        rising_days = self.get_rising_days()
 
         # Calculate decline percentage from peak
         change_from_peak = None
@@ -223,7 +525,11 @@ class VIXMonitor:
 
         elif phase == MarketPhase.PANIC_RISING:
             signal = Signal.STAY_OUT
-            reason = f"VIX持續上升(連續{self.get_rising_days()}天)，恐慌加劇中 / VIX rising continuously ({self.get_rising_days()} days), panic intensifying"
+            if rising_days >= 3 or not term_structure:
+                reason = f"VIX持續上升(連續{rising_days}天)，恐慌加劇中 / VIX rising continuously ({rising_days} days), panic intensifying"
+            else:
+                ratio = term_structure.long_ratio
+                reason = f"VIX期限結構倒掛(VIX/VIX3M={ratio:.2f}，連續{term_structure.long_inverted_days}天)，恐慌加劇中 / VIX term structure inverted (VIX/VIX3M={ratio:.2f}, {term_structure.long_inverted_days} days), panic intensifying"
             risk_level = "極高 / Very High"
 
         elif phase == MarketPhase.RECOVERY:
@@ -262,5 +568,6 @@ class VIXMonitor:
             vix_change_from_peak=change_from_peak,
             days_declining=declining_days,
             reason=reason,
-            risk_level=risk_level
+            risk_level=risk_level,
+            term_structure=term_structure
         )
@@ -0,0 +1,99 @@
+"""
+Multi-symbol volatility monitoring
+每個波動率指數各自一個 VIXMonitor，批次更新、一次評估
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from ..models import MarketSignal, TermStructure, VIXSnapshot
+from .vix_monitor import VIXMonitor
+
+
+class VolatilityRegistry:
+    """Keeps one warm VIXMonitor per volatility index"""
+
+    PRIMARY = "^VIX"
+
+    # 代號 → (顯示名稱, 閾值相對於 VIX 的倍數)
+    # 各指數的常態水準不同（例如 VVIX 約為 VIX 的 4-5 倍），閾值依比例放大
+    GAUGES: Dict[str, Tuple[str, float]] = {
+        "^VIX": ("VIX", 1.0),
+        "^VXN": ("VXN", 1.25),
+        "^VVIX": ("VVIX", 4.5),
+        "^VIX3M": ("VIX3M", 1.1),
+        "^V2TX": ("V2X", 1.05),
+    }
+
+    def __init__(self, symbols: Iterable[str] = tuple(GAUGES), lookback_days: int = 30):
+        """
+        Args:
+            symbols: Ticker symbols to monitor; ^VIX is always included (first)
+            lookback_days: History kept by each monitor
+        """
+        ordered = [self.PRIMARY] + [symbol for symbol in symbols if symbol != self.PRIMARY]
+        self.lookback_days = lookback_days
+        self.monitors: Dict[str, VIXMonitor] = {
+            symbol: self._new_monitor(symbol) for symbol in dict.fromkeys(ordered)
+        }
+
+    @property
+    def symbols(self) -> List[str]:
+        """Monitored symbols, ^VIX first"""
+        return list(self.monitors)
+
+    @property
+    def primary(self) -> VIXMonitor:
+        """The ^VIX monitor that drives the entry signal"""
+        return self.monitors[self.PRIMARY]
+
+    @classmethod
+    def name(cls, symbol: str) -> str:
+        """Display name of a symbol"""
+        return cls.GAUGES.get(symbol, (symbol.lstrip("^"), 1.0))[0]
+
+    def _new_monitor(self, symbol: str) -> VIXMonitor:
+        monitor = VIXMonitor(lookback_days=self.lookback_days)
+        scale = self.GAUGES.get(symbol, (symbol, 1.0))[1]
+        monitor.CALM_THRESHOLD *= scale
+        monitor.TENSION_THRESHOLD *= scale
+        monitor.PANIC_THRESHOLD *= scale
+        monitor.EXTREME_PANIC_THRESHOLD *= scale
+        return monitor
+
+    @staticmethod
+    def top_up(monitor: VIXMonitor, history: Sequence[Tuple[datetime, float]]) -> None:
+        """
+        Feed fetched bars into a monitor
+
+        An empty monitor is bulk-loaded; a warm one only takes bars from its
+        latest date onwards (today's intraday bar is overwritten).
+        """
+        if monitor.vix_history:
+            latest_date = monitor.vix_history.date_at(-1)
+            history = [(date, value) for date, value in history if date >= latest_date]
+        monitor.add_many(history)
+
+    def update(self, snapshots: Mapping[str, VIXSnapshot]) -> List[str]:
+        """
+        Feed a batch of snapshots into their monitors
+
+        Returns:
+            Monitored symbols missing from the batch
+        """
+        for symbol, snapshot in snapshots.items():
+            if symbol in self.monitors:
+                self.top_up(self.monitors[symbol], snapshot.history)
+        return [symbol for symbol in self.monitors if symbol not in snapshots]
+
+    def evaluate(self, term_structure: Optional[TermStructure] = None) -> Dict[str, MarketSignal]:
+        """
+        Signal of every monitor that has data, in one pass (^VIX first)
+
+        Args:
+            term_structure: Latest VIX curve, used by the ^VIX monitor only
+        """
+        return {
+            symbol: monitor.generate_signal(term_structure if symbol == self.PRIMARY else None)
+            for symbol, monitor in self.monitors.items()
+            if monitor.vix_history
+        }
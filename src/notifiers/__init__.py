@@ -1,6 +1,10 @@
 """
 Notification services
 """
-from .discord_notifier import DiscordNotifier
+from .discord_notifier import DeliveryResult, DiscordNotifier
+from .notification_gate import NotificationGate
+from .outbox import NotificationOutbox
+from .webhook_dispatcher import WebhookDispatcher, describe_error, redact_webhook
 
-__all__ = ["DiscordNotifier"]
+__all__ = ["DeliveryResult", "DiscordNotifier", "NotificationGate", "NotificationOutbox", "WebhookDispatcher",
+           "describe_error", "redact_webhook"]
@@ -1,24 +1,170 @@
 """
 Discord webhook notifier
 """
+import asyncio
 import aiohttp
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
+from ..fetchers import FearGreedFetcher
 from ..models import MarketSignal, MarketPhase, Signal
+from .outbox import NotificationOutbox
+from .webhook_dispatcher import WebhookDispatcher, describe_error, is_rejection, redact_webhook
+
+
+@dataclass
+class DeliveryResult:
+    """Delivery Result / 單一 webhook 的發送結果"""
+    url: str
+    error: Optional[BaseException] = None
+    # 暫時性失敗但已存入 outbox，下次執行時會補送（被 webhook 拒絕的不算）
+    queued: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 
 class DiscordNotifier:
-    """Sends notifications to Discord via webhook"""
+    """Sends notifications to one or more Discord webhooks"""
 
-    def __init__(self, webhook_url: str):
+    # 同時進行中的 webhook 請求上限
+    MAX_CONCURRENCY = 10
+
+    def __init__(
+        self,
+        webhook_url: Union[str, Sequence[str]],
+        dispatcher: Optional[WebhookDispatcher] = None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        outbox: Optional[NotificationOutbox] = None
+    ):
         """
         Initialize Discord notifier
 
         Args:
-            webhook_url: Discord webhook URL
+            webhook_url: Discord webhook URL, or a list of them
+            dispatcher: Rate-limit-aware sender (default: WebhookDispatcher())
+            max_concurrency: Webhooks posted to at the same time
+            outbox: Optional durable outbox; messages are recorded before
+                sending and undelivered ones are replayed first
+        """
+        self.webhook_urls: List[str] = [webhook_url] if isinstance(webhook_url, str) else list(webhook_url)
+        if not self.webhook_urls:
+            raise ValueError("At least one webhook URL is required")
+        self.webhook_url = self.webhook_urls[0]
+        self.dispatcher = dispatcher or WebhookDispatcher()
+        self.max_concurrency = max_concurrency
+        self.outbox = outbox
+        self._flush_locks: Dict[str, asyncio.Lock] = {}
+
+    async def _flush_destination(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Tuple[int, Dict[int, BaseException]]:
+        """
+        Post a destination's undelivered outbox messages in order, batched
+
+        Stops at the first retryable failure so later messages never
+        overtake it. Batches the webhook rejects (4xx other than 429) are
+        dead-lettered and the following ones are still sent.
+
+        Returns:
+            (number of messages delivered, rejection error per message id)
+
+        Raises:
+            The delivery error of the first batch that failed retryably
+        """
+        async with self._flush_locks.setdefault(url, asyncio.Lock()):
+            delivered = 0
+            rejected: Dict[int, BaseException] = {}
+            for ids, payload in self.outbox.batches(self.outbox.pending(url)):
+                try:
+                    await self.dispatcher.post(session, url, payload)
+                except aiohttp.ClientResponseError as e:
+                    if not is_rejection(e):
+                        raise
+                    self.outbox.mark_failed(ids)
+                    rejected.update(dict.fromkeys(ids, e))
+                    print(f"Warning: {redact_webhook(url)} rejected {len(ids)} message(s) - {describe_error(e)}; "
+                          f"not retrying them")
+                    continue
+                self.outbox.mark_delivered(ids)
+                delivered += len(ids)
+            return delivered, rejected
+
+    async def flush(self, session: aiohttp.ClientSession) -> List[DeliveryResult]:
+        """
+        Replay undelivered outbox messages (e.g. after a Discord outage)
+
+        Returns:
+            Per-webhook results for the webhooks that had pending messages
+        """
+        if self.outbox is None:
+            return []
+        urls = self.outbox.pending_destinations(self.webhook_urls)
+        if not urls:
+            return []
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def flush_one(url: str) -> DeliveryResult:
+            async with semaphore:
+                try:
+                    replayed, rejected = await self._flush_destination(session, url)
+                    print(f"Replayed {replayed} queued message(s) to {redact_webhook(url)}")
+                    return DeliveryResult(url, next(iter(rejected.values()), None))
+                except Exception as e:
+                    print(f"Warning: Replay to {redact_webhook(url)} failed - {describe_error(e)}")
+                    return DeliveryResult(url, e)
+
+        return list(await asyncio.gather(*(flush_one(url) for url in urls)))
+
+    async def _deliver(
+        self,
+        session: aiohttp.ClientSession,
+        payload: Dict,
+        destinations: Optional[Sequence[str]] = None
+    ) -> List[DeliveryResult]:
+        """
+        Post one rendered payload to the webhooks concurrently
+
+        Args:
+            session: aiohttp client session
+            payload: Rendered message (shared by all destinations)
+            destinations: Subset of the webhooks (default: all)
+
+        Raises:
+            The first error if no webhook accepted the message and none
+            queued it for replay (only retryable failures are queued)
         """
-        self.webhook_url = webhook_url
+        urls = self.webhook_urls if destinations is None else list(destinations)
+        message_ids: Dict[str, int] = {}
+        if self.outbox is not None:
+            # 先寫入 outbox，送達後才標記完成；暫時性失敗的留待下次補送
+            message_ids = dict(zip(urls, self.outbox.enqueue(urls, payload)))
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def deliver_one(url: str) -> DeliveryResult:
+            async with semaphore:
+                try:
+                    if self.outbox is not None:
+                        _, rejected = await self._flush_destination(session, url)
+                        return DeliveryResult(url, rejected.get(message_ids[url]))
+                    await self.dispatcher.post(session, url, payload)
+                    return DeliveryResult(url)
+                except Exception as e:
+                    return DeliveryResult(url, e, queued=self.outbox is not None and not is_rejection(e))
+
+        results = await asyncio.gather(*(deliver_one(url) for url in urls))
+
+        failed = [result for result in results if not result.ok]
+        for result in failed:
+            queued = " (queued for replay)" if result.queued else ""
+            print(f"Warning: Delivery to {redact_webhook(result.url)} failed{queued} - {describe_error(result.error)}")
+        if results and len(failed) == len(results) and not any(result.queued for result in failed):
+            raise failed[0].error
+        return results
 
     @staticmethod
     def _get_emoji_for_rating(rating: str) -> str:
@@ -52,20 +198,43 @@ class DiscordNotifier:
         else:
             return 0x00FF00  # Green - Extreme Greed
 
+    def _format_drivers(self, fng_data: Dict, limit: int = 3) -> List[str]:
+        """
+        List the sub-indicators pulling the index the hardest
+
+        Below 50 the most fearful components are listed first,
+        otherwise the greediest ones.
+        """
+        indicators = fng_data.get("indicators") or {}
+        greedy = fng_data["score"] > 50
+        ranked = sorted(indicators.items(), key=lambda item: item[1]["score"], reverse=greedy)
+
+        lines = []
+        for key, indicator in ranked[:limit]:
+            name = FearGreedFetcher.INDICATORS.get(key, key)
+            emoji = self._get_emoji_for_rating(indicator["rating"])
+            lines.append(f"{emoji} {name}: {indicator['score']} ({indicator['rating']})")
+        return lines
+
     async def send_fear_greed_only(
         self,
         session: aiohttp.ClientSession,
-        fng_data: Dict
-    ) -> None:
+        fng_data: Dict,
+        destinations: Optional[Sequence[str]] = None
+    ) -> List[DeliveryResult]:
         """
         Send Fear & Greed Index notification only
 
         Args:
             session: aiohttp client session
             fng_data: Fear & Greed data dict
+            destinations: Subset of the webhooks (default: all)
+
+        Returns:
+            Per-webhook delivery results
 
         Raises:
-            aiohttp.ClientError: If webhook request fails
+            aiohttp.ClientError: If every webhook still fails after retries
         """
         score = fng_data["score"]
         rating = fng_data["rating"]
@@ -102,22 +271,26 @@ class DiscordNotifier:
             "url": "https://www.cnn.com/markets/fear-and-greed"
         }
 
+        drivers = self._format_drivers(fng_data)
+        if drivers:
+            embed["fields"].append({
+                "name": "主要驅動因子 / Key Drivers",
+                "value": "\n".join(drivers),
+                "inline": False
+            })
+
         payload = {"embeds": [embed]}
 
-        async with session.post(
-            self.webhook_url,
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            timeout=aiohttp.ClientTimeout(total=30)
-        ) as response:
-            response.raise_for_status()
+        return await self._deliver(session, payload, destinations)
 
     async def send_combined_report(
         self,
         session: aiohttp.ClientSession,
         fng_data: Dict,
-        market_signal: MarketSignal
-    ) -> None:
+        market_signal: MarketSignal,
+        destinations: Optional[Sequence[str]] = None,
+        gauges: Optional[Dict[str, MarketSignal]] = None
+    ) -> List[DeliveryResult]:
         """
         Send combined Fear & Greed + VIX Market Signal report
 
@@ -125,26 +298,26 @@ class DiscordNotifier:
             session: aiohttp client session
             fng_data: Fear & Greed data dict
             market_signal: VIX market signal
+            destinations: Subset of the webhooks (default: all)
+            gauges: Other volatility indices by display name (e.g. VXN, VVIX)
+
+        Returns:
+            Per-webhook delivery results
 
         Raises:
-            aiohttp.ClientError: If webhook request fails
+            aiohttp.ClientError: If every webhook still fails after retries
         """
-        message = self._format_combined_message(fng_data, market_signal)
+        message = self._format_combined_message(fng_data, market_signal, gauges)
 
         payload = {"content": message}
 
-        async with session.post(
-            self.webhook_url,
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            timeout=aiohttp.ClientTimeout(total=30)
-        ) as response:
-            response.raise_for_status()
+        return await self._deliver(session, payload, destinations)
 
     def _format_combined_message(
         self,
         fng_data: Dict,
-        signal: MarketSignal
+        signal: MarketSignal,
+        gauges: Optional[Dict[str, MarketSignal]] = None
     ) -> str:
         """Format combined Fear & Greed + VIX message"""
 
@@ -184,7 +357,12 @@ class DiscordNotifier:
         rating = fng_data["rating"]
         fg_emoji = self._get_emoji_for_rating(rating)
 
-        msg += f"**恐懼貪婪指數 / Fear & Greed Index**: {fg_emoji} {score} ({rating})\n\n"
+        msg += f"**恐懼貪婪指數 / Fear & Greed Index**: {fg_emoji} {score} ({rating})\n"
+        drivers = self._format_drivers(fng_data)
+        if drivers:
+            msg += "**主要驅動因子 / Key Drivers**:\n"
+            msg += "".join(f"- {line}\n" for line in drivers)
+        msg += "\n"
 
         # VIX Status
         msg += "**VIX 市場訊號 / Market Signal**\n"
@@ -201,8 +379,27 @@ class DiscordNotifier:
         if signal.days_declining > 0:
             msg += f"**連續下降天數 / Consecutive Declining Days**: {signal.days_declining}天 days\n"
 
+        curve = signal.term_structure
+        if curve:
+            if curve.inverted:
+                state = f"🔴 倒掛 / Backwardation ({curve.long_inverted_days}天 days)"
+            else:
+                state = "🟢 正價差 / Contango"
+            msg += (f"**期限結構 / Term Structure**: VIX9D {curve.vix9d:.2f} / VIX {curve.vix:.2f} / "
+                    f"VIX3M {curve.vix3m:.2f}, VIX/VIX3M {curve.long_ratio:.2f} {state}\n")
+
         msg += "\n"
 
+        # Other volatility gauges
+        if gauges:
+            msg += "**📈 波動率儀表板 / Volatility Gauges**\n"
+            for name, gauge in gauges.items():
+                line = f"- {name}: {gauge.vix_current:.2f} {phase_emoji.get(gauge.phase, '')} {gauge.phase.value}"
+                if gauge.vix_peak and gauge.vix_change_from_peak:
+                    line += f" (30d peak {gauge.vix_peak:.2f}, -{gauge.vix_change_from_peak*100:.1f}%)"
+                msg += line + "\n"
+            msg += "\n"
+
         # Entry signal
         msg += f"**進場訊號 / Entry Signal**: {signal_emoji.get(signal.signal, '')} **{signal.signal.value}**\n"
         msg += f"**判斷依據 / Reasoning**: {signal.reason}\n\n"
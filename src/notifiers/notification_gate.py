@@ -0,0 +1,150 @@
+"""
+Change-driven notification gate
+只在市場階段 / 訊號轉換、跨越閾值或到達心跳間隔時才發送通知
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+from ..models import MarketSignal
+from ..monitors import VIXMonitor
+
+
+class NotificationGate:
+    """Decides whether a report is worth sending, based on the last one sent"""
+
+    DEFAULT_PATH = os.path.join(".cache", "notification_state.json")
+
+    # 恐懼貪婪指數分級（與 Discord 顏色分級相同）
+    FEAR_GREED_THRESHOLDS = (26, 46, 56, 76)
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        heartbeat: float = 24 * 3600,
+        vix_thresholds: Optional[Sequence[float]] = None,
+        fear_greed_thresholds: Sequence[float] = FEAR_GREED_THRESHOLDS
+    ):
+        """
+        Args:
+            path: JSON file holding the last-sent state (default: .cache/notification_state.json)
+            heartbeat: Seconds after which a report is sent even if nothing changed
+            vix_thresholds: VIX levels whose crossing triggers a report
+                (default: the thresholds of a default VIXMonitor)
+            fear_greed_thresholds: Fear & Greed scores whose crossing triggers a report
+        """
+        self.path = path or self.DEFAULT_PATH
+        self.heartbeat = heartbeat
+        if vix_thresholds is None:
+            vix_thresholds = self.vix_thresholds_of(VIXMonitor())
+        self.vix_thresholds = tuple(sorted(vix_thresholds))
+        self.fear_greed_thresholds = tuple(sorted(fear_greed_thresholds))
+        self.sent: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        destinations = data.get("destinations") if isinstance(data, dict) else None
+        return destinations if isinstance(destinations, dict) else {}
+
+    @staticmethod
+    def _key(destination: str) -> str:
+        """Destinations are stored by hash so webhook tokens never hit the disk"""
+        if not destination:
+            return "default"
+        return hashlib.sha256(destination.encode()).hexdigest()[:16]
+
+    @property
+    def last_sent(self) -> Optional[Dict]:
+        """State last sent to the default destination"""
+        return self.sent.get(self._key(""))
+
+    @staticmethod
+    def vix_thresholds_of(monitor: VIXMonitor) -> Tuple[float, ...]:
+        """VIX levels separating the monitor's calm / tension / panic / extreme panic bands"""
+        return (
+            monitor.CALM_THRESHOLD,
+            monitor.TENSION_THRESHOLD,
+            monitor.PANIC_THRESHOLD,
+            monitor.EXTREME_PANIC_THRESHOLD,
+        )
+
+    @staticmethod
+    def _band(value: float, thresholds: Sequence[float]) -> int:
+        """Number of thresholds at or below value"""
+        return sum(1 for threshold in thresholds if value >= threshold)
+
+    def state(self, fng_data: Dict, market_signal: Optional[MarketSignal] = None) -> Dict:
+        """
+        The part of a report that matters for change detection
+
+        Args:
+            fng_data: Fear & Greed data dict
+            market_signal: VIX market signal (None for Fear & Greed only reports)
+        """
+        state = {
+            "fear_greed_band": self._band(fng_data["score"], self.fear_greed_thresholds),
+            "phase": market_signal.phase.name if market_signal else None,
+            "signal": market_signal.signal.name if market_signal else None,
+            "vix_band": self._band(market_signal.vix_current, self.vix_thresholds) if market_signal else None,
+        }
+        state["hash"] = hashlib.sha256(json.dumps(state, sort_keys=True).encode()).hexdigest()
+        return state
+
+    def check(
+        self,
+        fng_data: Dict,
+        market_signal: Optional[MarketSignal] = None,
+        now: Optional[float] = None,
+        destination: str = ""
+    ) -> Optional[str]:
+        """
+        Why the report should be sent to a destination, or None to skip it
+
+        Each destination is tracked separately, so one that missed a report
+        (e.g. its webhook was down) still gets it on the next run.
+
+        Returns:
+            str: "first report", "heartbeat" or a description of what changed
+        """
+        now = now if now is not None else time.time()
+        last = self.sent.get(self._key(destination))
+        if last is None:
+            return "first report"
+
+        current = self.state(fng_data, market_signal)
+        if current["hash"] != last.get("hash"):
+            changed = [
+                key for key in ("phase", "signal", "vix_band", "fear_greed_band")
+                if current[key] != last.get(key)
+            ]
+            return "changed: " + ", ".join(changed)
+
+        if now - last.get("sent_at", 0) >= self.heartbeat:
+            return "heartbeat"
+        return None
+
+    def record(
+        self,
+        fng_data: Dict,
+        market_signal: Optional[MarketSignal] = None,
+        now: Optional[float] = None,
+        destinations: Sequence[str] = ("",)
+    ) -> None:
+        """Persist the state of a report that was just sent to destinations"""
+        state = self.state(fng_data, market_signal)
+        state["sent_at"] = now if now is not None else time.time()
+        for destination in destinations:
+            self.sent[self._key(destination)] = dict(state)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"destinations": self.sent}, f)
+        os.replace(self.path + ".tmp", self.path)
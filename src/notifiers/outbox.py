@@ -0,0 +1,182 @@
+"""
+Durable notification outbox (SQLite)
+發送前先保存已產生的訊息，送達後才標記完成；未送達的訊息在下次執行時依序合併補送
+被 webhook 永久拒絕（4xx）的訊息標記為 failed，不再阻擋後面的訊息
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+Message = Tuple[int, Dict]
+
+
+def destination_key(url: str) -> str:
+    """Webhooks are stored by hash so their tokens never hit the disk"""
+    return hashlib.sha256(url.encode()).hexdigest()[:16]
+
+
+class NotificationOutbox:
+    """Stores rendered webhook payloads until each destination accepts them"""
+
+    DEFAULT_PATH = os.path.join(".cache", "outbox.sqlite")
+
+    # Discord 單則訊息上限
+    MAX_CONTENT = 2000
+    MAX_EMBEDS = 10
+
+    # 已送達 / 過期的訊息保留多久（秒）
+    RETENTION = 7 * 24 * 3600
+
+    def __init__(self, path: Optional[str] = None, max_age: float = 24 * 3600):
+        """
+        Open (or create) the outbox
+
+        Args:
+            path: SQLite file path (default: .cache/outbox.sqlite)
+            max_age: Seconds after which an undelivered message is dropped
+                instead of replayed (an old signal is worse than none)
+        """
+        self.path = path or self.DEFAULT_PATH
+        self.max_age = max_age
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                destination TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending'
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS pending_messages ON messages (destination, status, id)"
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
+
+    def __enter__(self) -> "NotificationOutbox":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def enqueue(self, destinations: Iterable[str], payload: Dict, now: Optional[float] = None) -> List[int]:
+        """
+        Record a rendered payload for each destination before sending
+
+        Args:
+            destinations: Webhook URLs
+            payload: JSON body
+            now: Creation time (default: time.time())
+
+        Returns:
+            Message ids, one per destination
+        """
+        now = now if now is not None else time.time()
+        body = json.dumps(payload, ensure_ascii=False)
+        ids = []
+        with self._conn:
+            for url in destinations:
+                cursor = self._conn.execute(
+                    "INSERT INTO messages (destination, payload, created_at) VALUES (?, ?, ?)",
+                    (destination_key(url), body, now),
+                )
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def pending(self, url: str, now: Optional[float] = None) -> List[Message]:
+        """
+        Undelivered messages for a destination, oldest first
+
+        Messages older than max_age are marked expired and skipped.
+        """
+        now = now if now is not None else time.time()
+        key = destination_key(url)
+        with self._conn:
+            expired = self._conn.execute(
+                "UPDATE messages SET status = 'expired' WHERE destination = ? AND status = 'pending' AND created_at < ?",
+                (key, now - self.max_age),
+            ).rowcount
+        if expired:
+            print(f"Warning: Dropped {expired} outdated undelivered message(s)")
+
+        rows = self._conn.execute(
+            "SELECT id, payload FROM messages WHERE destination = ? AND status = 'pending' ORDER BY id",
+            (key,),
+        )
+        return [(message_id, json.loads(payload)) for message_id, payload in rows]
+
+    def pending_destinations(self, urls: Sequence[str]) -> List[str]:
+        """Which of the given webhooks still have undelivered messages"""
+        keys: Set[str] = {
+            row[0] for row in self._conn.execute("SELECT DISTINCT destination FROM messages WHERE status = 'pending'")
+        }
+        return [url for url in urls if destination_key(url) in keys]
+
+    def mark_failed(self, ids: Sequence[int]) -> None:
+        """Dead-letter messages the webhook rejected for good (kept until pruned, never replayed)"""
+        with self._conn:
+            self._conn.executemany("UPDATE messages SET status = 'failed' WHERE id = ?", [(i,) for i in ids])
+
+    def failed(self, url: str) -> List[Message]:
+        """Dead-lettered messages for a destination, oldest first"""
+        rows = self._conn.execute(
+            "SELECT id, payload FROM messages WHERE destination = ? AND status = 'failed' ORDER BY id",
+            (destination_key(url),),
+        )
+        return [(message_id, json.loads(payload)) for message_id, payload in rows]
+
+    def mark_delivered(self, ids: Sequence[int], now: Optional[float] = None) -> None:
+        """Mark messages as delivered and prune old finished ones"""
+        now = now if now is not None else time.time()
+        with self._conn:
+            self._conn.executemany("UPDATE messages SET status = 'delivered' WHERE id = ?", [(i,) for i in ids])
+            self._conn.execute(
+                "DELETE FROM messages WHERE status != 'pending' AND created_at < ?", (now - self.RETENTION,)
+            )
+
+    @classmethod
+    def batches(cls, messages: Sequence[Message]) -> List[Tuple[List[int], Dict]]:
+        """
+        Coalesce consecutive messages into as few webhook posts as possible
+
+        Plain-text messages are joined while the content fits in one
+        Discord message; embed messages are merged up to 10 embeds.
+        Order is preserved.
+
+        Returns:
+            List of (message ids, payload) to post in order
+        """
+        batches: List[Tuple[List[int], Dict]] = []
+        for message_id, payload in messages:
+            if batches:
+                ids, merged = batches[-1]
+                combined = cls._merge(merged, payload)
+                if combined is not None:
+                    batches[-1] = (ids + [message_id], combined)
+                    continue
+            batches.append(([message_id], payload))
+        return batches
+
+    @classmethod
+    def _merge(cls, first: Dict, second: Dict) -> Optional[Dict]:
+        """Merged payload, or None if the two cannot share one post"""
+        if set(first) == {"content"} and set(second) == {"content"}:
+            content = f"{first['content']}\n\n{second['content']}"
+            return {"content": content} if len(content) <= cls.MAX_CONTENT else None
+        if set(first) == {"embeds"} and set(second) == {"embeds"}:
+            embeds = first["embeds"] + second["embeds"]
+            return {"embeds": embeds} if len(embeds) <= cls.MAX_EMBEDS else None
+        return None
@@ -0,0 +1,196 @@
+"""
+Rate-limit-aware webhook dispatcher
+依 Discord 的 X-RateLimit-* / Retry-After 標頭排隊發送，429 與暫時性錯誤以抖動指數退避重試
+"""
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import aiohttp
+
+# 可重試的 HTTP 狀態碼（429 另外依 Retry-After 處理）
+RETRYABLE_STATUSES = frozenset({500, 502, 503, 504})
+
+
+def is_rejection(error: BaseException) -> bool:
+    """A 4xx other than 429: the webhook refused the message, retrying will not help"""
+    return isinstance(error, aiohttp.ClientResponseError) and 400 <= error.status < 500 and error.status != 429
+
+
+def redact_webhook(url: str) -> str:
+    """Hide the webhook token when logging (…/webhooks/<id>/***)"""
+    head, sep, _token = url.rpartition("/")
+    return f"{head}/***" if sep and "/webhooks/" in head else url
+
+
+def describe_error(error: BaseException) -> str:
+    """
+    Loggable summary of a delivery error: the type, plus status/message for HTTP errors
+
+    The exception repr is never used, since aiohttp puts the full request
+    URL (and with it the webhook token) into it.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return f"{type(error).__name__} {error.status} {error.message}".rstrip()
+    return type(error).__name__
+
+
+@dataclass
+class RateLimit:
+    """Rate Limit / 單一 bucket 的剩餘額度"""
+    remaining: Optional[int] = None
+    reset_at: float = 0.0  # event loop 時間
+
+
+class WebhookDispatcher:
+    """
+    Posts webhook messages one at a time per URL, respecting rate limits
+
+    Messages to the same URL are sent in order. Before each request the
+    dispatcher waits if the route's bucket (learnt from X-RateLimit-Bucket)
+    or the global limit is exhausted. 429s are retried after Retry-After,
+    5xx and connection errors after a jittered exponential backoff, as
+    long as the retry still fits in the total deadline.
+    """
+
+    def __init__(
+        self,
+        deadline: float = 60.0,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        request_timeout: float = 30.0,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Args:
+            deadline: Seconds allowed per message, including all retries
+            base_delay: First backoff delay (doubled per attempt)
+            max_delay: Backoff delay cap
+            request_timeout: Timeout of a single request
+            rng: Random source for the jitter
+        """
+        self.deadline = deadline
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.request_timeout = request_timeout
+        self.rng = rng or random.Random()
+
+        self._queues: Dict[str, asyncio.Lock] = {}
+        self._route_buckets: Dict[str, str] = {}
+        self._limits: Dict[str, RateLimit] = {}
+        self._global_reset_at = 0.0
+
+    def _limit(self, url: str) -> RateLimit:
+        bucket = self._route_buckets.get(url, url)
+        return self._limits.setdefault(bucket, RateLimit())
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _update_limits(self, url: str, headers, now: float) -> None:
+        """Record X-RateLimit-* headers for the route's bucket"""
+        bucket = headers.get("X-RateLimit-Bucket")
+        if bucket:
+            self._route_buckets[url] = bucket
+        limit = self._limit(url)
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        try:
+            if remaining is not None:
+                limit.remaining = int(remaining)
+            if reset_after is not None:
+                limit.reset_at = now + float(reset_after)
+        except ValueError:
+            pass
+
+    @staticmethod
+    async def _retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
+        """Seconds to wait after a 429 (header first, then the JSON body)"""
+        for name in ("Retry-After", "X-RateLimit-Reset-After"):
+            try:
+                return float(response.headers[name])
+            except (KeyError, ValueError):
+                continue
+        try:
+            body = await response.json(content_type=None)
+            return float(body["retry_after"])
+        except (ValueError, KeyError, TypeError, aiohttp.ClientError):
+            return None
+
+    async def _wait_for_capacity(self, url: str, deadline: float) -> None:
+        """Sleep until the bucket and the global limit allow a request"""
+        loop = asyncio.get_running_loop()
+        limit = self._limit(url)
+        now = loop.time()
+        resume = self._global_reset_at
+        if limit.remaining == 0 and limit.reset_at > now:
+            resume = max(resume, limit.reset_at)
+        if resume > now:
+            if resume > deadline:
+                raise asyncio.TimeoutError(f"Rate limit resets after the delivery deadline for {redact_webhook(url)}")
+            await asyncio.sleep(resume - now)
+
+    async def post(self, session: aiohttp.ClientSession, url: str, payload: Dict) -> None:
+        """
+        Deliver one JSON payload
+
+        Args:
+            session: aiohttp client session
+            url: Webhook URL
+            payload: JSON body
+
+        Raises:
+            aiohttp.ClientResponseError: If the webhook rejects the message,
+                or still fails when the deadline runs out
+            aiohttp.ClientError / asyncio.TimeoutError: If it cannot be reached in time
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+
+        async with self._queues.setdefault(url, asyncio.Lock()):
+            attempt = 0
+            while True:
+                await self._wait_for_capacity(url, deadline)
+
+                try:
+                    async with session.post(
+                        url,
+                        json=payload,
+                        timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+                    ) as response:
+                        self._update_limits(url, response.headers, loop.time())
+
+                        if response.status == 429:
+                            retry_after = await self._retry_after(response)
+                            delay = retry_after if retry_after is not None else self._backoff(attempt)
+                            if response.headers.get("X-RateLimit-Global", "").lower() == "true":
+                                self._global_reset_at = loop.time() + delay
+                            # 少量抖動，避免多個發送者同時重試
+                            delay += self._backoff(0) * 0.1
+                        elif response.status in RETRYABLE_STATUSES:
+                            delay = self._backoff(attempt)
+                        else:
+                            response.raise_for_status()
+                            return
+
+                        error: Exception = aiohttp.ClientResponseError(
+                            response.request_info,
+                            response.history,
+                            status=response.status,
+                            message=response.reason or "",
+                            headers=response.headers,
+                        )
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    error = e
+                    delay = self._backoff(attempt)
+
+                attempt += 1
+                if loop.time() + delay > deadline:
+                    print(f"Warning: Giving up on {redact_webhook(url)} after {attempt} attempts - {describe_error(error)}")
+                    raise error
+                print(f"Warning: Attempt {attempt} to {redact_webhook(url)} failed ({describe_error(error)}); "
+                      f"retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
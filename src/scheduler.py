@@ -0,0 +1,158 @@
+"""
+Minimal cron schedules for daemon mode
+五欄位 cron 表示式（分 時 日 月 週），可限定只在美股交易時段執行
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import FrozenSet, List, Optional, Tuple
+
+from .market_hours import is_market_open
+
+# 分、時、日、月、週 的允許範圍
+_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+# 找不到下一次執行時間時的搜尋上限（涵蓋閏年 2/29）
+_MAX_SEARCH = timedelta(days=366 * 5)
+
+
+def _parse_field(text: str, low: int, high: int) -> FrozenSet[int]:
+    """解析單一欄位：*、*/n、a、a-b、a-b/n，以逗號分隔"""
+    values = set()
+    for part in text.split(","):
+        spec, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if step < 1:
+            raise ValueError(f"Invalid step in cron field: {text!r}")
+
+        if spec == "*":
+            start, end = low, high
+        elif "-" in spec:
+            start_text, end_text = spec.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(spec)
+            end = high if step_text else start
+
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron field out of range {low}-{high}: {text!r}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """Standard five-field cron expression evaluated in a fixed time zone"""
+
+    def __init__(self, expression: str, tz: tzinfo = timezone.utc):
+        """
+        Args:
+            expression: e.g. "27 2 * * *" or "*/15 * * * 1-5"
+            tz: Time zone the expression is evaluated in (default: UTC, like GitHub Actions)
+
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(fields)}: {expression!r}")
+
+        try:
+            parsed = [_parse_field(text, low, high) for text, (low, high) in zip(fields, _FIELDS)]
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression {expression!r}: {e}") from e
+
+        self.expression = expression
+        self.tz = tz
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # cron 的週日為 0 或 7
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        # 日與週都有限定時，任一符合即可（與 cron 相同）
+        self._day_or_weekday = fields[2] != "*" and fields[4] != "*"
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r})"
+
+    def _day_matches(self, local: datetime) -> bool:
+        day_ok = local.day in self.days
+        weekday_ok = (local.weekday() + 1) % 7 in self.weekdays
+        if self._day_or_weekday:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """
+        Next matching minute strictly after `after`
+
+        Args:
+            after: Timezone-aware datetime
+
+        Returns:
+            Timezone-aware datetime in the schedule's time zone
+
+        Raises:
+            ValueError: If the expression never matches (e.g. "0 0 31 2 *")
+        """
+        local = after.astimezone(self.tz).replace(second=0, microsecond=0, tzinfo=None)
+        candidate = local + timedelta(minutes=1)
+        limit = candidate + _MAX_SEARCH
+
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = datetime(candidate.year + year, month + 1, 1)
+            elif not self._day_matches(candidate):
+                candidate = datetime.combine(candidate.date() + timedelta(days=1), datetime.min.time())
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate.replace(tzinfo=self.tz)
+
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+
+@dataclass
+class ScheduledJob:
+    """Scheduled Job / 排程工作"""
+    schedule: CronSchedule
+    market_hours_only: bool = False  # 只在美股交易時段執行
+
+    def is_allowed(self, when: datetime) -> bool:
+        """Whether the job may run at `when` (market-hours gate)"""
+        return not self.market_hours_only or is_market_open(when)
+
+
+def next_run(jobs: List[ScheduledJob], after: datetime) -> Tuple[datetime, List[ScheduledJob]]:
+    """
+    Earliest upcoming run across jobs, skipping gated runs
+
+    Runs of market-hours-only jobs that fall outside the session are
+    skipped, so the daemon sleeps straight through nights and weekends.
+
+    Args:
+        jobs: Scheduled jobs
+        after: Timezone-aware datetime
+
+    Returns:
+        Tuple of (run time, jobs due at that time)
+
+    Raises:
+        ValueError: If no job has any allowed run
+    """
+    if not jobs:
+        raise ValueError("No scheduled jobs")
+
+    upcoming: List[Tuple[datetime, ScheduledJob]] = []
+    for job in jobs:
+        when: Optional[datetime] = job.schedule.next_after(after)
+        limit = after + _MAX_SEARCH
+        while when is not None and not job.is_allowed(when):
+            when = job.schedule.next_after(when) if when < limit else None
+        if when is not None:
+            upcoming.append((when, job))
+
+    if not upcoming:
+        raise ValueError("No scheduled job can run within the market hours")
+
+    earliest = min(when for when, _ in upcoming)
+    return earliest, [job for when, job in upcoming if when == earliest]
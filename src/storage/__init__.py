@@ -0,0 +1,7 @@
+"""
+Local persistent storage for market data
+"""
+from .fear_greed_store import FearGreedHistoryStore, load_joint
+from .vix_store import VIXHistoryStore
+
+__all__ = ["FearGreedHistoryStore", "VIXHistoryStore", "load_joint"]
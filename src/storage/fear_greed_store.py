@@ -0,0 +1,181 @@
+"""
+Persistent daily Fear & Greed history (columnar, append-only)
+以兩個欄位檔保存每日恐懼貪婪指數：int32 日期（距 1970-01-01 的天數）與 float64 分數
+"""
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from .vix_store import VIXHistoryStore
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _to_day(date: datetime) -> int:
+    """Calendar date → days since 1970-01-01"""
+    return (date.replace(tzinfo=None) - EPOCH).days
+
+
+def _from_day(day: int) -> datetime:
+    return EPOCH + timedelta(days=day)
+
+
+class FearGreedHistoryStore:
+    """
+    Stores one score per day in two append-only column files
+
+    Both columns are kept in memory as compact arrays (12 bytes per day),
+    so range queries are two binary searches and a slice.
+    """
+
+    DEFAULT_DIR = os.path.join(".cache", "fear_greed")
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Open (or create) the store
+
+        Args:
+            directory: Directory for the column files (default: .cache/fear_greed)
+        """
+        self.directory = directory or self.DEFAULT_DIR
+        os.makedirs(self.directory, exist_ok=True)
+        self._days_path = os.path.join(self.directory, "dates.i32")
+        self._scores_path = os.path.join(self.directory, "scores.f64")
+
+        self.days = self._read_column(self._days_path, "i")
+        self.scores = self._read_column(self._scores_path, "d")
+        # 兩欄長度不一致（例如寫入中斷）時以較短者為準
+        rows = min(len(self.days), len(self.scores))
+        if len(self.days) != rows or len(self.scores) != rows:
+            del self.days[rows:]
+            del self.scores[rows:]
+            self._rewrite()
+
+    @staticmethod
+    def _read_column(path: str, typecode: str) -> array:
+        column = array(typecode)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return column
+        usable = len(data) - len(data) % column.itemsize
+        column.frombytes(data[:usable])
+        return column
+
+    def _rewrite(self) -> None:
+        """Rewrite both column files from memory"""
+        for path, column in ((self._days_path, self.days), (self._scores_path, self.scores)):
+            with open(path + ".tmp", "wb") as f:
+                column.tofile(f)
+            os.replace(path + ".tmp", path)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def last_date(self) -> Optional[datetime]:
+        """
+        Date of the most recent stored score
+
+        Returns:
+            datetime or None if nothing is stored yet
+        """
+        return _from_day(self.days[-1]) if self.days else None
+
+    def append(self, points: Iterable[Tuple[datetime, float]]) -> int:
+        """
+        Add scores newer than what is stored
+
+        Points are reduced to one per calendar date (the last one wins).
+        The latest stored day may be updated in place, since CNN keeps
+        revising today's score; older days are never rewritten.
+
+        Args:
+            points: (date, score) tuples
+
+        Returns:
+            int: Number of new days appended
+        """
+        latest = {}
+        for date, score in points:
+            latest[_to_day(date)] = float(score)
+
+        last_day = self.days[-1] if self.days else None
+        new_days = array("i", sorted(day for day in latest if last_day is None or day > last_day))
+        new_scores = array("d", (latest[day] for day in new_days))
+
+        if last_day is not None and last_day in latest and latest[last_day] != self.scores[-1]:
+            self.scores[-1] = latest[last_day]
+            with open(self._scores_path, "r+b") as f:
+                f.seek((len(self.scores) - 1) * self.scores.itemsize)
+                f.write(self.scores[-1:].tobytes())
+
+        if new_days:
+            # 先寫分數再寫日期：中斷時多出的分數會在下次開啟時截掉
+            with open(self._scores_path, "ab") as f:
+                new_scores.tofile(f)
+            with open(self._days_path, "ab") as f:
+                new_days.tofile(f)
+            self.days.extend(new_days)
+            self.scores.extend(new_scores)
+
+        return len(new_days)
+
+    def range(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Tuple[array, array]:
+        """
+        Columns for [start, end] (both inclusive)
+
+        Returns:
+            Tuple of (int32 epoch days, float64 scores) arrays
+        """
+        lo = bisect_left(self.days, _to_day(start)) if start is not None else 0
+        hi = bisect_right(self.days, _to_day(end)) if end is not None else len(self.days)
+        return self.days[lo:hi], self.scores[lo:hi]
+
+    def load(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Tuple[datetime, float]]:
+        """
+        Load stored scores in date order
+
+        Args:
+            start: Earliest date (inclusive)
+            end: Latest date (inclusive)
+
+        Returns:
+            List of (date, score) tuples
+        """
+        days, scores = self.range(start, end)
+        return [(_from_day(day), score) for day, score in zip(days, scores)]
+
+
+def load_joint(
+    vix_store: VIXHistoryStore,
+    fear_greed_store: FearGreedHistoryStore,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    symbol: str = "^VIX"
+) -> List[Tuple[datetime, float, float]]:
+    """
+    Align stored VIX closes with Fear & Greed scores by date (no network)
+
+    Only dates present in both stores are returned, so the result can be
+    fed straight into VIXMonitor while the score rides along.
+
+    Args:
+        vix_store: Daily VIX bar store
+        fear_greed_store: Daily Fear & Greed store
+        start: Earliest date (inclusive)
+        end: Latest date (inclusive)
+        symbol: Ticker symbol in the VIX store
+
+    Returns:
+        List of (date, vix_close, fear_greed_score) tuples
+    """
+    days, scores = fear_greed_store.range(start, end)
+    joint = []
+    for date, close in vix_store.load(symbol, start=start, end=end):
+        i = bisect_left(days, _to_day(date))
+        if i < len(days) and days[i] == _to_day(date):
+            joint.append((date, close, scores[i]))
+    return joint
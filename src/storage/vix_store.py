@@ -0,0 +1,144 @@
+"""
+Persistent daily VIX bar store (SQLite)
+本機保存每日 VIX 收盤數據，讓每次執行只需補抓新的數據
+"""
+import os
+import sqlite3
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from ..market_hours import MARKET_TZ, sessions_closed_since
+
+
+class VIXHistoryStore:
+    """Stores daily closes per symbol in a local SQLite database"""
+
+    DEFAULT_PATH = os.path.join(".cache", "vix_history.sqlite")
+
+    # 下載失敗時沿用已保存的數據，最多容許缺少幾個已收盤的交易日
+    MAX_STALE_SESSIONS = 1
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (or create) the store
+
+        Args:
+            path: SQLite file path (default: .cache/vix_history.sqlite)
+        """
+        self.path = path or self.DEFAULT_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS bars (
+                symbol TEXT NOT NULL,
+                date TEXT NOT NULL,
+                close REAL NOT NULL,
+                PRIMARY KEY (symbol, date)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
+
+    def __enter__(self) -> "VIXHistoryStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @classmethod
+    def can_stand_in(cls, last_date: Optional[datetime], start_date: datetime, now: Optional[datetime] = None) -> bool:
+        """
+        Whether stored bars ending at last_date may replace a failed download
+
+        The store must reach into the requested window and be at most
+        MAX_STALE_SESSIONS closed sessions behind; older data would produce
+        signals from a stale VIX.
+
+        Args:
+            last_date: Date of the most recent stored bar (None if empty)
+            start_date: Start of the requested window
+            now: Current time (default: now, timezone-aware)
+        """
+        if last_date is None or last_date < start_date:
+            return False
+        return sessions_closed_since(last_date, now or datetime.now(MARKET_TZ)) <= cls.MAX_STALE_SESSIONS
+
+    @staticmethod
+    def _key(date: datetime) -> str:
+        """Daily bars are keyed by calendar date (YYYY-MM-DD)"""
+        return date.strftime("%Y-%m-%d")
+
+    def last_date(self, symbol: str) -> Optional[datetime]:
+        """
+        Date of the most recent stored bar
+
+        Args:
+            symbol: Ticker symbol (e.g. ^VIX)
+
+        Returns:
+            datetime or None if nothing is stored yet
+        """
+        row = self._conn.execute(
+            "SELECT MAX(date) FROM bars WHERE symbol = ?", (symbol,)
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return datetime.strptime(row[0], "%Y-%m-%d")
+
+    def upsert(self, symbol: str, bars: Iterable[Tuple[datetime, float]]) -> int:
+        """
+        Insert bars, replacing any stored bar for the same date
+
+        Args:
+            symbol: Ticker symbol
+            bars: (date, close) tuples
+
+        Returns:
+            int: Number of bars written
+        """
+        rows = [(symbol, self._key(date), float(close)) for date, close in bars]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO bars (symbol, date, close) VALUES (?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def load(
+        self,
+        symbol: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Tuple[datetime, float]]:
+        """
+        Load stored bars in date order
+
+        Args:
+            symbol: Ticker symbol
+            start: Earliest date (inclusive)
+            end: Latest date (inclusive)
+
+        Returns:
+            List of (date, close) tuples
+        """
+        query = "SELECT date, close FROM bars WHERE symbol = ?"
+        params: list = [symbol]
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(self._key(start))
+        if end is not None:
+            query += " AND date <= ?"
+            params.append(self._key(end))
+        query += " ORDER BY date"
+
+        return [
+            (datetime.strptime(date, "%Y-%m-%d"), close)
+            for date, close in self._conn.execute(query, params)
+        ]
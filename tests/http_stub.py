@@ -0,0 +1,39 @@
+"""
+本機 HTTP 替身伺服器（以 aiohttp.web 提供錄製的回應，測試不需連網）
+"""
+from typing import Awaitable, Callable, Dict, List
+
+from aiohttp import web
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+class StubServer:
+    """在 127.0.0.1 的隨機埠啟動，記錄收到的每個請求"""
+
+    def __init__(self, routes: Dict[str, Handler]):
+        self.routes = routes
+        self.requests: List[web.Request] = []
+        self._runner = None
+        self.base_url = ""
+
+    async def __aenter__(self) -> "StubServer":
+        @web.middleware
+        async def record(request, handler):
+            self.requests.append(request)
+            return await handler(request)
+
+        app = web.Application(middlewares=[record])
+        for path, handler in self.routes.items():
+            app.router.add_route("*", path, handler)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._runner.cleanup()
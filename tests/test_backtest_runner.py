@@ -0,0 +1,78 @@
+"""
+完整歷史回測測試
+以本機 CSV 檔離線回放 VIX 歷史
+"""
+from datetime import datetime
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backtest import load_history, run_backtest
+from src.backtest.runner import main
+from src.models import Signal
+
+# 2025年川普關稅事件（CBOE VIX_History.csv 格式）
+TARIFF_2025_CSV = """DATE,OPEN,HIGH,LOW,CLOSE
+03/31/2025,22.0,24.0,21.0,22.28
+04/01/2025,22.5,23.0,21.5,21.77
+04/02/2025,21.0,22.5,20.5,21.51
+04/03/2025,25.0,30.0,25.0,30.02
+04/04/2025,35.0,45.6,34.0,45.31
+04/07/2025,60.1,60.1,38.0,46.98
+04/08/2025,44.0,57.0,36.0,52.33
+04/09/2025,50.0,57.5,31.0,33.62
+04/10/2025,36.0,54.0,34.0,40.72
+04/11/2025,40.0,41.5,35.0,37.56
+04/14/2025,35.0,35.5,29.0,30.89
+04/15/2025,30.0,31.0,29.0,30.12
+04/16/2025,31.0,33.0,29.5,32.64
+04/17/2025,30.0,32.0,29.0,29.65
+04/21/2025,32.0,34.0,30.0,33.82
+"""
+
+
+def test_backtest_streams_csv_and_reports_transitions(tmp_path):
+    """回測應輸出每次訊號轉換、各階段天數與吞吐量"""
+    path = tmp_path / "VIX_History.csv"
+    path.write_text(TARIFF_2025_CSV)
+
+    report = run_backtest(load_history(path))
+
+    assert report.points == 15
+    assert report.start == datetime(2025, 3, 31)
+    assert report.end == datetime(2025, 4, 21)
+    assert sum(report.phase_days.values()) == report.points
+    assert report.points_per_second > 0
+
+    assert report.transitions[0].previous_signal is None
+    for previous, current in zip(report.transitions, report.transitions[1:]):
+        assert current.previous_signal == previous.signal
+        assert current.signal != previous.signal
+    assert Signal.STAY_OUT in {t.signal for t in report.transitions}
+
+
+def test_backtest_reads_yahoo_export_and_skips_missing_closes(tmp_path):
+    """Yahoo 匯出格式：ISO 日期、略過 null 收盤價"""
+    path = tmp_path / "vix.csv"
+    path.write_text(
+        "Date,Open,High,Low,Close,Adj Close,Volume\n"
+        "2020-03-13,70.0,77.6,56.2,57.83,57.83,0\n"
+        "2020-03-14,null,null,null,null,null,null\n"
+        "2020-03-16,63.0,83.6,57.1,82.69,82.69,0\n"
+    )
+
+    assert load_history(path) == [(datetime(2020, 3, 13), 57.83), (datetime(2020, 3, 16), 82.69)]
+
+
+def test_backtest_command_runs_offline(tmp_path, capsys):
+    """回測指令只讀本機檔案，回傳 0 並列出轉換"""
+    path = tmp_path / "VIX_History.csv"
+    path.write_text(TARIFF_2025_CSV)
+
+    assert main([str(path), "--limit", "3"]) == 0
+    output = capsys.readouterr().out
+    assert "points/s" in output
+    assert "Signal Transitions" in output
+
+    assert main([str(tmp_path / "missing.csv")]) == 1
@@ -0,0 +1,151 @@
+"""
+常駐模式測試（cron 排程、交易時段限制、保溫的監控器與 SIGTERM）
+"""
+from datetime import datetime, timedelta, timezone
+import asyncio
+import signal
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import src.daemon as daemon
+import src.main as app
+from src.market_hours import MARKET_TZ
+from src.models import VIXSnapshot
+from src.notifiers import DeliveryResult
+from src.scheduler import CronSchedule, ScheduledJob, next_run
+
+UTC = timezone.utc
+
+
+def test_cron_next_after():
+    """常見的 cron 寫法"""
+    twice_daily = CronSchedule("27 2,14 * * *")
+    assert twice_daily.next_after(datetime(2025, 4, 8, 2, 27, tzinfo=UTC)) == datetime(2025, 4, 8, 14, 27, tzinfo=UTC)
+    assert twice_daily.next_after(datetime(2025, 4, 8, 15, 0, tzinfo=UTC)) == datetime(2025, 4, 9, 2, 27, tzinfo=UTC)
+
+    quarter_hours = CronSchedule("*/15 9-16 * * 1-5", MARKET_TZ)
+    # 週五 16:50 → 下週一 9:00（美東）
+    friday = datetime(2025, 4, 11, 16, 50, tzinfo=MARKET_TZ)
+    assert quarter_hours.next_after(friday) == datetime(2025, 4, 14, 9, 0, tzinfo=MARKET_TZ)
+
+    # 日與週都限定時任一符合即可；週日可寫成 7
+    either = CronSchedule("0 0 1 * 7")
+    assert either.next_after(datetime(2025, 4, 1, 12, 0, tzinfo=UTC)) == datetime(2025, 4, 6, 0, 0, tzinfo=UTC)
+    assert CronSchedule("0 0 29 2 *").next_after(datetime(2025, 3, 1, tzinfo=UTC)) == datetime(2028, 2, 29, tzinfo=UTC)
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "*/0 * * * *", "5-1 * * * *", "a * * * *"])
+def test_cron_rejects_malformed_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_market_hours_jobs_skip_closed_sessions():
+    """盤中工作略過收盤與週末，一般排程不受影響"""
+    intraday = ScheduledJob(CronSchedule("*/30 * * * *"), market_hours_only=True)
+    report = ScheduledJob(CronSchedule("27 14 * * *"))
+
+    # 週六 → 下一次盤中輪詢是週一 9:30（美東）
+    saturday = datetime(2025, 4, 12, 12, 0, tzinfo=UTC)
+    when, due = next_run([intraday], saturday)
+    assert when == datetime(2025, 4, 14, 9, 30, tzinfo=MARKET_TZ)
+
+    when, due = next_run([intraday, report], saturday)
+    assert when == datetime(2025, 4, 12, 14, 27, tzinfo=UTC)
+    assert due == [report]
+
+
+def snapshot(days: int, last_value: float) -> VIXSnapshot:
+    start = datetime(2025, 4, 1)
+    history = [(start + timedelta(days=i), 30.0 + i) for i in range(days - 1)]
+    history.append((start + timedelta(days=days - 1), last_value))
+    return VIXSnapshot(history=history, current=last_value, is_intraday=True)
+
+
+def test_daemon_keeps_one_session_and_a_warm_monitor(monkeypatch, tmp_path):
+    """每次排程沿用同一個 session 與 VIXMonitor；盤中更新覆寫當日數據"""
+    monkeypatch.setenv("HTTP_CACHE_DIR", str(tmp_path / "http"))
+    monkeypatch.setenv("FEAR_GREED_STORE_DIR", str(tmp_path / "fng"))
+    monkeypatch.setenv("NOTIFY_STATE_PATH", str(tmp_path / "state.json"))
+    monkeypatch.setenv("NOTIFY_OUTBOX_PATH", str(tmp_path / "outbox.sqlite"))
+    # 每次都視為到達心跳間隔，確保每個排程都送出報告
+    monkeypatch.setattr(daemon, "NOTIFY_HEARTBEAT_HOURS", 0)
+
+    snapshots = iter([snapshot(10, 38.0), snapshot(10, 41.5), snapshot(11, 35.0)])
+    sessions, monitors = [], []
+
+    async def fetch_fng(session, cache=None, history_store=None):
+        sessions.append(session)
+        return {"score": 20, "rating": "extreme fear", "timestamp": "", "indicators": {}}
+
+    async def fetch_vix(session):
+        return next(snapshots)
+
+    async def fetch_minute_bars(session):
+        # 盤中快照：尚無分鐘 K 棒，當日數據維持日線報價
+        return []
+
+    class Notifier:
+        def __init__(self, webhook_urls, outbox=None):
+            self.webhook_urls = [webhook_urls]
+
+        async def flush(self, session):
+            return []
+
+        async def send_combined_report(self, session, fng_data, market_signal, destinations=None, gauges=None):
+            monitors.append(market_signal.vix_current)
+            return [DeliveryResult(url) for url in destinations]
+
+    monkeypatch.setattr(app.FearGreedFetcher, "fetch", staticmethod(fetch_fng))
+    monkeypatch.setattr(app, "_fetch_vix_snapshot", fetch_vix)
+    monkeypatch.setattr(app.YahooChartFetcher, "fetch_minute_bars", staticmethod(fetch_minute_bars))
+    monkeypatch.setattr(daemon, "DiscordNotifier", Notifier)
+
+    # 時鐘每次查詢前進一分鐘，排程每分鐘觸發
+    now = [datetime(2025, 4, 14, 14, 0, tzinfo=UTC)]
+
+    def clock():
+        now[0] += timedelta(minutes=1)
+        return now[0]
+
+    async def scenario():
+        runner = daemon.Daemon("http://127.0.0.1/webhook", [ScheduledJob(CronSchedule("* * * * *"))], clock=clock)
+        original = app.run_cycle
+
+        async def counted(*args):
+            result = await original(*args)
+            if runner.cycles == 2:
+                runner.stop()
+            return result
+
+        monkeypatch.setattr(daemon, "run_cycle", counted)
+        await runner.run()
+        return runner
+
+    runner = asyncio.run(scenario())
+
+    assert runner.cycles == 3
+    assert len(set(map(id, sessions))) == 1
+    assert monitors == [38.0, 41.5, 35.0]
+    assert len(runner.monitor.vix_history) == 11
+    # 前一日的盤中值 41.5 被收盤值 39.0 取代
+    assert [d.value for d in runner.monitor.vix_history][-2:] == [39.0, 35.0]
+
+
+def test_sigterm_stops_the_daemon_gracefully(monkeypatch, tmp_path):
+    """SIGTERM 讓等待中的常駐程序立即結束"""
+    monkeypatch.setenv("HTTP_CACHE_DIR", str(tmp_path / "http"))
+    monkeypatch.setenv("FEAR_GREED_STORE_DIR", str(tmp_path / "fng"))
+    monkeypatch.setenv("NOTIFY_STATE_PATH", str(tmp_path / "state.json"))
+    monkeypatch.setenv("NOTIFY_OUTBOX_PATH", str(tmp_path / "outbox.sqlite"))
+
+    async def scenario():
+        runner = daemon.Daemon("http://127.0.0.1/webhook", [ScheduledJob(CronSchedule("0 0 1 1 *"))])
+        asyncio.get_running_loop().call_later(0.1, os.kill, os.getpid(), signal.SIGTERM)
+        return await asyncio.wait_for(runner.run(), timeout=5), runner.cycles
+
+    assert asyncio.run(scenario()) == (0, 0)
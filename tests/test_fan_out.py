@@ -0,0 +1,175 @@
+"""
+多 webhook 同時發送測試（本機替身 webhook；訊息只產生一次、並行上限、個別結果）
+"""
+from datetime import datetime
+import asyncio
+import random
+import sys
+import os
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import src.main as app
+from src.models import MarketPhase, MarketSignal, Signal, VIXSnapshot
+from src.notifiers import DiscordNotifier, NotificationGate, WebhookDispatcher
+from http_stub import StubServer
+
+FNG = {"score": 20, "rating": "extreme fear", "timestamp": "", "indicators": {}}
+
+SIGNAL = MarketSignal(
+    phase=MarketPhase.PANIC_PEAK,
+    signal=Signal.PREPARE,
+    vix_current=48.0,
+    vix_peak=52.3,
+    vix_change_from_peak=0.08,
+    days_declining=1,
+    reason="",
+    risk_level="極高 / Very High",
+)
+
+
+class Webhooks:
+    """/hook/{n} 替身：記錄並行數與請求開始／結束順序，failing 中的編號回傳 400"""
+
+    def __init__(self, delay: float = 0.2, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.bodies = {}
+        self.events = []
+
+    async def handler(self, request: web.Request) -> web.Response:
+        self.events.append("start")
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            number = int(request.match_info["n"])
+            self.bodies[number] = await request.json()
+            return web.Response(status=400 if number in self.failing else 204)
+        finally:
+            self.in_flight -= 1
+            self.events.append("end")
+
+
+async def send_combined(webhooks: Webhooks, count: int, max_concurrency: int = 10, **kwargs):
+    async with StubServer({"/hook/{n}": webhooks.handler}) as server:
+        urls = [f"{server.base_url}/hook/{n}" for n in range(count)]
+        notifier = DiscordNotifier(urls, WebhookDispatcher(rng=random.Random(0)), max_concurrency=max_concurrency)
+        async with aiohttp.ClientSession() as session:
+            results = await notifier.send_combined_report(session, FNG, SIGNAL, **kwargs)
+            return results, urls
+
+
+def test_message_is_rendered_once_for_all_destinations(monkeypatch):
+    """N 個目的地只產生一次訊息，內容相同"""
+    calls = []
+    render = DiscordNotifier._format_combined_message
+
+    def counting(self, fng_data, signal, gauges=None):
+        calls.append(1)
+        return render(self, fng_data, signal, gauges)
+
+    monkeypatch.setattr(DiscordNotifier, "_format_combined_message", counting)
+    webhooks = Webhooks(delay=0)
+
+    results, _ = asyncio.run(send_combined(webhooks, 5))
+
+    assert len(calls) == 1
+    assert all(result.ok for result in results)
+    assert len({body["content"] for body in webhooks.bodies.values()}) == 1
+
+
+def test_deliveries_are_concurrent_and_bounded():
+    """全部請求在第一個回應前就已送出；有上限時同時進行的請求不超過上限"""
+    unbounded = Webhooks(delay=0.05)
+    asyncio.run(send_combined(unbounded, 8))
+    assert unbounded.max_in_flight == 8
+    assert unbounded.events == ["start"] * 8 + ["end"] * 8
+
+    bounded = Webhooks(delay=0.05)
+    asyncio.run(send_combined(bounded, 8, max_concurrency=3))
+    assert bounded.max_in_flight == 3
+    assert bounded.events[:4] == ["start"] * 3 + ["end"]
+    assert bounded.events.count("start") == 8
+
+
+def test_mixed_results_are_reported_per_destination():
+    """部分失敗時回傳每個目的地的結果，不拋出例外"""
+    results, urls = asyncio.run(send_combined(Webhooks(delay=0, failing={1, 3}), 4))
+
+    assert [result.url for result in results] == urls
+    assert [result.ok for result in results] == [True, False, True, False]
+    assert isinstance(results[1].error, aiohttp.ClientResponseError)
+    assert results[1].error.status == 400
+
+
+def test_failure_warnings_redact_the_webhook_token(capsys):
+    """失敗警告只含遮蔽後的 URL、錯誤類型與狀態碼"""
+    webhooks = Webhooks(delay=0, failing={1})
+
+    async def send():
+        async with StubServer({"/api/webhooks/{n}/{token}": webhooks.handler}) as server:
+            urls = [f"{server.base_url}/api/webhooks/{n}/secret-token" for n in range(2)]
+            notifier = DiscordNotifier(urls, WebhookDispatcher(rng=random.Random(0)))
+            async with aiohttp.ClientSession() as session:
+                return await notifier.send_combined_report(session, FNG, SIGNAL)
+
+    results = asyncio.run(send())
+
+    output = capsys.readouterr().out
+    assert [result.ok for result in results] == [True, False]
+    assert "secret-token" not in output
+    assert "/api/webhooks/1/*** failed - ClientResponseError 400 Bad Request" in output
+
+
+def test_raises_only_when_every_destination_fails():
+    """全部失敗才拋出例外"""
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(send_combined(Webhooks(delay=0, failing={0, 1, 2}), 3))
+
+
+def test_webhook_urls_from_env(monkeypatch):
+    """以逗號或空白分隔多個 webhook"""
+    monkeypatch.setenv("DISCORD_WEBHOOK_URL", " https://a/1, https://b/2\nhttps://c/3  https://d/4,")
+    assert app.webhook_urls_from_env() == ["https://a/1", "https://b/2", "https://c/3", "https://d/4"]
+
+    monkeypatch.setenv("DISCORD_WEBHOOK_URL", "")
+    assert app.webhook_urls_from_env() == []
+
+
+def test_failed_destinations_get_the_report_next_cycle(monkeypatch, tmp_path):
+    """失敗的目的地不記錄狀態，下次只補送給它們"""
+    async def fetch_fng(session, cache=None, history_store=None):
+        return FNG
+
+    async def fetch_vix(session):
+        history = [(datetime(2025, 1, 1 + i), 18.0) for i in range(10)]
+        return VIXSnapshot(history=history, current=18.0, is_intraday=False)
+
+    monkeypatch.setattr(app.FearGreedFetcher, "fetch", staticmethod(fetch_fng))
+    monkeypatch.setattr(app, "_fetch_vix_snapshot", fetch_vix)
+
+    webhooks = Webhooks(delay=0, failing={2})
+
+    async def two_cycles():
+        async with StubServer({"/hook/{n}": webhooks.handler}) as server:
+            urls = [f"{server.base_url}/hook/{n}" for n in range(3)]
+            notifier = DiscordNotifier(urls, WebhookDispatcher(rng=random.Random(0)))
+            gate = NotificationGate(str(tmp_path / "state.json"))
+            async with aiohttp.ClientSession() as session:
+                monitor = await app.run_cycle(session, notifier, gate=gate)
+                first = set(webhooks.bodies)
+                webhooks.bodies.clear()
+                webhooks.failing.clear()
+                await app.run_cycle(session, notifier, monitor=monitor, gate=gate)
+                return first, set(webhooks.bodies)
+
+    first, second = asyncio.run(two_cycles())
+    assert first == {0, 1, 2}
+    assert second == {2}
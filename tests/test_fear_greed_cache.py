@@ -0,0 +1,89 @@
+"""
+CNN 回應快取測試（條件式請求、TTL 與收盤後的新鮮度）
+"""
+from datetime import datetime
+import asyncio
+import sys
+import os
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.fetchers import FearGreedFetcher, HTTPCache
+from src.market_hours import MARKET_TZ, is_market_open, next_market_open
+from http_stub import StubServer
+
+GRAPHDATA = {"fear_and_greed": {"score": 21.4, "rating": "extreme fear", "timestamp": "2025-04-08T16:00:00"}}
+ETAG = '"graphdata-v1"'
+
+
+async def graphdata_handler(request: web.Request) -> web.Response:
+    if request.headers.get("If-None-Match") == ETAG:
+        return web.Response(status=304, headers={"ETag": ETAG})
+    return web.json_response(GRAPHDATA, headers={"ETag": ETAG})
+
+
+async def fetch_twice(monkeypatch, cache: HTTPCache):
+    async with StubServer({"/graphdata": graphdata_handler}) as server:
+        monkeypatch.setattr(FearGreedFetcher, "API_URL", server.base_url + "/graphdata")
+        async with aiohttp.ClientSession() as session:
+            first = await FearGreedFetcher.fetch(session, cache)
+            second = await FearGreedFetcher.fetch(session, cache)
+        return first, second, [dict(r.headers) for r in server.requests]
+
+
+def test_revalidates_with_etag_and_serves_304_from_disk(monkeypatch, tmp_path):
+    """TTL 過期後送出 If-None-Match，304 時從磁碟讀取"""
+    cache = HTTPCache(str(tmp_path), ttl=0)
+    monkeypatch.setattr(cache, "is_fresh", lambda meta, now=None: False)
+
+    first, second, requests = asyncio.run(fetch_twice(monkeypatch, cache))
+
+    assert first == second == {
+        "score": 21, "rating": "extreme fear", "timestamp": "2025-04-08T16:00:00", "indicators": {}
+    }
+    assert len(requests) == 2
+    assert "If-None-Match" not in requests[0]
+    assert requests[1]["If-None-Match"] == ETAG
+
+
+def test_fresh_cache_skips_the_request(monkeypatch, tmp_path):
+    """TTL 內不發出任何請求"""
+    cache = HTTPCache(str(tmp_path), ttl=3600)
+
+    first, second, requests = asyncio.run(fetch_twice(monkeypatch, cache))
+
+    assert first == second
+    assert len(requests) == 1
+
+
+def test_settled_response_stays_fresh_until_next_open(tmp_path):
+    """收盤定案後取得的回應在下次開盤前都視為新鮮"""
+    cache = HTTPCache(str(tmp_path), ttl=300)
+
+    def at(*args) -> float:
+        return datetime(*args, tzinfo=MARKET_TZ).timestamp()
+
+    # 週五 17:00 取得 → 週一開盤前仍新鮮
+    friday_evening = {"fetched_at": at(2025, 4, 11, 17, 0)}
+    assert cache.is_fresh(friday_evening, now=at(2025, 4, 13, 12, 0))
+    assert not cache.is_fresh(friday_evening, now=at(2025, 4, 14, 9, 31))
+
+    # 收盤後 30 分鐘內仍在結算 → 只靠 TTL
+    just_closed = {"fetched_at": at(2025, 4, 11, 16, 10)}
+    assert not cache.is_fresh(just_closed, now=at(2025, 4, 11, 16, 20))
+
+    # 盤中 → 只靠 TTL
+    intraday = {"fetched_at": at(2025, 4, 11, 11, 0)}
+    assert cache.is_fresh(intraday, now=at(2025, 4, 11, 11, 4))
+    assert not cache.is_fresh(intraday, now=at(2025, 4, 11, 11, 6))
+
+
+def test_market_hours_helpers():
+    """週末與盤後的下一次開盤時間"""
+    saturday = datetime(2025, 4, 12, 10, 0, tzinfo=MARKET_TZ)
+    assert not is_market_open(saturday)
+    assert next_market_open(saturday) == datetime(2025, 4, 14, 9, 30, tzinfo=MARKET_TZ)
+    assert is_market_open(datetime(2025, 4, 14, 15, 59, tzinfo=MARKET_TZ))
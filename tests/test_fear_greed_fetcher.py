@@ -0,0 +1,120 @@
+"""
+CNN graphdata 串流解析測試（子指標、切段邊界與截斷的回應）
+"""
+import asyncio
+import json
+import random
+import sys
+import os
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.fetchers import FearGreedFetcher
+from src.fetchers.json_stream import JSONScalarExtractor
+from src.notifiers import DiscordNotifier
+from http_stub import StubServer
+
+SUB_SCORES = {
+    "market_momentum_sp500": (12.0, "extreme fear"),
+    "stock_price_strength": (8.4, "extreme fear"),
+    "stock_price_breadth": (31.2, "fear"),
+    "put_call_options": (55.0, "neutral"),
+    "market_volatility_vix": (3.6, "extreme fear"),
+    "safe_haven_demand": (19.8, "extreme fear"),
+    "junk_bond_demand": (47.1, "neutral"),
+}
+
+
+def graphdata(points: int = 2000) -> dict:
+    """仿 CNN graphdata：總指數加上七項子指標，各附長歷史陣列"""
+    def history():
+        return [{"x": 1.7e12 + i * 864e5, "y": 20 + i % 50, "rating": "fear \"quoted\" é"} for i in range(points)]
+
+    payload = {
+        "fear_and_greed": {
+            "score": 17.6, "rating": "extreme fear", "timestamp": "2025-04-08T16:00:00+00:00",
+            "previous_close": 4.0, "previous_1_week": 25.3,
+        },
+        "fear_and_greed_historical": {"timestamp": 1744128000000, "score": 17.6, "rating": "extreme fear", "data": history()},
+    }
+    for key, (score, rating) in SUB_SCORES.items():
+        payload[key] = {"timestamp": 1744128000000, "score": score, "rating": rating, "data": history()}
+    payload["market_volatility_vix_50"] = {"timestamp": 1744128000000, "score": 3.6, "rating": "extreme fear", "data": []}
+    return payload
+
+
+def test_extractor_matches_json_loads_for_any_chunking():
+    """任意切段都得到與 json.loads 相同的淺層純量值"""
+    body = json.dumps(graphdata(points=50), ensure_ascii=False).encode()
+    decoded = json.loads(body)
+    expected = {
+        (section, name): value
+        for section, fields in decoded.items()
+        for name, value in fields.items()
+        if not isinstance(value, (dict, list))
+    }
+
+    rng = random.Random(7)
+    for _ in range(20):
+        extractor = JSONScalarExtractor(max_depth=2)
+        pos = 0
+        while pos < len(body):
+            size = rng.randint(1, 9)
+            extractor.feed(body[pos:pos + size])
+            pos += size
+        assert extractor.close() == expected
+
+
+def test_extractor_skips_arrays_and_rejects_truncated_payloads():
+    """陣列內的值不保留；截斷的回應視為錯誤"""
+    extractor = JSONScalarExtractor(max_depth=2)
+    extractor.feed(b'{"a": {"b": [1, {"c": 2}], "d": -1.5e2}, "e": null}')
+    assert extractor.close() == {("a", "d"): -150.0, ("e",): None}
+
+    truncated = JSONScalarExtractor()
+    truncated.feed(b'{"fear_and_greed": {"score": 17.6, "data": [1, 2')
+    with pytest.raises(ValueError):
+        truncated.close()
+
+
+def test_fetch_returns_sub_indicators_from_streamed_response(monkeypatch):
+    """fetch 逐段讀取回應並回傳所有子指標"""
+    body = json.dumps(graphdata()).encode()
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for pos in range(0, len(body), 4096):
+            await response.write(body[pos:pos + 4096])
+        await response.write_eof()
+        return response
+
+    async def fetch():
+        async with StubServer({"/graphdata": handler}) as server:
+            monkeypatch.setattr(FearGreedFetcher, "API_URL", server.base_url + "/graphdata")
+            async with aiohttp.ClientSession() as session:
+                return await FearGreedFetcher.fetch(session)
+
+    data = asyncio.run(fetch())
+
+    assert (data["score"], data["rating"]) == (18, "extreme fear")
+    assert list(data["indicators"]) == list(FearGreedFetcher.INDICATORS)
+    assert data["indicators"]["market_volatility_vix"] == {"score": 4, "rating": "extreme fear"}
+    assert data["indicators"]["junk_bond_demand"] == {"score": 47, "rating": "neutral"}
+
+
+def test_notifier_lists_components_driving_fear():
+    """恐懼時列出分數最低的子指標"""
+    values = FearGreedFetcher._extract(JSONScalarExtractor(), [json.dumps(graphdata(points=1)).encode()])
+    fng_data = FearGreedFetcher._parse(values)
+
+    drivers = DiscordNotifier("http://127.0.0.1/webhook")._format_drivers(fng_data)
+
+    assert len(drivers) == 3
+    assert "Market Volatility: 4" in drivers[0]
+    assert "Stock Price Strength: 8" in drivers[1]
+    assert "Market Momentum: 12" in drivers[2]
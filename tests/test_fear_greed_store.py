@@ -0,0 +1,104 @@
+"""
+本機恐懼貪婪指數歷史測試（欄位檔、增量寫入與 VIX 聯合查詢）
+"""
+from datetime import datetime, timedelta, timezone
+import asyncio
+import json
+import sys
+import os
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.fetchers import FearGreedFetcher
+from src.monitors import VIXMonitor
+from src.storage import FearGreedHistoryStore, VIXHistoryStore, load_joint
+from http_stub import StubServer
+
+
+def days(start: datetime, scores):
+    return [(start + timedelta(days=i), score) for i, score in enumerate(scores)]
+
+
+def test_append_is_incremental_and_survives_reopen(tmp_path):
+    """只附加較新的日期，最後一天可更新，重新開啟後內容一致"""
+    store = FearGreedHistoryStore(str(tmp_path))
+    assert store.last_date() is None
+
+    assert store.append(days(datetime(2025, 4, 1), [40.0, 30.0, 20.0])) == 3
+    # 舊日期不改寫，最後一天以最新值覆寫，並附加新日期
+    assert store.append([(datetime(2025, 4, 2), 99.0), (datetime(2025, 4, 3, 15), 18.5), (datetime(2025, 4, 4), 12.0)]) == 1
+
+    reopened = FearGreedHistoryStore(str(tmp_path))
+    assert reopened.load() == [
+        (datetime(2025, 4, 1), 40.0),
+        (datetime(2025, 4, 2), 30.0),
+        (datetime(2025, 4, 3), 18.5),
+        (datetime(2025, 4, 4), 12.0),
+    ]
+    assert reopened.load(start=datetime(2025, 4, 2), end=datetime(2025, 4, 3)) == [
+        (datetime(2025, 4, 2), 30.0),
+        (datetime(2025, 4, 3), 18.5),
+    ]
+    assert os.path.getsize(tmp_path / "dates.i32") == 4 * 4
+    assert os.path.getsize(tmp_path / "scores.f64") == 4 * 8
+
+
+def test_interrupted_append_is_truncated_on_open(tmp_path):
+    """兩欄長度不一致時以較短者為準"""
+    store = FearGreedHistoryStore(str(tmp_path))
+    store.append(days(datetime(2025, 4, 1), [40.0, 30.0]))
+    with open(tmp_path / "scores.f64", "ab") as f:
+        f.write(b"\x00" * 12)
+
+    reopened = FearGreedHistoryStore(str(tmp_path))
+    assert len(reopened) == 2
+    assert os.path.getsize(tmp_path / "scores.f64") == 2 * 8
+
+
+def test_joint_query_feeds_vix_monitor_offline(tmp_path):
+    """VIX 與恐懼貪婪指數依日期對齊，可直接送入 VIXMonitor"""
+    start = datetime(2025, 3, 31)
+    fng = FearGreedHistoryStore(str(tmp_path / "fng"))
+    fng.append(days(start, [35.0, 30.0, 25.0, 10.0, 4.0, 6.0, 5.0]))
+    with VIXHistoryStore(str(tmp_path / "vix.sqlite")) as vix:
+        # 4/5、4/6 為週末，VIX 無數據
+        vix.upsert("^VIX", [(start + timedelta(days=i), v) for i, v in [(0, 22.3), (1, 21.8), (2, 21.5), (3, 30.0), (4, 45.3), (7, 47.0)]])
+
+        joint = load_joint(vix, fng, start=datetime(2025, 4, 1))
+
+    assert joint == [
+        (datetime(2025, 4, 1), 21.8, 30.0),
+        (datetime(2025, 4, 2), 21.5, 25.0),
+        (datetime(2025, 4, 3), 30.0, 10.0),
+        (datetime(2025, 4, 4), 45.3, 4.0),
+    ]
+    monitor = VIXMonitor.from_series([(date, close) for date, close, _ in joint], lookback_days=30)
+    assert monitor.get_current_vix() == 45.3
+
+
+def test_fetch_ingests_historical_series(monkeypatch, tmp_path):
+    """串流解析時把 fear_and_greed_historical 寫入本機歷史"""
+    start = datetime(2025, 4, 1, tzinfo=timezone.utc)
+    points = [{"x": (start + timedelta(days=i)).timestamp() * 1000, "y": 40.0 - i, "rating": "fear"} for i in range(5)]
+    payload = {
+        "fear_and_greed": {"score": 36.0, "rating": "fear", "timestamp": "2025-04-05T20:00:00+00:00"},
+        "fear_and_greed_historical": {"score": 36.0, "rating": "fear", "data": points},
+    }
+
+    async def handler(request: web.Request) -> web.Response:
+        return web.json_response(payload)
+
+    async def fetch(store):
+        async with StubServer({"/graphdata": handler}) as server:
+            monkeypatch.setattr(FearGreedFetcher, "API_URL", server.base_url + "/graphdata")
+            async with aiohttp.ClientSession() as session:
+                return await FearGreedFetcher.fetch(session, history_store=store)
+
+    store = FearGreedHistoryStore(str(tmp_path))
+    store.append([(datetime(2025, 4, 2), 39.0)])
+
+    assert asyncio.run(fetch(store))["score"] == 36
+    assert store.load() == [(datetime(2025, 4, 2), 39.0)] + days(datetime(2025, 4, 3), [38.0, 37.0, 36.0])
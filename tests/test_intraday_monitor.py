@@ -0,0 +1,195 @@
+"""
+盤中串流監控測試（分鐘 K 棒環狀緩衝、當日 OHLC 原地彙整、每根 K 棒的訊號與整段重算一致）
+"""
+from datetime import datetime, timedelta, timezone
+import asyncio
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import src.main as app
+from src.fetchers.yahoo_chart_fetcher import YahooChartFetcher
+from src.models import VIXSnapshot
+from src.monitors import IntradayVIXMonitor, VIXMonitor
+from src.notifiers import DeliveryResult
+
+# 2025-04-07 09:30 America/New_York
+OPEN = datetime(2025, 4, 7, 13, 30, tzinfo=timezone.utc)
+
+
+def daily_points(days: int, seed: int):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    value = 20.0
+    points = []
+    for i in range(days):
+        value = max(9.0, value + rng.uniform(-4, 4))
+        points.append((start + timedelta(days=i), round(value, 2)))
+    return points
+
+
+def assert_same_state(monitor: VIXMonitor, expected: VIXMonitor):
+    assert list(monitor.vix_history) == list(expected.vix_history)
+    assert monitor.get_rising_days() == expected.get_rising_days()
+    assert monitor.get_declining_days() == expected.get_declining_days()
+    for days in (1, 3, 10, 30):
+        assert monitor.get_peak_vix(days) == expected.get_peak_vix(days)
+    assert monitor.generate_signal() == expected.generate_signal()
+
+
+def test_update_last_matches_a_full_rebuild():
+    """盤中反覆覆寫當日數據，狀態與以最終數據重建完全相同"""
+    rng = random.Random(3)
+    monitor = VIXMonitor()
+    monitor.register_peak_window(3)
+    closes = []
+    for date, value in daily_points(80, seed=11):
+        monitor.add_data(date, value)
+        for _ in range(5):
+            value = round(max(9.0, value + rng.uniform(-3, 3)), 2)
+            monitor.update_last(value)
+            expected = VIXMonitor.from_series(closes + [(date, value)])
+            assert_same_state(monitor, expected)
+        closes.append((date, value))
+
+
+def test_falling_update_only_rescans_the_evicted_tail():
+    """數值變小時各窗口只重掃被淘汰的一段，結果與重建窗口相同"""
+    rng = random.Random(12)
+    monitor = VIXMonitor.from_series(daily_points(60, seed=8))
+    for days in (1, 2, 7):
+        monitor.register_peak_window(days)
+
+    for _ in range(200):
+        monitor.update_last(round(rng.uniform(9, 60), 2))
+        for days, window in monitor._peak_windows.items():
+            assert list(window) == list(monitor._build_peak_window(days))
+
+
+def test_update_last_after_bulk_load():
+    """以 add_many 載入後，覆寫最新一筆仍正確"""
+    points = daily_points(40, seed=5)
+    monitor = VIXMonitor.from_series(points)
+    for value in (points[-1][1] + 5, points[-1][1] - 7, points[-1][1]):
+        monitor.update_last(value)
+        assert_same_state(monitor, VIXMonitor.from_series(points[:-1] + [(points[-1][0], value)]))
+
+
+def test_ticks_are_aggregated_into_minute_and_daily_bars():
+    """同一分鐘的報價併成一根 K 棒；當日 OHLC 原地更新"""
+    intraday = IntradayVIXMonitor(VIXMonitor.from_series(daily_points(10, seed=1)[:-1]))
+    for seconds, price in ((0, 30.0), (20, 32.5), (45, 29.0), (70, 31.0)):
+        intraday.on_tick(OPEN + timedelta(seconds=seconds), price)
+
+    first, second = intraday.bars
+    assert (first.open, first.high, first.low, first.close) == (30.0, 32.5, 29.0, 29.0)
+    assert second.close == 31.0
+    assert first.start.hour == 9 and first.start.minute == 30
+
+    today = intraday.today
+    assert today.start == datetime(2025, 4, 7)
+    assert (today.open, today.high, today.low, today.close) == (30.0, 32.5, 29.0, 31.0)
+    assert intraday.monitor.vix_history[-1].date == datetime(2025, 4, 7)
+    assert intraday.monitor.get_current_vix() == 31.0
+    assert intraday.signal.vix_current == 31.0
+
+
+def test_memory_stays_bounded():
+    """分鐘與日 K 棒都是固定長度的環狀緩衝"""
+    intraday = IntradayVIXMonitor(max_bars=60)
+    for minute in range(5 * 24 * 60):
+        intraday.on_tick(OPEN + timedelta(minutes=minute), 20 + (minute % 17))
+
+    assert len(intraday.bars) == 60
+    assert len(intraday.days) <= intraday.monitor.lookback_days + 1
+    assert intraday.bars[-1].start == IntradayVIXMonitor._minute(OPEN + timedelta(minutes=5 * 24 * 60 - 1))
+
+
+def test_every_bar_matches_the_daily_signal():
+    """每根 K 棒後的訊號等同以當日最新收盤重算日線訊號"""
+    rng = random.Random(9)
+    history = daily_points(30, seed=2)
+    intraday = IntradayVIXMonitor(VIXMonitor.from_series(history))
+
+    price = history[-1][1]
+    session_day = history[-1][0] + timedelta(days=1)
+    start = datetime.combine(session_day.date(), OPEN.timetz())
+    for minute in range(120):
+        price = round(max(9.0, price + rng.uniform(-1, 1)), 2)
+        signal = intraday.on_bar(start + timedelta(minutes=minute), price, price + 0.3, price - 0.3, price)
+        expected = VIXMonitor.from_series(history + [(session_day, price)]).generate_signal()
+        assert signal == expected
+
+
+def test_repolled_bars_are_idempotent():
+    """重複輪詢取得的舊 K 棒略過，最新一根只更新不重複"""
+    bars = [(OPEN + timedelta(minutes=i), 20.0 + i, 21.0 + i, 19.0 + i, 20.5 + i) for i in range(5)]
+    intraday = IntradayVIXMonitor()
+    intraday.feed(bars[:3])
+    intraday.feed(bars)
+
+    assert len(intraday.bars) == 5
+    assert len(intraday.monitor.vix_history) == 1
+    assert intraday.today.close == 24.5
+    assert intraday.today.high == 25.0
+
+
+def test_parse_bars_skips_incomplete_minutes():
+    """尚未成形（含 null）的 K 棒略過，時間為 UTC"""
+    ts = int(OPEN.timestamp())
+    payload = {"chart": {"result": [{
+        "meta": {},
+        "timestamp": [ts, ts + 60, ts + 120],
+        "indicators": {"quote": [{
+            "open": [30.0, 31.0, None],
+            "high": [31.0, 32.0, None],
+            "low": [29.5, 30.5, None],
+            "close": [30.5, 31.5, 31.7],
+        }]},
+    }], "error": None}}
+
+    bars = YahooChartFetcher.parse_bars(payload)
+    assert bars == [(OPEN, 30.0, 31.0, 29.5, 30.5), (OPEN + timedelta(minutes=1), 31.0, 32.0, 30.5, 31.5)]
+
+
+def test_run_cycle_updates_today_from_minute_bars(monkeypatch):
+    """盤中的排程以最新分鐘 K 棒覆寫當日數據，訊號使用最新收盤"""
+    history = daily_points(20, seed=4)
+    today = datetime(2025, 4, 7)
+    history[-1] = (today, 30.0)
+
+    async def fetch_fng(session, cache=None, history_store=None):
+        return {"score": 20, "rating": "extreme fear", "timestamp": "", "indicators": {}}
+
+    async def fetch_vix(session):
+        return VIXSnapshot(history=history, current=30.0, is_intraday=True)
+
+    async def fetch_minute_bars(session):
+        return [(OPEN + timedelta(minutes=i), 30.0 + i, 31.0 + i, 29.5 + i, 30.5 + i) for i in range(3)]
+
+    signals = []
+
+    class Notifier:
+        webhook_urls = ["http://127.0.0.1/webhook"]
+
+        async def flush(self, session):
+            return []
+
+        async def send_combined_report(self, session, fng_data, market_signal, destinations=None, gauges=None):
+            signals.append(market_signal)
+            return [DeliveryResult(url) for url in destinations]
+
+    monkeypatch.setattr(app.FearGreedFetcher, "fetch", staticmethod(fetch_fng))
+    monkeypatch.setattr(app, "_fetch_vix_snapshot", fetch_vix)
+    monkeypatch.setattr(app.YahooChartFetcher, "fetch_minute_bars", staticmethod(fetch_minute_bars))
+
+    intraday = IntradayVIXMonitor()
+    monitor = asyncio.run(app.run_cycle(None, Notifier(), intraday=intraday))
+
+    assert monitor is intraday.monitor
+    assert monitor.vix_history.date_at(-1) == today
+    assert monitor.get_current_vix() == 32.5
+    assert (intraday.today.open, intraday.today.high, intraday.today.low) == (30.0, 33.0, 29.5)
+    assert signals[0].vix_current == 32.5
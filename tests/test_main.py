@@ -0,0 +1,94 @@
+"""
+主流程測試（以假的資料來源與 Discord 取代網路請求）
+"""
+from datetime import datetime, timedelta
+import asyncio
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import src.main as app
+from src.fetchers import VIXFetcher
+from src.models import VIXSnapshot
+from src.notifiers import DeliveryResult
+
+FNG_DATA = {"score": 20, "rating": "extreme fear", "timestamp": ""}
+
+
+def fake_snapshot() -> VIXSnapshot:
+    """25 天逐日回落的 VIX 歷史"""
+    start = datetime(2025, 4, 7)
+    history = [(start + timedelta(days=i), 60.0 - i) for i in range(25)]
+    return VIXSnapshot(history=history, current=history[-1][1], is_intraday=False)
+
+
+class RecordingNotifier:
+    """記錄送出的報告"""
+    sent = []
+
+    def __init__(self, webhook_urls, outbox=None):
+        self.webhook_urls = webhook_urls
+
+    async def flush(self, session):
+        return []
+
+    async def send_combined_report(self, session, fng_data, market_signal, destinations=None, gauges=None):
+        RecordingNotifier.sent.append(("combined", market_signal))
+        return [DeliveryResult(url) for url in destinations]
+
+    async def send_fear_greed_only(self, session, fng_data, destinations=None):
+        RecordingNotifier.sent.append(("fear_greed", None))
+        return [DeliveryResult(url) for url in destinations]
+
+
+def patch_sources(monkeypatch, tmp_path, delay: float, vix_error: Exception = None):
+    """以固定延遲模擬 CNN（非同步）與 Yahoo（阻塞），並記錄各來源的開始與結束"""
+    events = []
+
+    async def fetch_fng(session, cache=None, history_store=None):
+        events.append(("fng", "start"))
+        await asyncio.sleep(delay)
+        events.append(("fng", "end"))
+        return FNG_DATA
+
+    def fetch_vix(days=30, store=None):
+        events.append(("vix", "start"))
+        time.sleep(delay)
+        events.append(("vix", "end"))
+        if vix_error:
+            raise vix_error
+        return fake_snapshot()
+
+    RecordingNotifier.sent = []
+    monkeypatch.setenv("VIX_SOURCE", "yfinance")
+    monkeypatch.setenv("DISCORD_WEBHOOK_URL", "http://127.0.0.1/webhook")
+    monkeypatch.setenv("VIX_STORE_PATH", str(tmp_path / "vix.sqlite"))
+    monkeypatch.setenv("NOTIFY_STATE_PATH", str(tmp_path / "state.json"))
+    monkeypatch.setenv("NOTIFY_OUTBOX_PATH", str(tmp_path / "outbox.sqlite"))
+    monkeypatch.setenv("HTTP_CACHE_DIR", str(tmp_path / "http"))
+    monkeypatch.setenv("FEAR_GREED_STORE_DIR", str(tmp_path / "fng"))
+    monkeypatch.setattr(app.FearGreedFetcher, "fetch", staticmethod(fetch_fng))
+    monkeypatch.setattr(VIXFetcher, "fetch_snapshot", staticmethod(fetch_vix))
+    monkeypatch.setattr(app, "DiscordNotifier", RecordingNotifier)
+    return events
+
+
+def test_sources_are_fetched_concurrently(monkeypatch, tmp_path):
+    """兩個來源都在任何一個結束前開始（重疊執行，而非依序）"""
+    events = patch_sources(monkeypatch, tmp_path, delay=0.2)
+
+    assert asyncio.run(app.main()) == 0
+
+    assert sorted(events[:2]) == [("fng", "start"), ("vix", "start")]
+    assert len(events) == 4
+    assert RecordingNotifier.sent[0][0] == "combined"
+
+
+def test_vix_failure_falls_back_to_fear_greed_only(monkeypatch, tmp_path):
+    """VIX 失敗時仍送出恐懼貪婪指數"""
+    patch_sources(monkeypatch, tmp_path, delay=0.01, vix_error=Exception("Failed to fetch VIX data"))
+
+    assert asyncio.run(app.main()) == 0
+    assert RecordingNotifier.sent == [("fear_greed", None)]
@@ -0,0 +1,104 @@
+"""
+變化驅動通知測試（階段 / 訊號轉換、閾值跨越、心跳與持久化）
+"""
+from dataclasses import replace
+from datetime import datetime
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import src.main as app
+from src.models import MarketPhase, MarketSignal, Signal, VIXSnapshot
+from src.monitors import VIXMonitor
+from src.notifiers import DeliveryResult, NotificationGate
+
+FNG = {"score": 40, "rating": "fear", "timestamp": "", "indicators": {}}
+HOUR = 3600.0
+
+SIGNAL = MarketSignal(
+    phase=MarketPhase.TENSION,
+    signal=Signal.STAY_OUT,
+    vix_current=27.0,
+    vix_peak=28.0,
+    vix_change_from_peak=0.04,
+    days_declining=1,
+    reason="",
+    risk_level="高 / High",
+)
+
+
+def test_only_transitions_crossings_and_heartbeats_are_sent(tmp_path):
+    """同一狀態不重送；轉換、跨越閾值或心跳才送出"""
+    gate = NotificationGate(str(tmp_path / "state.json"), heartbeat=24 * HOUR)
+
+    assert gate.check(FNG, SIGNAL, now=0) == "first report"
+    gate.record(FNG, SIGNAL, now=0)
+
+    # VIX 與分數小幅變動，仍在同一區間
+    assert gate.check({**FNG, "score": 44}, replace(SIGNAL, vix_current=33.9), now=HOUR) is None
+
+    assert gate.check(FNG, replace(SIGNAL, signal=Signal.WATCH_CLOSELY), now=HOUR) == "changed: signal"
+    assert gate.check(FNG, replace(SIGNAL, vix_current=35.2), now=HOUR) == "changed: vix_band"
+    assert gate.check({**FNG, "score": 25}, SIGNAL, now=HOUR) == "changed: fear_greed_band"
+    assert gate.check(FNG, replace(SIGNAL, phase=MarketPhase.PANIC_RISING, vix_current=36.0), now=HOUR) == \
+        "changed: phase, vix_band"
+    assert gate.check(FNG, None, now=HOUR) == "changed: phase, signal, vix_band"
+
+    assert gate.check(FNG, SIGNAL, now=24 * HOUR) == "heartbeat"
+
+
+def test_state_survives_restarts(tmp_path):
+    """上次送出的狀態保存在磁碟"""
+    path = str(tmp_path / "state.json")
+    NotificationGate(path).record(FNG, SIGNAL, now=100.0)
+
+    reopened = NotificationGate(path)
+    assert reopened.last_sent["sent_at"] == 100.0
+    assert reopened.check(FNG, SIGNAL, now=200.0) is None
+
+
+def test_run_cycle_skips_unchanged_reports(monkeypatch, tmp_path):
+    """相同的市場狀態第二次不送出"""
+    sent = []
+
+    async def fetch_fng(session, cache=None, history_store=None):
+        return FNG
+
+    async def fetch_vix(session):
+        history = [(datetime(2025, 1, 1 + i), 18.0) for i in range(10)]
+        return VIXSnapshot(history=history, current=18.0, is_intraday=False)
+
+    class Notifier:
+        webhook_urls = ["http://127.0.0.1/webhook"]
+
+        async def flush(self, session):
+            return []
+
+        async def send_combined_report(self, session, fng_data, market_signal, destinations=None, gauges=None):
+            sent.append(market_signal.signal)
+            return [DeliveryResult(url) for url in destinations]
+
+    monkeypatch.setattr(app.FearGreedFetcher, "fetch", staticmethod(fetch_fng))
+    monkeypatch.setattr(app, "_fetch_vix_snapshot", fetch_vix)
+
+    async def two_cycles():
+        gate = NotificationGate(str(tmp_path / "state.json"))
+        monitor = await app.run_cycle(None, Notifier(), gate=gate)
+        await app.run_cycle(None, Notifier(), monitor=monitor, gate=gate)
+
+    asyncio.run(two_cycles())
+    assert sent == [Signal.NORMAL]
+
+
+def test_vix_bands_follow_the_monitor_thresholds(tmp_path):
+    """VIX 分級取自 VIXMonitor 的閾值，調整閾值時一併生效"""
+    assert NotificationGate(str(tmp_path / "a.json")).vix_thresholds == (20, 25, 35, 45)
+
+    monitor = VIXMonitor()
+    monitor.PANIC_THRESHOLD = 30
+    gate = NotificationGate(str(tmp_path / "b.json"), vix_thresholds=NotificationGate.vix_thresholds_of(monitor))
+    gate.record(FNG, SIGNAL, now=0)
+
+    assert gate.check(FNG, replace(SIGNAL, vix_current=31.0), now=HOUR) == "changed: vix_band"
@@ -0,0 +1,210 @@
+"""
+Outbox 測試（先存後送；Discord 故障期間的訊息在恢復後依序合併補送；被拒絕的訊息不阻擋後面的訊息）
+"""
+from datetime import datetime
+import asyncio
+import random
+import sqlite3
+import sys
+import os
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import src.main as app
+from src.models import VIXSnapshot
+from src.notifiers import DiscordNotifier, NotificationGate, NotificationOutbox, WebhookDispatcher
+from http_stub import StubServer
+
+FNG = {"score": 20, "rating": "extreme fear", "timestamp": "", "indicators": {}}
+
+
+class Webhook:
+    """/hook 替身：down 時回傳 503（故障），rejecting 時回傳 404（webhook 已刪除），否則記錄收到的 payload"""
+
+    def __init__(self, down: bool = False, rejecting: bool = False):
+        self.down = down
+        self.rejecting = rejecting
+        self.received = []
+
+    async def handler(self, request: web.Request) -> web.Response:
+        if self.down:
+            return web.Response(status=503)
+        if self.rejecting:
+            return web.Response(status=404)
+        self.received.append(await request.json())
+        return web.Response(status=204)
+
+
+def make_notifier(url: str, outbox: NotificationOutbox) -> DiscordNotifier:
+    # 故障時在短期限內放棄，留給 outbox 補送
+    dispatcher = WebhookDispatcher(deadline=0.2, base_delay=0.01, rng=random.Random(0))
+    return DiscordNotifier(url, dispatcher, outbox=outbox)
+
+
+def test_batches_coalesce_consecutive_messages_in_order():
+    """連續的純文字 / embed 訊息合併，不同類型不合併，順序不變"""
+    messages = [
+        (1, {"content": "a"}),
+        (2, {"content": "b"}),
+        (3, {"embeds": [{"title": "x"}]}),
+        (4, {"embeds": [{"title": "y"}]}),
+        (5, {"content": "c"}),
+    ]
+    assert NotificationOutbox.batches(messages) == [
+        ([1, 2], {"content": "a\n\nb"}),
+        ([3, 4], {"embeds": [{"title": "x"}, {"title": "y"}]}),
+        ([5], {"content": "c"}),
+    ]
+
+
+def test_batches_respect_discord_limits():
+    """超過 2000 字或 10 個 embed 就分開送"""
+    long = [(i, {"content": "x" * 900}) for i in range(3)]
+    assert [ids for ids, _ in NotificationOutbox.batches(long)] == [[0, 1], [2]]
+
+    embeds = [(i, {"embeds": [{"title": str(i)}] * 4}) for i in range(3)]
+    assert [ids for ids, _ in NotificationOutbox.batches(embeds)] == [[0, 1], [2]]
+
+
+def test_outdated_messages_expire(tmp_path):
+    """超過 max_age 未送達的訊息不再補送"""
+    url = "https://discord.com/api/webhooks/1/token"
+    with NotificationOutbox(str(tmp_path / "outbox.sqlite"), max_age=3600) as outbox:
+        outbox.enqueue([url], {"content": "old"}, now=0)
+        outbox.enqueue([url], {"content": "new"}, now=5000)
+        assert [payload for _, payload in outbox.pending(url, now=5000)] == [{"content": "new"}]
+
+
+def test_webhook_tokens_are_not_stored(tmp_path):
+    """資料庫只保存 webhook 的雜湊"""
+    path = str(tmp_path / "outbox.sqlite")
+    url = "https://discord.com/api/webhooks/1/secret-token"
+    with NotificationOutbox(path) as outbox:
+        outbox.enqueue([url], {"content": "hi"})
+        assert outbox.pending_destinations([url, "https://other"]) == [url]
+
+    with sqlite3.connect(path) as conn:
+        assert "secret-token" not in str(conn.execute("SELECT * FROM messages").fetchall())
+
+
+def test_outage_is_replayed_in_order_once_discord_recovers(tmp_path):
+    """故障期間不拋錯、訊息保留；恢復後第一次發送時依序合併送出"""
+    webhook = Webhook(down=True)
+
+    async def scenario():
+        async with StubServer({"/hook": webhook.handler}) as server:
+            with NotificationOutbox(str(tmp_path / "outbox.sqlite")) as outbox:
+                notifier = make_notifier(f"{server.base_url}/hook", outbox)
+                async with aiohttp.ClientSession() as session:
+                    first = await notifier._deliver(session, {"content": "first"})
+                    second = await notifier._deliver(session, {"content": "second"})
+                    webhook.down = False
+                    third = await notifier._deliver(session, {"content": "third"})
+                    return first, second, third, outbox.pending_destinations(notifier.webhook_urls)
+
+    first, second, third, still_pending = asyncio.run(scenario())
+    assert not first[0].ok and first[0].queued
+    assert not second[0].ok and second[0].queued
+    assert third[0].ok
+    assert webhook.received == [{"content": "first\n\nsecond\n\nthird"}]
+    assert still_pending == []
+
+
+def test_rejected_message_is_dead_lettered_and_does_not_block(tmp_path):
+    """404 的訊息移到 failed、不算已排入補送；之後的訊息照常送達"""
+    webhook = Webhook(rejecting=True)
+
+    async def scenario():
+        async with StubServer({"/hook": webhook.handler}) as server:
+            url = f"{server.base_url}/hook"
+            with NotificationOutbox(str(tmp_path / "outbox.sqlite")) as outbox:
+                notifier = make_notifier(url, outbox)
+                async with aiohttp.ClientSession() as session:
+                    try:
+                        await notifier._deliver(session, {"content": "rejected"})
+                    except aiohttp.ClientResponseError as e:
+                        rejected = e
+                    webhook.rejecting = False
+                    good = await notifier._deliver(session, {"content": "good"})
+                    return rejected, good, outbox.pending_destinations([url]), outbox.failed(url)
+
+    rejected, good, still_pending, failed = asyncio.run(scenario())
+    assert rejected.status == 404
+    assert good[0].ok and not good[0].queued
+    assert webhook.received == [{"content": "good"}]
+    assert still_pending == []
+    assert [payload for _, payload in failed] == [{"content": "rejected"}]
+
+
+def test_rejected_destination_is_not_marked_queued(tmp_path):
+    """一個 webhook 拒絕時結果不標記 queued（通知閘門不會把它記為已送出）"""
+    async def send():
+        webhooks = {"ok": Webhook(), "gone": Webhook(rejecting=True)}
+        routes = {f"/{name}": hook.handler for name, hook in webhooks.items()}
+        async with StubServer(routes) as server:
+            urls = [f"{server.base_url}/{name}" for name in webhooks]
+            with NotificationOutbox(str(tmp_path / "outbox.sqlite")) as outbox:
+                notifier = DiscordNotifier(urls, make_notifier(urls[0], outbox).dispatcher, outbox=outbox)
+                async with aiohttp.ClientSession() as session:
+                    return await notifier._deliver(session, {"content": "report"})
+
+    results = asyncio.run(send())
+    assert [(result.ok, result.queued) for result in results] == [(True, False), (False, False)]
+    assert results[1].error.status == 404
+
+
+def test_flush_replays_pending_messages(tmp_path):
+    """重新啟動後 flush() 補送上次未送達的訊息"""
+    webhook = Webhook(down=True)
+    path = str(tmp_path / "outbox.sqlite")
+
+    async def scenario():
+        async with StubServer({"/hook": webhook.handler}) as server:
+            url = f"{server.base_url}/hook"
+            async with aiohttp.ClientSession() as session:
+                with NotificationOutbox(path) as outbox:
+                    await make_notifier(url, outbox)._deliver(session, {"embeds": [{"title": "missed"}]})
+
+                webhook.down = False
+                with NotificationOutbox(path) as outbox:
+                    notifier = make_notifier(url, outbox)
+                    replayed = await notifier.flush(session)
+                    again = await notifier.flush(session)
+                    return replayed, again
+
+    replayed, again = asyncio.run(scenario())
+    assert [result.ok for result in replayed] == [True]
+    assert again == []
+    assert webhook.received == [{"embeds": [{"title": "missed"}]}]
+
+
+def test_run_cycle_replays_queued_report_without_resending(monkeypatch, tmp_path):
+    """排入 outbox 的報告視同已送出：下次只補送一次，不重複產生"""
+    async def fetch_fng(session, cache=None, history_store=None):
+        return FNG
+
+    async def fetch_vix(session):
+        history = [(datetime(2025, 1, 1 + i), 18.0) for i in range(10)]
+        return VIXSnapshot(history=history, current=18.0, is_intraday=False)
+
+    monkeypatch.setattr(app.FearGreedFetcher, "fetch", staticmethod(fetch_fng))
+    monkeypatch.setattr(app, "_fetch_vix_snapshot", fetch_vix)
+
+    webhook = Webhook(down=True)
+
+    async def two_cycles():
+        async with StubServer({"/hook": webhook.handler}) as server:
+            with NotificationOutbox(str(tmp_path / "outbox.sqlite")) as outbox:
+                notifier = make_notifier(f"{server.base_url}/hook", outbox)
+                gate = NotificationGate(str(tmp_path / "state.json"))
+                async with aiohttp.ClientSession() as session:
+                    monitor = await app.run_cycle(session, notifier, gate=gate)
+                    webhook.down = False
+                    await app.run_cycle(session, notifier, monitor=monitor, gate=gate)
+
+    asyncio.run(two_cycles())
+    assert len(webhook.received) == 1
+    assert "Fear & Greed" in webhook.received[0]["content"]
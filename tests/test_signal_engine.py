@@ -0,0 +1,113 @@
+"""
+向量化訊號引擎測試
+逐日比對 score_series 與 VIXMonitor.generate_signal 的結果
+"""
+from datetime import datetime, timedelta
+import random
+import sys
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models import Signal
+from src.monitors.vix_monitor import VIXMonitor
+from src.monitors.signal_engine import score_series
+
+
+def crisis_like_series(count: int, seed: int):
+    """產生含恐慌飆升與回落的模擬 VIX 序列（交易日，跳過週末）"""
+    rng = random.Random(seed)
+    date = datetime(1990, 1, 2)
+    value = 15.0
+    points = []
+    while len(points) < count:
+        if date.weekday() < 5:
+            if rng.random() < 0.01:
+                value *= rng.uniform(1.5, 2.5)
+            elif value > 30 and rng.random() < 0.7:
+                value *= rng.uniform(0.88, 0.99)
+            else:
+                value = value + (18 - value) * 0.05 + rng.gauss(0, value * 0.06)
+            value = min(max(value, 9.0), 90.0)
+            points.append((date, round(value, 2)))
+        date += timedelta(days=1)
+    return points
+
+
+def panic_cycles(cycles: int, seed: int):
+    """產生多次「平靜 → 飆升 → 逐日回落」的恐慌循環"""
+    rng = random.Random(seed)
+    date = datetime(2000, 1, 3)
+    points = []
+
+    def push(value):
+        nonlocal date
+        points.append((date, round(value, 2)))
+        date += timedelta(days=rng.choice([1, 1, 1, 3]))
+
+    for _ in range(cycles):
+        value = rng.uniform(12, 22)
+        for _ in range(rng.randrange(3, 15)):
+            push(value * rng.uniform(0.95, 1.05))
+        peak = rng.uniform(30, 85)
+        for step in range(rng.randrange(1, 6)):
+            push(value + (peak - value) * (step + 1) / 5)
+        value = peak
+        for _ in range(rng.randrange(5, 25)):
+            value *= rng.uniform(0.85, 0.99) if rng.random() < 0.85 else rng.uniform(1.0, 1.1)
+            push(value)
+    return points
+
+
+def assert_matches_monitor(points, monitor: VIXMonitor):
+    """逐日比對向量化結果與 VIXMonitor"""
+    dates = [d for d, _ in points]
+    values = [v for _, v in points]
+    result = score_series(dates, values, VIXMonitor(lookback_days=monitor.lookback_days))
+
+    phases, signals, risks = result.phase, result.signal, result.risk_level
+    for i, (date, value) in enumerate(points):
+        monitor.add_data(date, value)
+        expected = monitor.generate_signal()
+
+        assert phases[i] == expected.phase, date
+        assert signals[i] == expected.signal, date
+        assert risks[i] == expected.risk_level, date
+        assert result.peak[i] == expected.vix_peak, date
+        assert result.declining_days[i] == expected.days_declining, date
+        if expected.vix_change_from_peak is None:
+            assert np.isnan(result.change_from_peak[i])
+        else:
+            assert result.change_from_peak[i] == pytest.approx(expected.vix_change_from_peak, abs=1e-12)
+
+
+def test_score_series_matches_monitor_point_for_point():
+    """十年模擬數據的每一天都應與 generate_signal 一致"""
+    for seed in range(3):
+        assert_matches_monitor(crisis_like_series(2500, seed), VIXMonitor(lookback_days=30))
+
+
+def test_score_series_matches_monitor_through_panic_cycles():
+    """恐慌高峰、消退與各級進場訊號都應一致"""
+    points = panic_cycles(200, seed=3)
+    assert_matches_monitor(points, VIXMonitor(lookback_days=30))
+
+    signals = set(score_series([d for d, _ in points], [v for _, v in points]).signal)
+    assert {Signal.ENTRY_30, Signal.ENTRY_60, Signal.ENTRY_100, Signal.PREPARE} <= signals
+
+
+def test_score_series_handles_short_lookback_and_ties():
+    """較短回溯窗口、同日重複數據也應一致"""
+    points = crisis_like_series(600, seed=5)
+    points += [(points[-1][0], 40.0), (points[-1][0], 38.0)]
+    assert_matches_monitor(points, VIXMonitor(lookback_days=7))
+
+
+def test_score_series_rejects_unsorted_dates():
+    """日期未排序時拋出 ValueError"""
+    with pytest.raises(ValueError):
+        score_series([datetime(2025, 4, 8), datetime(2025, 4, 7)], [55.0, 60.1])
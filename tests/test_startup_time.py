@@ -0,0 +1,19 @@
+"""
+啟動依賴測試
+匯入 src.main 不得載入 yfinance / pandas / NumPy
+（毫秒預算與機器相關，由 benchmarks/startup_budget.py 檢查）
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from startup_budget import FORBIDDEN_MODULES, measure_import
+
+
+def test_import_src_main_skips_heavy_dependencies():
+    """src.main 啟動時不載入重量級依賴"""
+    _elapsed, imported = measure_import()
+
+    assert "src.main" in imported
+    assert [module for module in FORBIDDEN_MODULES if module in imported] == []
@@ -0,0 +1,60 @@
+"""
+閾值參數掃描測試
+"""
+import sys
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backtest.sweep import evaluate, grid_search, random_search, run_sweep
+from test_signal_engine import panic_cycles
+
+
+def test_grid_and_random_search_spaces():
+    """網格搜尋展開所有組合；隨機搜尋支援區間與候選值"""
+    grid = grid_search({"PANIC_THRESHOLD": [30, 35], "MIN_DECLINING_DAYS": [3, 5, 7]})
+    assert len(grid) == 6
+    assert {"PANIC_THRESHOLD": 35, "MIN_DECLINING_DAYS": 7} in grid
+
+    samples = random_search({"PEAK_DECLINE_30": (0.2, 0.4), "MIN_DECLINING_DAYS": (2, 7)}, 20, seed=1)
+    assert len(samples) == 20
+    for params in samples:
+        assert 0.2 <= params["PEAK_DECLINE_30"] <= 0.4
+        assert isinstance(params["MIN_DECLINING_DAYS"], int)
+
+    with pytest.raises(ValueError):
+        grid_search({"PANIC_THRESHOLD": (30, 40)})
+
+
+def test_run_sweep_matches_serial_evaluation_and_is_ranked():
+    """平行掃描（共享記憶體）的結果應與單一 process 評估一致，且依分數排序"""
+    history = panic_cycles(150, seed=2)
+    parameter_sets = grid_search({"PANIC_THRESHOLD": [30, 35, 40], "MIN_DECLINING_DAYS": [3, 5]})
+
+    results = run_sweep(history, parameter_sets, workers=2)
+
+    dates = np.array([d for d, _ in history], dtype="datetime64[us]")
+    values = np.array([v for _, v in history])
+    expected = {
+        tuple(sorted(p.items())): evaluate(p, dates, values) for p in parameter_sets
+    }
+
+    assert len(results) == len(parameter_sets)
+    for result in results:
+        assert result == expected[tuple(sorted(result.params.items()))]
+    assert [r.score for r in results] == sorted(r.score for r in results)
+    assert all(r.entries > 0 for r in results)
+
+
+def test_evaluate_rejects_unknown_parameter():
+    """不可調整的參數名稱應拋出 ValueError"""
+    history = panic_cycles(5, seed=0)
+    dates = np.array([d for d, _ in history], dtype="datetime64[us]")
+    values = np.array([v for _, v in history])
+
+    with pytest.raises(ValueError):
+        evaluate({"lookback_days": 10}, dates, values)
@@ -0,0 +1,149 @@
+"""
+VIX 期限結構測試（比值與倒掛天數逐日累計、作為階段判斷的輸入、與批次抓取整合）
+"""
+from datetime import datetime, timedelta
+import asyncio
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import src.main as app
+from src.models import MarketPhase, Signal, VIXSnapshot
+from src.monitors import TermStructureMonitor, VIXMonitor
+from src.notifiers import DeliveryResult, DiscordNotifier
+
+START = datetime(2025, 3, 1)
+
+
+def curve(values):
+    """[(VIX9D, VIX, VIX3M), ...] → 逐日的快照"""
+    dates = [START + timedelta(days=i) for i in range(len(values))]
+    return {
+        symbol: VIXSnapshot([(date, point[k]) for date, point in zip(dates, values)], values[-1][k], False)
+        for k, symbol in enumerate(TermStructureMonitor.SYMBOLS)
+    }
+
+
+def expected_runs(values):
+    """每一天往回數連續倒掛的天數"""
+    short = long = 0
+    for vix9d, vix, vix3m in values:
+        short = short + 1 if vix9d > vix else 0
+        long = long + 1 if vix > vix3m else 0
+    return short, long
+
+
+def test_ratios_and_inversion_runs():
+    """比值與連續倒掛天數；回到正價差時歸零"""
+    values = [(16, 18, 20), (24, 22, 21), (30, 26, 24), (33, 29, 26), (20, 21, 22)]
+    monitor = TermStructureMonitor()
+    monitor.update(curve(values[:4]))
+
+    latest = monitor.current()
+    assert latest.short_ratio == 33 / 29
+    assert latest.long_ratio == 29 / 26
+    assert latest.inverted
+    assert (latest.short_inverted_days, latest.long_inverted_days) == (3, 3)
+
+    monitor.update(curve(values))
+    assert not monitor.current().inverted
+    assert monitor.current().long_inverted_days == 0
+
+
+def test_incremental_updates_match_a_full_rebuild():
+    """逐日、同日覆寫與亂序更新，結果都與整段重算相同"""
+    rng = random.Random(7)
+    values = []
+    for _ in range(60):
+        vix = rng.uniform(12, 40)
+        values.append((vix * rng.uniform(0.85, 1.15), vix, vix * rng.uniform(0.9, 1.2)))
+
+    monitor = TermStructureMonitor(lookback_days=20)
+    for i, point in enumerate(values):
+        date = START + timedelta(days=i)
+        # 盤中先送一筆，收盤後覆寫
+        monitor.add_point(date, point[0] * 1.1, point[1], point[2])
+        monitor.add_point(date, *point)
+    # 亂序補入一筆舊數據（與原值相同）
+    monitor.add_point(START + timedelta(days=50), *values[50])
+
+    kept = values[-21:]
+    assert [entry.vix for entry in monitor.history] == [vix for _, vix, _ in kept]
+    assert (monitor.current().short_inverted_days, monitor.current().long_inverted_days) == expected_runs(kept)
+
+
+def test_update_only_takes_new_dates_present_for_all_symbols():
+    """只使用三個代號都有的日期；已處理過的日期不重算"""
+    snapshots = curve([(16, 18, 20), (24, 22, 21), (30, 26, 24)])
+    snapshots["^VIX3M"].history.pop()
+
+    monitor = TermStructureMonitor()
+    monitor.update(snapshots)
+    assert monitor.current().date == START + timedelta(days=1)
+
+
+def quiet_monitor():
+    """VIX 22 持平：現貨閾值只判定為平靜"""
+    return VIXMonitor.from_series([(START + timedelta(days=i), 22.0) for i in range(10)])
+
+
+def test_inverted_curve_signals_panic_before_spot_thresholds():
+    """期限結構倒掛且 VIX 未回落 → 提前判定恐慌加速"""
+    monitor = quiet_monitor()
+    terms = TermStructureMonitor()
+    terms.update(curve([(24, 22, 21)]))
+
+    assert monitor.detect_phase() == MarketPhase.CALM
+    signal = monitor.generate_signal(terms.current())
+    assert signal.phase == MarketPhase.PANIC_RISING
+    assert signal.signal == Signal.STAY_OUT
+    assert "VIX/VIX3M=1.05" in signal.reason
+    assert signal.term_structure is terms.current()
+
+
+def test_contango_leaves_the_spot_signal_unchanged():
+    """正價差時與不提供期限結構的結果相同"""
+    monitor = quiet_monitor()
+    terms = TermStructureMonitor()
+    terms.update(curve([(18, 22, 24)]))
+
+    signal = monitor.generate_signal(terms.current())
+    assert signal.phase == monitor.generate_signal().phase
+    assert signal.term_structure.long_ratio == 22 / 24
+
+
+def test_run_cycle_fetches_the_curve_in_the_vix_batch(monkeypatch):
+    """期限結構與 VIX 在同一批次取得，倒掛反映在報告中"""
+    async def fetch_fng(session, cache=None, history_store=None):
+        return {"score": 20, "rating": "extreme fear", "timestamp": "", "indicators": {}}
+
+    batches = []
+
+    async def fetch_batch(session, symbols):
+        batches.append(symbols)
+        return curve([(20 + i, 22.0, 21.0) for i in range(10)])
+
+    monkeypatch.setattr(app.FearGreedFetcher, "fetch", staticmethod(fetch_fng))
+    monkeypatch.setattr(app, "_fetch_volatility_snapshots", fetch_batch)
+
+    messages = []
+    renderer = DiscordNotifier("http://127.0.0.1/webhook")
+
+    class Notifier:
+        webhook_urls = ["http://127.0.0.1/webhook"]
+
+        async def flush(self, session):
+            return []
+
+        async def send_combined_report(self, session, fng_data, market_signal, destinations=None, gauges=None):
+            messages.append(renderer._format_combined_message(fng_data, market_signal, gauges))
+            return [DeliveryResult(url) for url in destinations]
+
+    monitor = asyncio.run(app.run_cycle(None, Notifier(), term_structure=TermStructureMonitor()))
+
+    assert batches == [["^VIX9D", "^VIX", "^VIX3M"]]
+    assert monitor.detect_phase() == MarketPhase.CALM
+    assert "Panic Rising" in messages[0]
+    assert "Backwardation (10天 days)" in messages[0]
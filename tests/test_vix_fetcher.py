@@ -0,0 +1,55 @@
+"""
+VIX 抓取測試（以假的 yfinance Ticker 取代網路請求）
+"""
+from datetime import datetime, timedelta
+import sys
+import os
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("yfinance")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.fetchers import vix_fetcher
+from src.fetchers.vix_fetcher import VIXFetcher
+
+
+class FakeTicker:
+    """記錄每次 history() 呼叫，回傳到今天為止的每日數據"""
+    calls = []
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, start=None, end=None, period=None):
+        FakeTicker.calls.append((start, end))
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        index = pd.date_range((today - timedelta(days=40)).date(), today, freq="D", tz="America/Chicago")
+        index = index[(index.tz_localize(None) >= start) & (index.tz_localize(None) < end)]
+        return pd.DataFrame({"Close": [20.0 + i for i in range(len(index))]}, index=index)
+
+
+def test_fetch_snapshot_uses_single_request(monkeypatch):
+    """歷史與最新報價來自同一次請求，最新值即最後一筆"""
+    FakeTicker.calls = []
+    monkeypatch.setattr(vix_fetcher.yf, "Ticker", FakeTicker)
+
+    snapshot = VIXFetcher.fetch_snapshot(days=30)
+
+    assert len(FakeTicker.calls) == 1
+    assert snapshot.history[-1][0].date() == datetime.now().date()
+    assert snapshot.current == snapshot.history[-1][1]
+    assert snapshot.history[-1][0].tzinfo is None
+
+
+def test_is_intraday_only_during_session_for_todays_bar():
+    """只有今日的數據且在交易時段內才算盤中"""
+    tz = VIXFetcher.MARKET_TZ
+    bar = datetime(2025, 4, 9)
+
+    assert VIXFetcher._is_intraday(bar, datetime(2025, 4, 9, 11, 0, tzinfo=tz))
+    assert not VIXFetcher._is_intraday(bar, datetime(2025, 4, 9, 16, 30, tzinfo=tz))
+    assert not VIXFetcher._is_intraday(bar, datetime(2025, 4, 10, 11, 0, tzinfo=tz))
+    assert not VIXFetcher._is_intraday(datetime(2025, 4, 12), datetime(2025, 4, 12, 11, 0, tzinfo=tz))
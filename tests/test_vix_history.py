@@ -0,0 +1,143 @@
+"""
+欄位式 VIX 歷史測試（時間戳精確往返、類 deque 操作、前段移除的攤銷搬移、監控器行為不變）
+"""
+from datetime import datetime, timedelta
+import random
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models import VIXData, VIXHistory
+from src.models import vix_history as columns
+from src.monitors import VIXMonitor
+
+START = datetime(2025, 1, 1)
+
+
+def points(count: int, start: datetime = START):
+    return [VIXData(start + timedelta(days=i), 15.0 + (i % 7) * 1.5) for i in range(count)]
+
+
+def test_dates_round_trip_exactly():
+    """微秒與 1970 年以前的日期都能精確還原"""
+    dates = [
+        datetime(2025, 4, 7, 9, 30, 15, 123456),
+        datetime(1969, 12, 31, 23, 59, 59, 999999),
+        datetime(1900, 1, 1),
+        datetime(9999, 12, 31, 23, 59, 59),
+    ]
+    for date in dates:
+        assert columns.from_micros(columns.to_micros(date)) == date
+
+    history = VIXHistory(VIXData(date, 20.0) for date in sorted(dates))
+    assert [point.date for point in history] == sorted(dates)
+
+
+def test_behaves_like_a_sequence():
+    """索引（含負數）、切片、反向迭代與覆寫"""
+    data = points(10)
+    history = VIXHistory(data)
+
+    assert len(history) == 10
+    assert history[0] == data[0]
+    assert history[-1] == data[-1]
+    assert history[2:5] == data[2:5]
+    assert history[::-3] == data[::-3]
+    assert list(reversed(history)) == data[::-1]
+    assert history.date_at(-2) == data[-2].date
+    assert history.value_at(3) == data[3].value
+    with pytest.raises(IndexError):
+        history[10]
+
+    history[-1] = VIXData(data[-1].date, 99.0)
+    history.set_value(0, 11.0)
+    assert history[-1].value == 99.0
+    assert history[0] == VIXData(data[0].date, 11.0)
+
+
+def test_popleft_and_drop_before_compact_lazily():
+    """前段移除先只移動起點，累積夠多才搬移陣列"""
+    data = points(3000)
+    history = VIXHistory(data)
+
+    for i in range(500):
+        assert history.popleft() == data[i]
+    assert history._head == 500
+    assert history[0] == data[500]
+
+    dropped = history.drop_before(data[2000].date)
+    assert dropped == 1500
+    assert history._head == 0
+    assert list(history) == data[2000:]
+    assert history.drop_before(START) == 0
+
+
+def test_insert_and_bisect():
+    """二分搜尋以日期為鍵；插入位置以目前起點為準"""
+    data = points(20)
+    history = VIXHistory(data[::2])
+    history.popleft()
+
+    for point in data[1::2]:
+        if point.date > history.date_at(0):
+            history.insert(history.bisect_right(point.date), point)
+    assert list(history) == data[2:]
+    assert history.bisect_left(data[5].date) == 3
+    assert history.bisect_right(data[5].date) == 4
+
+
+def test_storage_is_sixteen_bytes_per_point():
+    """每筆只佔一個 int64 與一個 float64"""
+    history = VIXHistory.from_columns(range(10_000), [20.0] * 10_000)
+    assert history.nbytes == 16 * 10_000
+    with pytest.raises(ValueError):
+        VIXHistory.from_columns([1, 2], [20.0])
+
+
+def test_monitor_state_is_unchanged():
+    """逐筆、亂序與批次載入的監控器結果一致"""
+    rng = random.Random(4)
+    series = [(START + timedelta(days=i), round(rng.uniform(10, 45), 2)) for i in range(120)]
+
+    bulk = VIXMonitor.from_series(series)
+    incremental = VIXMonitor()
+    shuffled = VIXMonitor()
+    for date, value in series:
+        incremental.add_data(date, value)
+    for date, value in sorted(series, key=lambda _: rng.random()):
+        shuffled.add_data(date, value)
+
+    kept = [VIXData(date, value) for date, value in series[-31:]]
+    assert isinstance(bulk.vix_history, VIXHistory)
+    assert list(bulk.vix_history) == kept
+    assert list(incremental.vix_history) == kept
+    for monitor in (incremental, shuffled):
+        assert monitor.get_peak_vix(10) == bulk.get_peak_vix(10)
+        assert monitor.get_peak_vix(0) == bulk.get_peak_vix(0)
+        assert monitor.get_rising_days() == bulk.get_rising_days()
+        assert monitor.generate_signal() == bulk.generate_signal()
+
+
+def test_micros_api_matches_the_datetime_api():
+    """整數時間戳版本與 datetime 版本結果一致；空的歷史回傳 None"""
+    empty = VIXHistory()
+    assert empty.last_timestamp() is None and empty.last_value() is None
+    assert not empty
+
+    data = points(10)
+    history = VIXHistory()
+    for point in data:
+        history.append_micros(columns.to_micros(point.date), point.value)
+    assert list(history) == data
+    assert history.last_timestamp() == history.timestamp_at(-1) == columns.to_micros(data[-1].date)
+    assert history.last_value() == data[-1].value
+
+    micros = columns.to_micros(data[4].date)
+    assert history.bisect_left_micros(micros) == history.bisect_left(data[4].date) == 4
+    assert history.bisect_right_micros(micros) == history.bisect_right(data[4].date) == 5
+    assert history.drop_before_micros(micros) == 4
+    history.insert_micros(0, micros - 1, 1.0)
+    assert history[0] == VIXData(columns.from_micros(micros - 1), 1.0)
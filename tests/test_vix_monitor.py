@@ -0,0 +1,200 @@
+"""
+VIXMonitor 增量狀態測試
+確認增量實作與原始「排序 + 過濾」實作的結果完全一致
+"""
+from datetime import datetime, timedelta
+import random
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models import TermStructure, VIXData
+from src.monitors.vix_monitor import VIXMonitor
+
+
+def legacy_history(points, lookback_days: int = 30):
+    """原始 add_data 邏輯：每筆數據後重新排序並過濾"""
+    history = []
+    for date, value in points:
+        history.append(VIXData(date, value))
+        history.sort(key=lambda x: x.date)
+        cutoff_date = history[-1].date - timedelta(days=lookback_days)
+        history = [d for d in history if d.date >= cutoff_date]
+    return history
+
+
+def random_points(count: int, seed: int, shuffle_ratio: float = 0.2):
+    """產生大致依序、部分亂序且含重複日期的數據"""
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    points = []
+    value = 20.0
+    for i in range(count):
+        value = max(9.0, value + rng.uniform(-4, 4))
+        points.append((start + timedelta(days=i), round(value, 2)))
+
+    for _ in range(int(count * shuffle_ratio)):
+        i = rng.randrange(count)
+        j = min(count - 1, i + rng.randrange(1, 45))
+        points[i], points[j] = points[j], points[i]
+
+    for _ in range(count // 10):
+        date, _value = points[rng.randrange(count)]
+        points.insert(rng.randrange(len(points)), (date, round(rng.uniform(10, 80), 2)))
+    return points
+
+
+def test_add_data_matches_legacy_ordering_and_window():
+    """亂序、重複日期的數據應得到與原始實作相同的歷史"""
+    for seed in range(5):
+        points = random_points(300, seed)
+        monitor = VIXMonitor(lookback_days=30)
+        for date, value in points:
+            monitor.add_data(date, value)
+
+        assert list(monitor.vix_history) == legacy_history(points)
+
+
+def test_add_data_strips_timezone():
+    """帶時區的日期會被轉為 naive datetime"""
+    from datetime import timezone
+
+    monitor = VIXMonitor()
+    monitor.add_data(datetime(2025, 4, 7, tzinfo=timezone.utc), 60.1)
+
+    assert monitor.vix_history[-1].date == datetime(2025, 4, 7)
+
+
+def test_peak_vix_matches_window_max():
+    """每次新增數據後，滾動高點應等於最近 N 筆的最大值"""
+    points = random_points(400, seed=7)
+    monitor = VIXMonitor(lookback_days=30)
+    monitor.register_peak_window(3)
+
+    for date, value in points:
+        monitor.add_data(date, value)
+        values = [d.value for d in monitor.vix_history]
+        for days in (1, 3, 10, 30, 60):
+            assert monitor.get_peak_vix(days=days) == max(values[-days:])
+
+
+def test_peak_vix_non_positive_days_keep_slice_semantics():
+    """days <= 0 與原本的 vix_history[-days:] 相同：0 為全部歷史"""
+    monitor = VIXMonitor(lookback_days=30)
+    for date, value in random_points(50, seed=3):
+        monitor.add_data(date, value)
+    values = [d.value for d in monitor.vix_history]
+
+    assert monitor.get_peak_vix(days=0) == max(values)
+    assert monitor.get_peak_vix(days=-2) == max(values[2:])
+    with pytest.raises(ValueError):
+        monitor.get_peak_vix(days=-len(values))
+
+
+def brute_run_length(values, compare):
+    """從最新數據往回計算連續符合條件的天數"""
+    days = 0
+    for i in range(len(values) - 1, 0, -1):
+        if not compare(values[i], values[i - 1]):
+            break
+        days += 1
+    return days
+
+
+def test_run_length_counters_match_history_scan():
+    """連續上升/下降天數應與逐筆往回掃描的結果一致"""
+    for seed in range(3):
+        points = random_points(300, seed, shuffle_ratio=0.05)
+        monitor = VIXMonitor(lookback_days=30)
+        for date, value in points:
+            monitor.add_data(date, value)
+            values = [d.value for d in monitor.vix_history]
+            assert monitor.get_rising_days() == brute_run_length(values, lambda a, b: a > b)
+            assert monitor.get_declining_days() == brute_run_length(values, lambda a, b: a < b)
+
+
+def test_add_many_matches_sequential_add_data():
+    """批次載入與逐筆 add_data 的結果與衍生狀態一致（日期不重複時）"""
+    points = random_points(300, seed=11)
+    unique = list({date: (date, value) for date, value in points}.values())
+
+    sequential = VIXMonitor(lookback_days=30)
+    for date, value in unique:
+        sequential.add_data(date, value)
+
+    bulk = VIXMonitor.from_series(unique, lookback_days=30)
+
+    assert list(bulk.vix_history) == list(sequential.vix_history)
+    assert bulk.get_peak_vix(days=10) == sequential.get_peak_vix(days=10)
+    assert bulk.get_rising_days() == sequential.get_rising_days()
+    assert bulk.get_declining_days() == sequential.get_declining_days()
+    assert bulk.generate_signal() == sequential.generate_signal()
+
+
+def test_add_many_dedupes_and_accepts_arrays():
+    """相同日期保留最後一筆；支援 NumPy 日期/數值陣列"""
+    np = pytest.importorskip("numpy")
+
+    dates = np.array(["2025-04-07", "2025-04-08", "2025-04-08", "2025-04-09"], dtype="datetime64[D]")
+    values = np.array([60.1, 50.0, 55.0, 33.0])
+
+    monitor = VIXMonitor()
+    monitor.add_many(dates, values)
+
+    assert [(d.date, d.value) for d in monitor.vix_history] == [
+        (datetime(2025, 4, 7), 60.1),
+        (datetime(2025, 4, 8), 55.0),
+        (datetime(2025, 4, 9), 33.0),
+    ]
+    assert monitor.get_declining_days() == 2
+
+
+def test_add_many_accepts_pandas_series():
+    """支援以日期為索引的 pandas Series（含時區）"""
+    pd = pytest.importorskip("pandas")
+
+    index = pd.DatetimeIndex(["2025-04-02", "2025-04-03", "2025-04-04"], tz="America/Chicago")
+    monitor = VIXMonitor.from_series(pd.Series([45.3, 52.0, 56.0], index=index))
+
+    assert monitor.vix_history[0].date == datetime(2025, 4, 2)
+    assert monitor.get_rising_days() == 2
+    assert monitor.get_peak_vix() == 56.0
+
+
+def test_generate_signal_is_cached_until_data_changes():
+    """數據未變動時回傳同一個訊號；任何寫入都讓快取失效"""
+    points = random_points(60, seed=8, shuffle_ratio=0)
+    monitor = VIXMonitor.from_series(points)
+
+    signal = monitor.generate_signal()
+    assert monitor.generate_signal() is signal
+
+    version = monitor.version
+    monitor.add_data(points[-1][0] + timedelta(days=1), 80.0)
+    assert monitor.version == version + 1
+    assert monitor.generate_signal() is not signal
+    assert monitor.generate_signal().vix_current == 80.0
+
+    monitor.update_last(12.0)
+    assert monitor.generate_signal().vix_current == 12.0
+
+    monitor.add_many([(points[-1][0] + timedelta(days=2), 30.0)])
+    assert monitor.generate_signal().vix_current == 30.0
+
+
+def test_signal_cache_respects_thresholds_and_term_structure():
+    """調整閾值或換一個期限結構時重新計算"""
+    monitor = VIXMonitor.from_series([(datetime(2025, 3, 1) + timedelta(days=i), 22.0) for i in range(10)])
+    assert monitor.generate_signal().signal.name == "NORMAL"
+
+    monitor.TENSION_THRESHOLD = 21
+    assert monitor.generate_signal().signal.name == "STAY_OUT"
+
+    inverted = TermStructure(datetime(2025, 3, 10), 24.0, 22.0, 21.0, 24 / 22, 22 / 21, 1, 1)
+    signal = monitor.generate_signal(inverted)
+    assert signal.term_structure is inverted
+    assert monitor.generate_signal(inverted) is signal
+    assert monitor.generate_signal().term_structure is None
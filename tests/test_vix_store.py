@@ -0,0 +1,113 @@
+"""
+本機 VIX 歷史資料庫測試
+"""
+from datetime import datetime, timedelta
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.market_hours import MARKET_TZ
+from src.storage import VIXHistoryStore
+
+
+def test_store_upserts_and_loads_ranges(tmp_path):
+    """同日期覆寫、依日期排序、支援區間查詢"""
+    with VIXHistoryStore(str(tmp_path / "vix.sqlite")) as store:
+        assert store.last_date("^VIX") is None
+
+        store.upsert("^VIX", [(datetime(2025, 4, 8), 52.33), (datetime(2025, 4, 7), 46.98)])
+        store.upsert("^VIX", [(datetime(2025, 4, 8), 52.0), (datetime(2025, 4, 9), 33.62)])
+        store.upsert("^VXN", [(datetime(2025, 4, 10), 40.0)])
+
+        assert store.last_date("^VIX") == datetime(2025, 4, 9)
+        assert store.load("^VIX") == [
+            (datetime(2025, 4, 7), 46.98),
+            (datetime(2025, 4, 8), 52.0),
+            (datetime(2025, 4, 9), 33.62),
+        ]
+        assert store.load("^VIX", start=datetime(2025, 4, 8), end=datetime(2025, 4, 8)) == [
+            (datetime(2025, 4, 8), 52.0)
+        ]
+
+
+def test_fetch_history_only_downloads_new_bars(tmp_path, monkeypatch):
+    """有本機歷史時，只從最後一筆保存的日期開始下載"""
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("yfinance")
+    from src.fetchers import vix_fetcher
+    from src.fetchers.vix_fetcher import VIXFetcher
+
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    requested = []
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def history(self, start, end):
+            requested.append(start)
+            index = pd.date_range(max(start, today - timedelta(days=40)).date(), today, freq="D")
+            return pd.DataFrame({"Close": [20.0 + i for i in range(len(index))]}, index=index)
+
+    monkeypatch.setattr(vix_fetcher.yf, "Ticker", FakeTicker)
+
+    with VIXHistoryStore(str(tmp_path / "vix.sqlite")) as store:
+        first = VIXFetcher.fetch_history(days=30, store=store)
+        assert requested[-1] <= today - timedelta(days=29)
+
+        second = VIXFetcher.fetch_history(days=30, store=store)
+        assert requested[-1] == today
+        assert [d for d, _ in second] == [d for d, _ in first]
+
+
+def test_stored_history_stands_in_only_when_fresh():
+    """下載失敗時，已保存的數據必須涵蓋窗口且最多落後一個已收盤的交易日"""
+    start = datetime(2025, 3, 1)
+    # 週一盤中：上週五的數據仍算最新
+    monday = datetime(2025, 4, 7, 11, 0, tzinfo=MARKET_TZ)
+    assert VIXHistoryStore.can_stand_in(datetime(2025, 4, 4), start, monday)
+    # 週二收盤後：缺週一、週二兩個交易日
+    tuesday_close = datetime(2025, 4, 8, 16, 30, tzinfo=MARKET_TZ)
+    assert VIXHistoryStore.can_stand_in(datetime(2025, 4, 7), start, tuesday_close)
+    assert not VIXHistoryStore.can_stand_in(datetime(2025, 4, 4), start, tuesday_close)
+    # 空的資料庫或未涵蓋窗口
+    assert not VIXHistoryStore.can_stand_in(None, start, monday)
+    assert not VIXHistoryStore.can_stand_in(datetime(2025, 2, 1), start, datetime(2025, 2, 1, 12, tzinfo=MARKET_TZ))
+
+
+def test_fetch_history_falls_back_to_fresh_stored_bars_only(tmp_path, monkeypatch, capsys):
+    """網路錯誤時沿用夠新的已保存數據並警告；數據過舊或程式錯誤時拋出"""
+    pytest.importorskip("yfinance")
+    from src.fetchers import vix_fetcher
+    from src.fetchers.vix_fetcher import VIXFetcher
+
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    error = ConnectionError("network is down")
+
+    class FailingTicker:
+        def __init__(self, symbol):
+            pass
+
+        def history(self, start, end):
+            raise error
+
+    monkeypatch.setattr(vix_fetcher.yf, "Ticker", FailingTicker)
+
+    with VIXHistoryStore(str(tmp_path / "fresh.sqlite")) as store:
+        store.upsert("^VIX", [(today - timedelta(days=i), 20.0 + i) for i in range(10)])
+        history = VIXFetcher.fetch_history(days=30, store=store)
+        assert history[-1][0] == today - timedelta(days=1)
+        assert "using stored history" in capsys.readouterr().out
+
+    with VIXHistoryStore(str(tmp_path / "stale.sqlite")) as store:
+        store.upsert("^VIX", [(today - timedelta(days=10 + i), 20.0) for i in range(10)])
+        with pytest.raises(ConnectionError):
+            VIXFetcher.fetch_history(days=30, store=store)
+
+        error = RuntimeError("bug")
+        store.upsert("^VIX", [(today, 20.0)])
+        with pytest.raises(RuntimeError):
+            VIXFetcher.fetch_history(days=30, store=store)
@@ -0,0 +1,220 @@
+"""
+多指數波動率監控測試（spark 端點批次抓取、每個代號一個監控器、綜合報告）
+"""
+from datetime import datetime, timedelta
+import asyncio
+import copy
+import json
+import sys
+import os
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import src.main as app
+from src.fetchers.yahoo_chart_fetcher import YahooChartFetcher
+from src.models import MarketPhase, VIXSnapshot
+from src.monitors import VIXMonitor, VolatilityRegistry
+from src.notifiers import DeliveryResult, DiscordNotifier
+from src.storage import VIXHistoryStore
+from http_stub import StubServer
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "yahoo_chart_vix.json")
+
+# 以 VIX 錄製數據按比例產生其他指數
+SCALES = {"^VIX": 1.0, "^VXN": 1.25, "^VVIX": 4.5, "^VIX3M": 1.1, "^V2TX": 1.05}
+
+
+def spark_payload(symbols, recent=False):
+    with open(FIXTURE) as f:
+        chart = json.load(f)["chart"]["result"][0]
+    if recent:
+        # 平移整天數，讓最後一筆落在昨天（預設 30 天回溯內）
+        shift = ((datetime.now() - datetime.fromtimestamp(chart["timestamp"][-1])).days - 1) * 86400
+        chart["timestamp"] = [ts + shift for ts in chart["timestamp"]]
+
+    result = []
+    for symbol in symbols:
+        response = copy.deepcopy(chart)
+        response["meta"]["symbol"] = symbol
+        quote = response["indicators"]["quote"][0]
+        quote["close"] = [None if c is None else round(c * SCALES.get(symbol, 1.0), 2) for c in quote["close"]]
+        result.append({"symbol": symbol, "response": [response]})
+    return {"spark": {"result": result, "error": None}}
+
+
+async def spark_handler(request: web.Request) -> web.Response:
+    return web.json_response(spark_payload(request.query["symbols"].split(",")))
+
+
+async def recent_spark_handler(request: web.Request) -> web.Response:
+    return web.json_response(spark_payload(request.query["symbols"].split(","), recent=True))
+
+
+def fetch_snapshots(monkeypatch, symbols, store=None):
+    async def scenario():
+        async with StubServer({YahooChartFetcher.SPARK_PATH: spark_handler}) as server:
+            monkeypatch.setattr(YahooChartFetcher, "BASE_URL", server.base_url)
+            async with aiohttp.ClientSession() as session:
+                # 錄製數據是 2025 年 3-4 月，回溯期間需涵蓋
+                days = (datetime.now() - datetime(2025, 3, 1)).days
+                snapshots = await YahooChartFetcher.fetch_snapshots(session, symbols, days=days, store=store)
+            return snapshots, server.requests
+
+    return asyncio.run(scenario())
+
+
+def test_all_symbols_come_from_one_request(monkeypatch):
+    """五個指數只發出一次請求，各自取得完整歷史"""
+    symbols = list(SCALES)
+    snapshots, requests = fetch_snapshots(monkeypatch, symbols)
+
+    assert len(requests) == 1
+    assert requests[0].query["symbols"] == ",".join(symbols)
+    assert list(snapshots) == symbols
+    assert snapshots["^VIX"].current == 33.82
+    assert snapshots["^VVIX"].current == round(33.82 * 4.5, 2)
+    assert len(snapshots["^VXN"].history) == 19
+
+
+def test_requests_are_batched_by_twenty_symbols(monkeypatch):
+    """超過單次上限時分批，請求數隨代號數以 1/20 成長"""
+    symbols = [f"^SYM{i}" for i in range(45)]
+    snapshots, requests = fetch_snapshots(monkeypatch, symbols)
+
+    assert len(requests) == 3
+    assert len(snapshots) == 45
+
+
+def test_unknown_symbols_are_skipped():
+    """Yahoo 無法辨識的代號略過，其他照常解析"""
+    payload = spark_payload(["^VIX"])
+    payload["spark"]["result"].append({"symbol": "^NOPE", "response": None})
+
+    assert list(YahooChartFetcher.parse_spark(payload)) == ["^VIX"]
+
+
+def test_batched_fetch_tops_up_the_store(monkeypatch, tmp_path):
+    """批次抓取的數據寫入本機 SQLite，每個代號各自保存"""
+    with VIXHistoryStore(str(tmp_path / "vix.sqlite")) as store:
+        fetch_snapshots(monkeypatch, ["^VIX", "^VXN"], store=store)
+        assert store.last_date("^VXN") == datetime(2025, 4, 21)
+        assert store.load("^VIX")[-1] == (datetime(2025, 4, 21), 33.82)
+
+
+def test_failed_batch_uses_only_fresh_stored_symbols(monkeypatch, tmp_path, capsys):
+    """批次失敗或缺少某代號時，只沿用夠新的已保存歷史；過舊的代號視為缺漏"""
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    async def unavailable(request: web.Request) -> web.Response:
+        return web.Response(status=503)
+
+    async def only_vix(request: web.Request) -> web.Response:
+        return web.json_response(spark_payload(["^VIX"], recent=True))
+
+    async def fetch(handler, store):
+        async with StubServer({YahooChartFetcher.SPARK_PATH: handler}) as server:
+            monkeypatch.setattr(YahooChartFetcher, "BASE_URL", server.base_url)
+            async with aiohttp.ClientSession() as session:
+                return await YahooChartFetcher.fetch_snapshots(session, ["^VIX", "^VXN", "^VVIX"], store=store)
+
+    with VIXHistoryStore(str(tmp_path / "vix.sqlite")) as store:
+        store.upsert("^VIX", [(today - timedelta(days=i), 20.0) for i in range(1, 10)])
+        store.upsert("^VXN", [(today - timedelta(days=i), 25.0) for i in range(1, 10)])
+        store.upsert("^VVIX", [(today - timedelta(days=i), 90.0) for i in range(10, 20)])
+
+        snapshots = asyncio.run(fetch(unavailable, store))
+        assert list(snapshots) == ["^VIX", "^VXN"]
+        assert "Batch download failed" in capsys.readouterr().out
+
+        snapshots = asyncio.run(fetch(only_vix, store))
+        assert list(snapshots) == ["^VIX", "^VXN"]
+        assert snapshots["^VIX"].current == 33.82
+        assert "No fresh data for ^VXN" in capsys.readouterr().out
+
+    with VIXHistoryStore(str(tmp_path / "stale.sqlite")) as stale:
+        stale.upsert("^VIX", [(today - timedelta(days=i), 20.0) for i in range(10, 20)])
+        with pytest.raises(aiohttp.ClientResponseError):
+            asyncio.run(fetch(unavailable, stale))
+
+
+def test_registry_scales_thresholds_per_gauge():
+    """VVIX 等常態水準較高的指數使用放大後的閾值"""
+    registry = VolatilityRegistry(["^VVIX", "^VXN"])
+
+    assert registry.symbols == ["^VIX", "^VVIX", "^VXN"]
+    assert registry.monitors["^VIX"].PANIC_THRESHOLD == VIXMonitor().PANIC_THRESHOLD
+    assert registry.monitors["^VVIX"].PANIC_THRESHOLD == VIXMonitor().PANIC_THRESHOLD * 4.5
+
+    # VVIX 90 在 VVIX 的尺度上只是平靜
+    start = datetime(2025, 1, 1)
+    flat = [(start + timedelta(days=i), 90.0) for i in range(10)]
+    registry.update({"^VVIX": VIXSnapshot(history=flat, current=90.0, is_intraday=False)})
+    assert registry.evaluate()["^VVIX"].phase == MarketPhase.CALM
+
+
+def test_registry_updates_warm_monitors_incrementally():
+    """暖機後只補入最新日期起的數據；缺少的代號會回報"""
+    registry = VolatilityRegistry(["^VXN"])
+    start = datetime(2025, 1, 1)
+    history = [(start + timedelta(days=i), 20.0 + i) for i in range(5)]
+    registry.update({symbol: VIXSnapshot(history, history[-1][1], False) for symbol in registry.symbols})
+
+    # 當日盤中數據被覆寫
+    intraday = history[:-1] + [(history[-1][0], 30.0)]
+    missing = registry.update({"^VIX": VIXSnapshot(intraday, 30.0, True)})
+
+    assert missing == ["^VXN"]
+    assert registry.primary.get_current_vix() == 30.0
+    assert len(registry.primary.vix_history) == 5
+    assert list(registry.evaluate()) == ["^VIX", "^VXN"]
+
+
+def test_run_cycle_sends_a_multi_gauge_report(monkeypatch, tmp_path):
+    """多指數模式：^VIX 決定訊號，其他指數列入同一份報告"""
+    async def fetch_fng(session, cache=None, history_store=None):
+        return {"score": 20, "rating": "extreme fear", "timestamp": "", "indicators": {}}
+
+    monkeypatch.setattr(app.FearGreedFetcher, "fetch", staticmethod(fetch_fng))
+    monkeypatch.setenv("VIX_STORE_PATH", str(tmp_path / "vix.sqlite"))
+
+    messages = []
+    renderer = DiscordNotifier("http://127.0.0.1/webhook")
+
+    class Notifier:
+        webhook_urls = ["http://127.0.0.1/webhook"]
+
+        async def flush(self, session):
+            return []
+
+        async def send_combined_report(self, session, fng_data, market_signal, destinations=None, gauges=None):
+            messages.append(renderer._format_combined_message(fng_data, market_signal, gauges))
+            return [DeliveryResult(url) for url in destinations]
+
+    async def scenario():
+        async with StubServer({YahooChartFetcher.SPARK_PATH: recent_spark_handler}) as server:
+            monkeypatch.setattr(YahooChartFetcher, "BASE_URL", server.base_url)
+            registry = VolatilityRegistry(["^VXN", "^VVIX"])
+            async with aiohttp.ClientSession() as session:
+                monitor = await app.run_cycle(session, Notifier(), registry=registry)
+            return monitor, registry, server.requests
+
+    monitor, registry, requests = asyncio.run(scenario())
+
+    assert len(requests) == 1
+    assert monitor is registry.primary
+    assert "Volatility Gauges" in messages[0]
+    assert "- VXN: " in messages[0] and "- VVIX: " in messages[0]
+    assert "- VIX: " not in messages[0]
+
+
+def test_registry_from_env(monkeypatch):
+    """VOLATILITY_SYMBOLS 未設定時維持單一 VIX 模式"""
+    monkeypatch.delenv("VOLATILITY_SYMBOLS", raising=False)
+    assert app.registry_from_env() is None
+
+    monkeypatch.setenv("VOLATILITY_SYMBOLS", "^VXN, ^VVIX")
+    assert app.registry_from_env().symbols == ["^VIX", "^VXN", "^VVIX"]
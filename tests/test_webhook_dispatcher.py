@@ -0,0 +1,143 @@
+"""
+Webhook 發送器測試（本機替身 webhook 注入 429 與 5xx 回應）
+"""
+import asyncio
+import random
+import time
+import sys
+import os
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.notifiers import DiscordNotifier, WebhookDispatcher
+from http_stub import StubServer
+
+
+def scripted(*responses):
+    """依序回傳預先安排的回應，之後一律 204"""
+    queue = list(responses)
+    received = []
+
+    async def handler(request: web.Request) -> web.Response:
+        received.append((time.monotonic(), await request.json()))
+        if queue:
+            return queue.pop(0)()
+        return web.Response(status=204, headers={"X-RateLimit-Bucket": "abc", "X-RateLimit-Remaining": "4"})
+
+    return handler, received
+
+
+def dispatcher(**kwargs) -> WebhookDispatcher:
+    kwargs.setdefault("base_delay", 0.05)
+    return WebhookDispatcher(rng=random.Random(0), **kwargs)
+
+
+async def post_all(handler, dispatcher, payloads):
+    async with StubServer({"/webhook": handler}) as server:
+        async with aiohttp.ClientSession() as session:
+            url = server.base_url + "/webhook"
+            await asyncio.gather(*(dispatcher.post(session, url, payload) for payload in payloads))
+
+
+def test_retries_429_after_retry_after():
+    """429 依 Retry-After 等待後重送"""
+    handler, received = scripted(
+        lambda: web.json_response({"message": "You are being rate limited.", "retry_after": 0.3, "global": False},
+                                  status=429, headers={"Retry-After": "0.3"}),
+    )
+
+    asyncio.run(post_all(handler, dispatcher(), [{"content": "report"}]))
+
+    assert len(received) == 2
+    assert received[1][0] - received[0][0] >= 0.3
+
+
+def test_retry_after_from_body_and_transient_5xx():
+    """沒有 Retry-After 標頭時讀取回應內容；502 / 503 以退避重試"""
+    handler, received = scripted(
+        lambda: web.Response(status=502),
+        lambda: web.json_response({"retry_after": 0.2}, status=429),
+        lambda: web.Response(status=503),
+    )
+
+    asyncio.run(post_all(handler, dispatcher(), [{"content": "report"}]))
+
+    assert len(received) == 4
+    assert received[2][0] - received[1][0] >= 0.2
+
+
+def test_waits_for_exhausted_bucket_and_keeps_order():
+    """額度用完時等到重置才送下一則，同一 URL 依序送出"""
+    handler, received = scripted(
+        lambda: web.Response(status=204, headers={
+            "X-RateLimit-Bucket": "abc", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.4",
+        }),
+    )
+
+    asyncio.run(post_all(handler, dispatcher(), [{"content": str(i)} for i in range(3)]))
+
+    assert [body["content"] for _, body in received] == ["0", "1", "2"]
+    assert received[1][0] - received[0][0] >= 0.4
+
+
+def test_gives_up_at_the_deadline():
+    """持續 5xx 時在總期限內放棄並拋出最後的錯誤"""
+    handler, received = scripted(*[lambda: web.Response(status=500)] * 100)
+
+    started = time.monotonic()
+    with pytest.raises(aiohttp.ClientResponseError) as excinfo:
+        asyncio.run(post_all(handler, dispatcher(deadline=0.5), [{"content": "report"}]))
+
+    assert excinfo.value.status == 500
+    assert time.monotonic() - started < 1.0
+    assert len(received) > 1
+
+
+def test_logs_never_contain_the_webhook_token(capsys):
+    """重試與放棄的記錄只含遮蔽後的 URL 與狀態碼"""
+    handler, received = scripted(*[lambda: web.Response(status=503)] * 100)
+
+    async def post():
+        async with StubServer({"/api/webhooks/{id}/{token}": handler}) as server:
+            async with aiohttp.ClientSession() as session:
+                url = server.base_url + "/api/webhooks/123/secret-token"
+                await dispatcher(deadline=0.3).post(session, url, {"content": "report"})
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(post())
+
+    output = capsys.readouterr().out
+    assert "secret-token" not in output
+    assert "/api/webhooks/123/***" in output
+    assert "ClientResponseError 503 Service Unavailable" in output
+
+
+def test_client_errors_are_not_retried():
+    """400 等請求錯誤不重試"""
+    handler, received = scripted(lambda: web.Response(status=400))
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(post_all(handler, dispatcher(), [{"content": "report"}]))
+
+    assert len(received) == 1
+
+
+def test_notifier_survives_a_rate_limited_post():
+    """DiscordNotifier 經由發送器送出，不因一次 429 遺失報告"""
+    handler, received = scripted(
+        lambda: web.json_response({"retry_after": 0.1}, status=429, headers={"Retry-After": "0.1"}),
+    )
+
+    async def send():
+        async with StubServer({"/webhook": handler}) as server:
+            notifier = DiscordNotifier(server.base_url + "/webhook", dispatcher())
+            async with aiohttp.ClientSession() as session:
+                await notifier.send_fear_greed_only(session, {"score": 20, "rating": "extreme fear"})
+
+    asyncio.run(send())
+    assert len(received) == 2
+    assert received[1][1]["embeds"][0]["fields"][0]["value"] == "**20**"
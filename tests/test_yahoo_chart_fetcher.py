@@ -0,0 +1,98 @@
+"""
+Yahoo chart API 抓取測試（本機替身伺服器提供錄製的回應）
+"""
+from datetime import datetime, timedelta
+import asyncio
+import json
+import sys
+import os
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.fetchers.yahoo_chart_fetcher import YahooChartFetcher
+from src.storage import VIXHistoryStore
+from http_stub import StubServer
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "yahoo_chart_vix.json")
+
+
+def load_fixture():
+    with open(FIXTURE) as f:
+        return json.load(f)
+
+
+async def chart_handler(request: web.Request) -> web.Response:
+    return web.json_response(load_fixture())
+
+
+def test_parse_chart_stamps_exchange_dates_and_skips_null_closes():
+    """以交易所時區的日期為準（午夜、無時區），略過沒有收盤價的數據"""
+    history, meta = YahooChartFetcher.parse_chart(load_fixture())
+
+    assert meta["symbol"] == "^VIX"
+    assert history[0] == (datetime(2025, 3, 24), 17.48)
+    assert (datetime(2025, 4, 9), 33.62) in history
+    assert datetime(2025, 4, 17) not in [d for d, _ in history]
+    assert history[-1] == (datetime(2025, 4, 21), 33.82)
+
+
+def test_parse_chart_raises_on_api_error():
+    """API 回傳 error 時拋出 ValueError"""
+    with pytest.raises(ValueError):
+        YahooChartFetcher.parse_chart({"chart": {"result": None, "error": {"code": "Not Found"}}})
+
+
+def test_fetch_snapshot_over_shared_session(monkeypatch):
+    """透過共用的 aiohttp session 一次取得歷史與最新報價"""
+    async def scenario():
+        async with StubServer({"/v8/finance/chart/{symbol}": chart_handler}) as server:
+            monkeypatch.setattr(YahooChartFetcher, "BASE_URL", server.base_url)
+            async with aiohttp.ClientSession() as session:
+                snapshot = await YahooChartFetcher.fetch_snapshot(session, days=30)
+            return snapshot, server.requests
+
+    snapshot, requests = asyncio.run(scenario())
+
+    assert len(requests) == 1
+    assert requests[0].match_info["symbol"] == "^VIX"
+    assert requests[0].query["interval"] == "1d"
+    assert len(snapshot.history) == 19
+    assert snapshot.current == 33.82
+    assert snapshot.is_intraday is False
+
+
+def test_failed_download_falls_back_to_fresh_stored_bars_only(monkeypatch, tmp_path, capsys):
+    """Yahoo 故障時沿用夠新的已保存數據並警告；數據過舊或程式錯誤時拋出"""
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    async def unavailable(request: web.Request) -> web.Response:
+        return web.Response(status=503)
+
+    async def fetch(store):
+        async with StubServer({"/v8/finance/chart/{symbol}": unavailable}) as server:
+            monkeypatch.setattr(YahooChartFetcher, "BASE_URL", server.base_url)
+            async with aiohttp.ClientSession() as session:
+                return await YahooChartFetcher.fetch_history(session, days=30, store=store)
+
+    with VIXHistoryStore(str(tmp_path / "fresh.sqlite")) as store:
+        store.upsert("^VIX", [(today - timedelta(days=i), 20.0) for i in range(1, 10)])
+        history = asyncio.run(fetch(store))
+        assert history[-1][0] == today - timedelta(days=1)
+        assert "using stored history" in capsys.readouterr().out
+
+    with VIXHistoryStore(str(tmp_path / "stale.sqlite")) as store:
+        store.upsert("^VIX", [(today - timedelta(days=10 + i), 20.0) for i in range(10)])
+        with pytest.raises(aiohttp.ClientResponseError):
+            asyncio.run(fetch(store))
+
+        async def broken(*args):
+            raise TypeError("bug")
+
+        store.upsert("^VIX", [(today - timedelta(days=1), 20.0)])
+        monkeypatch.setattr(YahooChartFetcher, "_download", staticmethod(broken))
+        with pytest.raises(TypeError):
+            asyncio.run(fetch(store))